@@ -0,0 +1,43 @@
+"""Bonk1 map search results tokenizer against the regex that fetch_b1_maps used, on a synthetic 1000-map payload."""
+
+import random
+import re
+import string
+from urllib.parse import quote_plus, unquote_plus
+
+from common import measure
+from bonk_bot.parsers.parsers import iter_bonk1_map_search_results
+
+OLD_PATTERN = re.compile(
+    r"mapid\d*=(\d*)&mapname\d*=([^-]*)&creationdate\d*=([^&]*)&modifieddate\d*=([^&]*)&thumbsup\d*=(\d*)&"
+    r"thumbsdown\d*=(\d*)&score\d*=\d*&authorname\d*=([^&]*)&leveldata\d*=([^&]*)"
+)
+
+
+def build_payload(map_count=1000, level_data_size=1500) -> str:
+    rng = random.Random(1)
+    maps = []
+
+    for index in range(map_count):
+        level_data = "".join(rng.choice(string.ascii_letters + string.digits + "/,.:") for _ in range(level_data_size))
+        maps.append(
+            f"mapid{index}={100000 + index}&mapname{index}={quote_plus(f'map name {index}')}"
+            f"&creationdate{index}={quote_plus('2012-01-01 10:00:00')}"
+            f"&modifieddate{index}={quote_plus('2012-02-01 10:00:00')}"
+            f"&thumbsup{index}=5&thumbsdown{index}=2&score{index}=3&authorname{index}={quote_plus('author')}"
+            f"&leveldata{index}={quote_plus(level_data)}"
+        )
+
+    return "&".join(maps)
+
+
+def main() -> None:
+    payload = build_payload()
+    old = measure(lambda: OLD_PATTERN.findall(unquote_plus(payload)))
+    new = measure(lambda: list(iter_bonk1_map_search_results(payload)))
+
+    print(f"1000 maps ({len(payload)} chars): regex {old:.1f} ms, tokenizer {new:.1f} ms ({old / new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+ByteBuffer readers and writer against the original implementation, which sliced data on every read, parsed struct
+format strings on every call and built the buffer by concatenating immutable bytes.
+"""
+
+import struct
+
+from common import build_large_map, load_default_map, measure
+from bonk_bot.parsers.byte_buffer import ByteBuffer
+from bonk_bot.parsers.lz_string import decode_lz_base64
+from bonk_bot.parsers.parsers import decode_bonk_map
+
+
+class SlicingByteBuffer:
+    """Read and write methods of the original ByteBuffer."""
+
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.position = 0
+
+    def write_double(self, value: float) -> None:
+        self.data += struct.pack(">d", value)
+
+    def read_double(self) -> float:
+        value = struct.unpack(">d", self.data[self.position:self.position + 8])[0]
+        self.position += 8
+        return value
+
+
+def read_doubles_one_by_one(buffer_class, payload, count: int) -> None:
+    byte_buffer = buffer_class(payload)
+
+    for _ in range(count):
+        byte_buffer.read_double()
+
+
+def write_doubles(byte_buffer, count: int) -> None:
+    for index in range(count):
+        byte_buffer.write_double(index)
+
+
+def main() -> None:
+    for name, encoded_map in (("RGB 1v1", load_default_map()), ("large", build_large_map())):
+        payload = decode_lz_base64(encoded_map)
+        count = len(payload) // 8
+
+        old = measure(lambda: read_doubles_one_by_one(SlicingByteBuffer, payload, count))
+        new = measure(lambda: read_doubles_one_by_one(ByteBuffer, memoryview(payload), count))
+        bulk = measure(lambda: ByteBuffer(memoryview(payload)).read_doubles(count))
+        decode = measure(lambda: decode_bonk_map(encoded_map))
+
+        print(
+            f"{name} ({len(payload)} bytes): {count} read_double calls {old:.3f} ms sliced, {new:.3f} ms memoryview "
+            f"({old / new:.1f}x), read_doubles {bulk:.3f} ms; "
+            f"decode_bonk_map with cached payload {decode:.2f} ms"
+        )
+
+    for count in (1000, 10000, 50000):
+        old = measure(lambda: write_doubles(SlicingByteBuffer(b""), count))
+        new = measure(lambda: write_doubles(ByteBuffer(), count))
+
+        print(
+            f"{count} write_double calls: {old:.2f} ms bytes concatenation, {new:.2f} ms bytearray "
+            f"({old / new:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Memory and time of CompactBonkMap against dicts returned by decode_bonk_map. Both decoders read decompressed payload
+from map cache, so times compare parsing only.
+"""
+
+import gc
+import tracemalloc
+
+from common import build_large_map, load_default_map, measure
+from bonk_bot.parsers.compact_map import CompactBonkMap, decode_bonk_map_compact
+from bonk_bot.parsers.parsers import decode_bonk_map
+
+
+def memory_per_map(decode, encoded_map: str, count=100) -> float:
+    """Returns memory held by one decoded map in KiB."""
+
+    gc.collect()
+    tracemalloc.start()
+    decoded_maps = [decode(encoded_map) for _ in range(count)]
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del decoded_maps
+
+    return memory / count / 1024
+
+
+def main() -> None:
+    for name, encoded_map in (("RGB 1v1", load_default_map()), ("large", build_large_map())):
+        decoded_map = decode_bonk_map(encoded_map)
+        compact_map = CompactBonkMap.from_dict(decoded_map)
+
+        dict_memory = memory_per_map(decode_bonk_map, encoded_map)
+        compact_memory = memory_per_map(decode_bonk_map_compact, encoded_map)
+        decode = measure(lambda: decode_bonk_map(encoded_map))
+        decode_compact = measure(lambda: decode_bonk_map_compact(encoded_map))
+        to_dict = measure(compact_map.to_dict)
+
+        print(
+            f"{name}: dict {dict_memory:.1f} KiB, compact {compact_memory:.1f} KiB "
+            f"({dict_memory / compact_memory:.1f}x less); decode {decode:.2f} ms, decode compact "
+            f"{decode_compact:.2f} ms, to_dict {to_dict:.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
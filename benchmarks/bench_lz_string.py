@@ -0,0 +1,24 @@
+"""Bundled LZString + base64 decoder against lzstring package followed by base64.b64decode."""
+
+import base64
+
+from lzstring import LZString
+
+from common import build_large_map, load_default_map, measure
+from bonk_bot.parsers.lz_string import decode_lz_base64
+
+
+def main() -> None:
+    for name, encoded_map in (("RGB 1v1", load_default_map()), ("large", build_large_map())):
+        payload = decode_lz_base64(encoded_map)
+        old = measure(lambda: base64.b64decode(LZString.decompressFromEncodedURIComponent(encoded_map)))
+        new = measure(lambda: decode_lz_base64(encoded_map))
+
+        print(
+            f"{name} ({len(encoded_map)} chars -> {len(payload)} bytes): lzstring + b64decode {old:.2f} ms, "
+            f"bundled {new:.2f} ms ({old / new:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
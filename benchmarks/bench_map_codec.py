@@ -0,0 +1,31 @@
+"""
+Throughput of encode_bonk_map and decode_bonk_map on the default map and on a large map. decode_bonk_map caches
+decompressed payloads, so decoding is measured both cold (cache cleared before every call) and with cached payload.
+"""
+
+from common import build_large_map, load_default_map, measure
+from bonk_bot.parsers.map_cache import map_cache
+from bonk_bot.parsers.parsers import decode_bonk_map, encode_bonk_map
+
+
+def decode_cold(encoded_map: str) -> dict:
+    map_cache.clear()
+
+    return decode_bonk_map(encoded_map)
+
+
+def main() -> None:
+    for name, encoded_map in (("RGB 1v1", load_default_map()), ("large", build_large_map())):
+        decoded_map = decode_bonk_map(encoded_map)
+        cold = measure(lambda: decode_cold(encoded_map))
+        cached = measure(lambda: decode_bonk_map(encoded_map))
+        encode = measure(lambda: encode_bonk_map(decoded_map))
+
+        print(
+            f"{name} ({len(encoded_map)} chars): decode {cold:.2f} ms ({1000 / cold:.0f} maps/s), "
+            f"{cached:.2f} ms with cached payload; encode {encode:.2f} ms ({1000 / encode:.0f} maps/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
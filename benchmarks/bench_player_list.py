@@ -0,0 +1,59 @@
+"""
+Player lookups of packet handlers in a full 8-player room where every player sends 30 moves per second, with
+PlayerList indexes against scanning the list like Game did before.
+"""
+
+import random
+
+from common import measure
+from bonk_bot.avatar import Avatar
+from bonk_bot.game import Player, PlayerList
+from bonk_bot.types import Teams
+
+PLAYERS = 8
+MOVES_PER_SECOND = 30
+SECONDS = 10
+
+
+def make_player(short_id: int) -> Player:
+    return Player(
+        None,
+        None,
+        None,
+        False,
+        False,
+        f"peer{short_id}",
+        f"player {short_id}",
+        True,
+        0,
+        False,
+        False,
+        Teams.FFA,
+        short_id,
+        Avatar({"layers": [], "bc": 0})
+    )
+
+
+def scan(players: list, short_id: int) -> Player:
+    for player in players:
+        if player.short_id == short_id:
+            return player
+
+
+def main() -> None:
+    players = PlayerList(make_player(short_id) for short_id in range(PLAYERS))
+    plain_players = list(players)
+    rng = random.Random(1)
+    packets = [rng.randrange(PLAYERS) for _ in range(PLAYERS * MOVES_PER_SECOND * SECONDS)]
+
+    old = measure(lambda: [scan(plain_players, short_id) for short_id in packets])
+    new = measure(lambda: [players.get_by_short_id(short_id) for short_id in packets])
+
+    print(
+        f"{len(packets)} move packets ({SECONDS} s of full room): scan {old:.2f} ms, index {new:.2f} ms "
+        f"({old / new:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
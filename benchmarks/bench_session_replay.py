@@ -0,0 +1,107 @@
+"""
+Recording and offline replay of a synthetic session: 4 players in a match, move packets with a chat message every 50
+packets. Replay feeds recorded packets into Game packet handlers as fast as possible.
+"""
+
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+import common  # noqa: F401 (puts repository root on sys.path)
+from bonk_bot.bot.bonk_bot import bonk_guest_login
+from bonk_bot.game import Game
+from bonk_bot.session import SessionRecorder, SessionReplay
+from bonk_bot.types import Modes
+
+PACKETS = 20000
+AVATAR = {"layers": [], "bc": 0}
+
+
+def session_packets(count: int):
+    rng = random.Random(1)
+    players = [
+        {
+            "peerID": f"peer{short_id}",
+            "userName": f"player{short_id}",
+            "guest": True,
+            "level": 0,
+            "ready": False,
+            "tabbed": False,
+            "team": 1,
+            "avatar": AVATAR
+        } for short_id in range(3)
+    ]
+
+    yield 3, [2, 0, players, 0, False, 1, "", None]
+    yield 4, [3, "peer3", "player3", True, 0, 0, AVATAR]
+    yield 48, [{"fc": 100}]
+
+    for index in range(count):
+        short_id = rng.choice((0, 1, 3))
+
+        if index % 50 == 0:
+            yield 20, [short_id, f"message {index}"]
+        else:
+            yield 7, [short_id, {"i": rng.randrange(64), "f": 100 + index, "c": index}]
+
+    yield 5, [3, None]
+
+
+async def record(path: str) -> tuple:
+    """Records the session into the log, returns amount of packets and time of recording in seconds."""
+
+    bot = bonk_guest_login("recorder")
+    recorder = SessionRecorder(path)
+    game = Game(bot, None, "room", False, Modes.Classic, False, False, False)
+
+    async def emit(event, data=None, namespace=None, callback=None) -> None:
+        pass
+
+    game.socket_client.emit = emit
+    recorder.attach(game.socket_client, "room")
+    await game._prepare_replay()
+
+    packets = list(session_packets(PACKETS))
+    start = time.perf_counter()
+
+    for event, args in packets:
+        await game.socket_client._trigger_event(event, "/", *args)
+
+    recorder.close()
+    duration = time.perf_counter() - start
+
+    await game.leave()
+    await bot.aiohttp_session.close()
+
+    return len(packets), duration
+
+
+async def replay(path: str):
+    bot = bonk_guest_login("replayer")
+    stats = await SessionReplay(path).feed(Game(bot, None, "room", False, Modes.Classic, False, False, False), speed=None)
+    await bot.aiohttp_session.close()
+
+    return stats
+
+
+async def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "session.jsonl.gz")
+        packets, record_time = await record(path)
+        size = os.path.getsize(path)
+
+        print(f"recorded {packets} packets in {record_time * 1000:.0f} ms, log is {size / 1024:.0f} KiB")
+
+        for _ in range(3):
+            stats = await replay(path)
+
+            print(
+                f"replayed {stats.packets} packets in {stats.duration * 1000:.0f} ms "
+                f"({stats.packets_per_second:.0f} packets/s), {len(stats.errors)} errors"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,50 @@
+"""Helpers shared by benchmark scripts. Scripts are run from repository root, for example
+``python benchmarks/bench_map_codec.py``."""
+
+import copy
+import os
+import sys
+import timeit
+from typing import Callable
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bonk_bot.parsers.parsers import decode_bonk_map, encode_bonk_map  # noqa: E402
+
+
+def load_default_map() -> str:
+    """Returns encoded "RGB 1v1" map that Game uses before the first map change."""
+
+    with open(os.path.join(ROOT, "tests", "data", "rgb_1v1.txt")) as file:
+        return file.read().strip()
+
+
+def build_large_map(copies=20) -> str:
+    """Returns default map with its shapes, fixtures and bodies repeated, about the size of big community maps."""
+
+    decoded_map = decode_bonk_map(load_default_map())
+    physics = decoded_map["physics"]
+    shapes, fixtures, bodies = physics["shapes"], physics["fixtures"], physics["bodies"]
+
+    for index in range(copies):
+        physics["shapes"] = physics["shapes"] + [
+            dict(shape, c=[shape["c"][0] + index * 0.37, shape["c"][1]]) for shape in shapes
+        ]
+        physics["fixtures"] = physics["fixtures"] + copy.deepcopy(fixtures)
+        physics["bodies"] = physics["bodies"] + copy.deepcopy(bodies)
+
+    return encode_bonk_map(decoded_map)
+
+
+def measure(function: Callable[[], object], min_time=0.5) -> float:
+    """Returns average time of one call in milliseconds."""
+
+    timer = timeit.Timer(function)
+    number, elapsed = timer.autorange()
+
+    if elapsed < min_time:
+        number = max(number, int(number * min_time / max(elapsed, 1e-9)))
+        elapsed = timer.timeit(number)
+
+    return elapsed / number * 1000
@@ -3,11 +3,14 @@ from .bonk_online import BonkOnline
 from .parsers import *
 from .types import *
 from .avatar import Avatar
+from .avatar_builder import AvatarBuilder, build_avatars
 from .bonk_maps import OwnMap, Bonk1Map, Bonk2Map
+from .map_store import MapStore, set_map_store
 from .friend_list import FriendList, Friend, FriendRequest, LegacyFriend
 from .game import (
     Game,
     Player,
+    PlayerList,
     Message,
     MapRequestHost,
     MapRequestClient,
@@ -16,4 +19,10 @@ from .game import (
     PlayerMove,
     GameConnectionError
 )
+from .history import History, HistorySpill
+from .keep_alive import KeepAliveScheduler
+from .clock_sync import ClockSync
+from .input_timeline import InputTimeline, compile_macro
+from .input_log import InputLog, PlayerInputs
+from .session import SessionRecorder, SessionReplay, ReplayStats
 from .room import Room
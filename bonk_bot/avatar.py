@@ -1,9 +1,87 @@
+import weakref
+from typing import Any, Hashable, List
+
+
+class _FrozenDict(tuple):
+    """Dict items frozen into a tuple, so dicts and lists can be told apart when thawing."""
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return _FrozenDict((key, _freeze(item)) for key, item in value.items())
+
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+
+    return value
+
+
+def _thaw(value: Hashable) -> Any:
+    if isinstance(value, _FrozenDict):
+        return {key: _thaw(item) for key, item in value}
+
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+
+    return value
+
+
 class Avatar:
     """
-    Class for holding Avatar decoded data.
+    Class for holding Avatar decoded data. Avatars are immutable and hashable, avatars with the same data are the same
+    object, so identical avatars of many players are stored once.
 
     :param json_data: decoded avatar data.
     """
 
-    def __init__(self, json_data: dict) -> None:
-        self.json_data: dict = json_data
+    __slots__ = ("_frozen_data", "_hash", "__weakref__")
+
+    # Avatars that are still in use, by their frozen data
+    _interned: "weakref.WeakValueDictionary[Hashable, Avatar]" = weakref.WeakValueDictionary()
+
+    def __new__(cls, json_data: dict) -> "Avatar":
+        frozen_data = _freeze(json_data)
+        avatar = cls._interned.get(frozen_data)
+
+        if avatar is None:
+            avatar = super().__new__(cls)
+            object.__setattr__(avatar, "_frozen_data", frozen_data)
+            object.__setattr__(avatar, "_hash", hash(frozen_data))
+            cls._interned[frozen_data] = avatar
+
+        return avatar
+
+    @property
+    def json_data(self) -> dict:
+        """Returns a new dict with avatar data, in the format that is sent in packets."""
+
+        return _thaw(self._frozen_data)
+
+    @property
+    def layers(self) -> List[dict]:
+        return self.json_data["layers"]
+
+    @property
+    def base_color(self) -> int:
+        return dict(self._frozen_data)["bc"]
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("Avatar is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("Avatar is immutable")
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Avatar):
+            return NotImplemented
+
+        return self is other or self._frozen_data == other._frozen_data
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __reduce__(self) -> tuple:
+        return Avatar, (self.json_data,)
+
+    def __repr__(self) -> str:
+        return f"Avatar({self.json_data!r})"
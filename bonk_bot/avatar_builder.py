@@ -0,0 +1,123 @@
+import random
+import struct
+from typing import List, Sequence, Union
+
+from .avatar import Avatar
+from .parsers.parsers import encode_avatar
+
+DEFAULT_BASE_COLOR = 4492031
+
+# Avatar layer positions, scales and angles are encoded as 32-bit floats
+_FLOAT32 = struct.Struct(">f")
+
+
+def _to_float32(value: float) -> float:
+    return _FLOAT32.unpack(_FLOAT32.pack(value))[0]
+
+
+class AvatarBuilder:
+    """
+    Used to compose avatars layer by layer.
+
+    :param base_color: avatar base color.
+
+    Example usage::
+
+        avatar = AvatarBuilder(0x202020).add_layer(13, color=0xFF0000).add_layer(42, x=5, y=-5, scale=0.1).build()
+        bot.main_avatar = avatar
+    """
+
+    def __init__(self, base_color=DEFAULT_BASE_COLOR) -> None:
+        self.base_color: int = base_color
+        self.layers: List[dict] = []
+
+    def add_layer(
+        self,
+        shape_id: int,
+        color=0,
+        x=0.0,
+        y=0.0,
+        scale=0.25,
+        angle=0.0,
+        flip_x=False,
+        flip_y=False
+    ) -> "AvatarBuilder":
+        """
+        Adds layer to the avatar. Returns the builder, so calls can be chained.
+
+        :param shape_id: ID of layer shape.
+        :param color: layer color.
+        :param x: layer x position.
+        :param y: layer y position.
+        :param scale: layer scale.
+        :param angle: layer angle in degrees.
+        :param flip_x: indicates whether layer is flipped horizontally or not.
+        :param flip_y: indicates whether layer is flipped vertically or not.
+        """
+
+        self.layers.append(
+            {
+                "id": shape_id,
+                "scale": scale,
+                "angle": angle,
+                "x": x,
+                "y": y,
+                "flipX": flip_x,
+                "flipY": flip_y,
+                "color": color
+            }
+        )
+
+        return self
+
+    def build(self) -> Avatar:
+        """Returns composed avatar."""
+
+        return Avatar({"layers": list(self.layers), "bc": self.base_color})
+
+    def encode(self) -> str:
+        """Returns composed avatar encoded to base64 string. Encoded avatars are cached."""
+
+        return encode_avatar(self.build())
+
+
+def build_avatars(
+    count: int,
+    layers_count=3,
+    shape_ids: Sequence[int] = range(1, 101),
+    seed: Union[int, None] = None
+) -> List[Avatar]:
+    """
+    Generates distinct random avatars, for example for a fleet of guest bots. Generated values are rounded to 32-bit
+    floats, so avatars are equal to themselves after encoding and decoding.
+
+    :param count: amount of avatars.
+    :param layers_count: amount of layers in every avatar.
+    :param shape_ids: IDs of shapes that layers are picked from.
+    :param seed: random seed, the same seed gives the same avatars.
+    """
+
+    rng = random.Random(seed)
+    avatars = []
+    generated = set()
+
+    while len(avatars) < count:
+        builder = AvatarBuilder(rng.randrange(1 << 24))
+
+        for _ in range(layers_count):
+            builder.add_layer(
+                rng.choice(shape_ids),
+                color=rng.randrange(1 << 24),
+                x=_to_float32(rng.uniform(-10, 10)),
+                y=_to_float32(rng.uniform(-10, 10)),
+                scale=_to_float32(rng.uniform(0.1, 0.5)),
+                angle=_to_float32(rng.uniform(-180, 180))
+            )
+
+        avatar = builder.build()
+
+        if avatar not in generated:
+            generated.add(avatar)
+            avatars.append(avatar)
+
+    return avatars
@@ -2,7 +2,7 @@ from functools import cached_property
 from typing import TYPE_CHECKING
 
 from .settings import links
-from .parsers import decode_bonk_map
+from .map_store import decode_stored_map
 
 if TYPE_CHECKING:
     from .bot import AccountBonkBot
@@ -52,9 +52,12 @@ class OwnMap:
 
     @cached_property
     def decoded_data(self) -> dict:
-        """Decodes map data to dict."""
+        """
+        Decodes map data to dict. Map sections are decoded on first access. Reads through map store if it's set with
+        set_map_store.
+        """
 
-        return decode_bonk_map(self.encoded_data)
+        return decode_stored_map(self.map_id, 2, self.encoded_data)
 
     async def delete(self) -> None:
         """Deletes bot's account own map."""
@@ -105,9 +108,12 @@ class Bonk2Map:
 
     @cached_property
     def decoded_data(self) -> dict:
-        """Decodes map data to dict."""
+        """
+        Decodes map data to dict. Map sections are decoded on first access. Reads through map store if it's set with
+        set_map_store.
+        """
 
-        return decode_bonk_map(self.encoded_data)
+        return decode_stored_map(self.map_id, 2, self.encoded_data)
 
 
 class Bonk1Map:
@@ -1,12 +1,13 @@
 import datetime
 import json
-from typing import List, Union
-from urllib.parse import unquote_plus
+import random
+from collections import defaultdict, deque
+from typing import AsyncIterator, Awaitable, Callable, Deque, Iterable, List, Tuple, TypeVar, Union
 import requests
 import re
 import asyncio
-import nest_asyncio
 import aiohttp
+import socketio
 from functools import cached_property
 
 from ..bonk_online import BonkOnline
@@ -14,13 +15,92 @@ from ..settings import PROTOCOL_VERSION, links
 from ..friend_list import FriendList, LegacyFriend
 from ..bonk_maps import OwnMap, Bonk2Map, Bonk1Map
 from ..room import Room
-from ..parsers import db_id_to_date, decode_avatar
-from ..game import Game
+from ..parsers import db_id_to_date, decode_avatar, iter_bonk1_map_search_results
+from ..game import Game, GameConnectionError, _FATAL_GAME_ERRORS
+from ..history import HistorySpill
+from ..keep_alive import KeepAliveScheduler
+from ..session import SessionRecorder
 from ..types import Servers, AnyServer, all_servers_list, Modes
 from ..avatar import Avatar
 from ..bot.bot_event_handler import BotEventHandler
 
-nest_asyncio.apply()
+_T = TypeVar("_T")
+
+# Join errors that retrying won't fix
+_PERMANENT_JOIN_ERRORS = _FATAL_GAME_ERRORS | {"Room is not found", "Game is already opened"}
+
+
+def _is_transient_join_error(error: Exception) -> bool:
+    """
+    Returns whether join that failed with the error is worth retrying.
+
+    :param error: exception raised by join.
+    """
+
+    if isinstance(error, GameConnectionError):
+        return error.args[0] not in _PERMANENT_JOIN_ERRORS
+
+    return isinstance(error, (socketio.exceptions.ConnectionError, aiohttp.ClientError, asyncio.TimeoutError))
+
+
+async def _iter_pages(
+    fetch_page: Callable[[int], Awaitable[List[_T]]],
+    max_results: Union[int, None],
+    prefetch: int
+) -> AsyncIterator[_T]:
+    """
+    Yields results of paginated bonk api call. Page size is taken from the first page and is confirmed by the second
+    one, so until then only one page is fetched ahead; after that next pages are fetched concurrently, up to prefetch
+    pages ahead. Iteration stops at the first page that isn't full.
+
+    :param fetch_page: coroutine function that fetches results starting from the given offset.
+    :param max_results: maximal amount of yielded results. None means no limit.
+    :param prefetch: amount of pages fetched ahead.
+    """
+
+    if prefetch < 1:
+        raise ValueError("Prefetch must be a positive number")
+
+    if max_results is not None and max_results < 1:
+        return
+
+    page = await fetch_page(0)
+    page_size = len(page)
+    next_offset = page_size
+    yielded = 0
+    # Short first page can't be told apart from a full one, so a one-page result doesn't fire prefetch requests
+    is_page_size_confirmed = False
+    pages: Deque[asyncio.Future] = deque()
+
+    try:
+        while True:
+            is_last_page = page_size == 0 or len(page) < page_size
+
+            # Next pages are being fetched while results of the current one are processed
+            while (
+                not is_last_page and
+                len(pages) < (prefetch if is_page_size_confirmed else 1) and
+                (max_results is None or next_offset < max_results)
+            ):
+                pages.append(asyncio.ensure_future(fetch_page(next_offset)))
+                next_offset += page_size
+
+            for result in page:
+                yield result
+                yielded += 1
+
+                if yielded == max_results:
+                    return
+
+            # Pages fetched past the last one are cancelled on exit
+            if is_last_page or not pages:
+                return
+
+            page = await pages.popleft()
+            is_page_size_confirmed = len(page) == page_size
+    finally:
+        for pending_page in pages:
+            pending_page.cancel()
 
 
 class BonkBot(BotEventHandler):
@@ -48,6 +128,15 @@ class BonkBot(BotEventHandler):
         self._main_avatar: Union[Avatar, None] = main_avatar
         self._games: List[Game] = []
         self._aiohttp_session = aiohttp.ClientSession()
+        # Retention of messages and map requests of new games, see History
+        self.history_size: Union[int, None] = 1000
+        self.history_spill: Union[HistorySpill, None] = None
+        # Sends timesync packets of all connected games
+        self.keep_alive: KeepAliveScheduler = KeepAliveScheduler()
+        # Whether inputs of new matches are recorded to match.input_log
+        self.record_inputs = False
+        # Records packets of new games, see SessionRecorder
+        self.session_recorder: Union[SessionRecorder, None] = None
 
     @property
     def is_guest(self) -> bool:
@@ -66,12 +155,7 @@ class BonkBot(BotEventHandler):
     def avatars(self) -> List[Avatar]:
         """Returns account avatars from encoded base64 strings."""
 
-        avatars = []
-
         if not (self._raw_avatars is None):
-            for raw_avatar in self._raw_avatars:
-                avatars.append(decode_avatar(raw_avatar))
-
             return [decode_avatar(avatar) for avatar in self._raw_avatars]
 
         return [Avatar({"layers": [], "bc": 4492031})] * 5
@@ -151,15 +235,16 @@ class BonkBot(BotEventHandler):
 
         self.event_emitter.on(attribute_name.replace("_on_", ""), function)
 
-    async def join_game_from_link(self, link: str, password="") -> Game:
+    async def join_game_from_link(self, link: str, password="", timeout: Union[float, None] = 30.0) -> Game:
         """
-        Joins a game from join link.
+        Joins a game from join link. Raises GameConnectionError if game can't be joined.
 
         :param password: password that is required to join the game.
         :param link: link to join game.
+        :param timeout: maximal time in seconds to wait for the connection. None means no limit.
         """
 
-        return Game(
+        return await Game(
             self,
             None,
             "",
@@ -169,7 +254,7 @@ class BonkBot(BotEventHandler):
             True,
             False,
             game_join_params=[link, password]
-        )
+        ).open(timeout)
 
     async def create_game(
         self,
@@ -179,7 +264,8 @@ class BonkBot(BotEventHandler):
         password="",
         min_level=0,
         max_level=999,
-        server: AnyServer = Servers.Warsaw
+        server: AnyServer = Servers.Warsaw,
+        timeout: Union[float, None] = 30.0
     ) -> Game:
         """
         Host a bonk.io game.
@@ -191,6 +277,7 @@ class BonkBot(BotEventHandler):
         :param min_level: The minimal level that is required from other players to join the game. Default is 0.
         :param max_level: The maximal level that is required from other players to join the game. Default is 999.
         :param server: The server to join the game. Default is Servers.Warsaw().
+        :param timeout: Maximal time in seconds to wait for the game to be created. None means no limit. Default is 30.
 
         Example usage::
 
@@ -212,7 +299,7 @@ class BonkBot(BotEventHandler):
         elif not (server in all_servers_list):
             raise TypeError("Server param is not a server")
 
-        return Game(
+        return await Game(
             self,
             server,
             name,
@@ -222,7 +309,7 @@ class BonkBot(BotEventHandler):
             False,
             False,
             game_create_params=[name, max_players, unlisted, password, min_level, max_level, server]
-        )
+        ).open(timeout)
 
     async def fetch_online(self) -> BonkOnline:
         """Returns current bonk online players."""
@@ -239,13 +326,14 @@ class BonkBot(BotEventHandler):
             data["total"]
         )
 
-    async def fetch_b2_maps(self, request: str, by_name=True, by_author=True) -> List[Bonk2Map]:
+    async def fetch_b2_maps(self, request: str, by_name=True, by_author=True, starting_from=0) -> List[Bonk2Map]:
         """
         Returns list of bonk2 maps.
 
         :param request: Input string along which the search is performed.
         :param by_name: True if you want to search map by its name. Default is True.
         :param by_author: True if you want to search map by its author. Default is True.
+        :param starting_from: amount of search results to skip. Used to fetch next pages of results.
         """
 
         async with self.aiohttp_session.post(
@@ -255,7 +343,7 @@ class BonkBot(BotEventHandler):
                 "searchmapname": str(by_name).lower(),
                 "searchsort": "best",
                 "searchstring": request,
-                "startingfrom": 0
+                "startingfrom": starting_from
             }
         ) as resp:
             data = await resp.json()
@@ -277,13 +365,32 @@ class BonkBot(BotEventHandler):
         ]
 
     # why tf do you store bonk 1 maps data like that chaz mapid0=1597734&mapname0=hammer+vs+SUS+ptb+&creationdate...
-    async def fetch_b1_maps(self, request: str, by_name=True, by_author=True) -> List[Bonk1Map]:
+    async def fetch_b1_maps(self, request: str, by_name=True, by_author=True, starting_from=0) -> List[Bonk1Map]:
         """
         Returns list of bonk1 maps.
 
         :param request: Input string along which the search is performed.
         :param by_name: True if you want to search map by its name. Default is True.
         :param by_author: True if you want to search map by its author. Default is True.
+        :param starting_from: amount of search results to skip. Used to fetch next pages of results.
+        """
+
+        return [bonk_map async for bonk_map in self.stream_b1_maps(request, by_name, by_author, starting_from)]
+
+    async def stream_b1_maps(
+        self,
+        request: str,
+        by_name=True,
+        by_author=True,
+        starting_from=0
+    ) -> AsyncIterator[Bonk1Map]:
+        """
+        Yields bonk1 maps from one page of search results one at a time, as they're parsed.
+
+        :param request: Input string along which the search is performed.
+        :param by_name: True if you want to search map by its name. Default is True.
+        :param by_author: True if you want to search map by its author. Default is True.
+        :param starting_from: amount of search results to skip. Used to fetch next pages of results.
         """
 
         async with self.aiohttp_session.post(
@@ -292,27 +399,78 @@ class BonkBot(BotEventHandler):
                 "searchsort": "ctr",
                 "searchauthor": str(by_author).lower(),
                 "searchmapname": str(by_name).lower(),
-                "startingfrom": 0,
+                "startingfrom": starting_from,
                 "searchstring": request
             }
         ) as resp:
-            data = unquote_plus((await resp.json())["maps"])
+            data = (await resp.json())["maps"]
+
+        for bonk_map in iter_bonk1_map_search_results(data):
+            yield Bonk1Map(
+                int(bonk_map["mapid"]),
+                bonk_map["leveldata"],
+                bonk_map["mapname"],
+                bonk_map["authorname"],
+                bonk_map["creationdate"],
+                bonk_map["modifieddate"],
+                int(bonk_map["thumbsup"]),
+                int(bonk_map["thumbsdown"])
+            )
 
-        pattern = re.compile(r'mapid\d*=(\d*)&mapname\d*=([^-]*)&creationdate\d*=([^&]*)&modifieddate\d*=([^&]*)&thumbsup\d*=(\d*)&thumbsdown\d*=(\d*)&score\d*=\d*&authorname\d*=([^&]*)&leveldata\d*=([^&]*)')
-        parsed_data = pattern.findall(data)
+    def iter_b2_maps(
+        self,
+        request: str,
+        by_name=True,
+        by_author=True,
+        max_results: Union[int, None] = None,
+        prefetch=2
+    ) -> AsyncIterator[Bonk2Map]:
+        """
+        Iterates over all pages of bonk2 maps search results. Next pages are fetched concurrently while maps of
+        the current page are yielded.
 
-        return [
-            Bonk1Map(
-                int(bonk_map[0]),
-                bonk_map[7],
-                bonk_map[1],
-                bonk_map[6],
-                bonk_map[2],
-                bonk_map[3],
-                int(bonk_map[4]),
-                int(bonk_map[5])
-            ) for bonk_map in parsed_data
-        ]
+        :param request: Input string along which the search is performed.
+        :param by_name: True if you want to search map by its name. Default is True.
+        :param by_author: True if you want to search map by its author. Default is True.
+        :param max_results: maximal amount of yielded maps. None means all search results.
+        :param prefetch: amount of pages fetched ahead.
+
+        Example usage::
+
+            async for bonk_map in bot.iter_b2_maps("parkour", max_results=200):
+                print(bonk_map.name)
+        """
+
+        return _iter_pages(
+            lambda starting_from: self.fetch_b2_maps(request, by_name, by_author, starting_from),
+            max_results,
+            prefetch
+        )
+
+    def iter_b1_maps(
+        self,
+        request: str,
+        by_name=True,
+        by_author=True,
+        max_results: Union[int, None] = None,
+        prefetch=2
+    ) -> AsyncIterator[Bonk1Map]:
+        """
+        Iterates over all pages of bonk1 maps search results. Next pages are fetched concurrently while maps of
+        the current page are yielded.
+
+        :param request: Input string along which the search is performed.
+        :param by_name: True if you want to search map by its name. Default is True.
+        :param by_author: True if you want to search map by its author. Default is True.
+        :param max_results: maximal amount of yielded maps. None means all search results.
+        :param prefetch: amount of pages fetched ahead.
+        """
+
+        return _iter_pages(
+            lambda starting_from: self.fetch_b1_maps(request, by_name, by_author, starting_from),
+            max_results,
+            prefetch
+        )
 
     async def fetch_rooms(self) -> List[Room]:
         """Returns list of rooms in the bonk.io room list."""
@@ -341,6 +499,87 @@ class BonkBot(BotEventHandler):
             ) for room in data["rooms"]
         ]
 
+    async def join_rooms(
+        self,
+        rooms: Iterable[Room],
+        password="",
+        concurrency=10,
+        per_server_limit=2,
+        retries=3,
+        backoff=1.0,
+        timeout: Union[float, None] = 30.0
+    ) -> AsyncIterator[Tuple[Room, Union[Game, Exception]]]:
+        """
+        Joins many rooms at once. Yields (room, game) pairs as joins complete; if room can't be joined, the exception
+        is yielded instead of the game. Transient failures (timeouts, connection errors, server disconnects) are
+        retried with jittered exponential backoff, errors like wrong password or full room aren't retried.
+
+        :param rooms: rooms to join.
+        :param password: password to join rooms.
+        :param concurrency: maximal amount of joins that are in progress at the same time.
+        :param per_server_limit: maximal amount of joins to one bonk server that are in progress at the same time.
+        :param retries: maximal amount of retries of every join.
+        :param backoff: base delay in seconds before retry. Delay before n-th retry is random, up to backoff * 2 ** n.
+        :param timeout: maximal time in seconds to wait for every join attempt, not counting the time attempt is queued
+                for concurrency limits. None means no limit.
+
+        Example usage::
+
+            async def main():
+                rooms = [room for room in await bot.fetch_rooms() if not room.has_password]
+
+                async for room, game in bot.join_rooms(rooms, concurrency=20):
+                    if isinstance(game, Exception):
+                        print(f"Couldn't join {room.name}: {game}")
+
+                await bot.run()
+
+            asyncio.run(main())
+        """
+
+        if concurrency < 1 or per_server_limit < 1:
+            raise ValueError("Concurrency and per server limit must be positive numbers")
+
+        semaphore = asyncio.Semaphore(concurrency)
+        server_semaphores = defaultdict(lambda: asyncio.Semaphore(per_server_limit))
+
+        async def join(room: Room) -> Tuple[Room, Union[Game, Exception]]:
+            attempt = 0
+
+            while True:
+                try:
+                    # Join takes the server semaphore before the shared one, so joins queued for a busy server don't
+                    # hold slots that joins to other servers could use
+                    return room, await room.join(password, timeout, server_semaphores, semaphore)
+                except Exception as e:
+                    if attempt == retries or not _is_transient_join_error(e):
+                        return room, e
+
+                # Slots aren't held during backoff, so other rooms can be joined meanwhile
+                await asyncio.sleep(random.uniform(0, backoff * 2 ** attempt))
+                attempt += 1
+
+        tasks = [asyncio.ensure_future(join(room)) for room in rooms]
+        yielded_games = []
+
+        try:
+            for task in asyncio.as_completed(tasks):
+                room, game = await task
+
+                if isinstance(game, Game):
+                    yielded_games.append(game)
+
+                yield room, game
+        finally:
+            # If iteration stops early, joins in progress are cancelled (open() disconnects them) and games that were
+            # joined but not yielded are left, so they don't stay connected without the caller knowing about them
+            for task in tasks:
+                task.cancel()
+
+            for result in await asyncio.gather(*tasks, return_exceptions=True):
+                if isinstance(result, tuple) and isinstance(result[1], Game) and result[1] not in yielded_games:
+                    await result[1].leave()
+
 
 class AccountBonkBot(BonkBot):
     """
@@ -386,14 +625,18 @@ class AccountBonkBot(BonkBot):
 
         return [LegacyFriend(self, friend) for friend in self._raw_legacy_friends.split("#")]
 
-    async def fetch_own_maps(self) -> List[OwnMap]:
-        """Returns list of maps created on the account."""
+    async def fetch_own_maps(self, starting_from=0) -> List[OwnMap]:
+        """
+        Returns list of maps created on the account.
+
+        :param starting_from: amount of maps to skip. Used to fetch next pages of maps.
+        """
 
         async with self.aiohttp_session.post(
             url=links["map_get_own"],
             data={
                 "token": self.token,
-                "startingfrom": "0"
+                "startingfrom": str(starting_from)
             }
         ) as resp:
             data = await resp.json()
@@ -412,12 +655,18 @@ class AccountBonkBot(BonkBot):
             for bonk_map in data["maps"]
         ]
 
-    async def fetch_favorite_maps(self) -> List[Bonk2Map]:
+    async def fetch_favorite_maps(self, starting_from=0) -> List[Bonk2Map]:
+        """
+        Returns list of account favorite maps.
+
+        :param starting_from: amount of maps to skip. Used to fetch next pages of maps.
+        """
+
         async with self.aiohttp_session.post(
             url=links["map_get_fav"],
             data={
                 "token": self.token,
-                "startingfrom": "0"
+                "startingfrom": str(starting_from)
             }
         ) as response:
             data = await response.json()
@@ -435,6 +684,28 @@ class AccountBonkBot(BonkBot):
             for bonk_map in data["maps"]
         ]
 
+    def iter_own_maps(self, max_results: Union[int, None] = None, prefetch=2) -> AsyncIterator[OwnMap]:
+        """
+        Iterates over all pages of maps created on the account. Next pages are fetched concurrently while maps of
+        the current page are yielded.
+
+        :param max_results: maximal amount of yielded maps. None means all maps.
+        :param prefetch: amount of pages fetched ahead.
+        """
+
+        return _iter_pages(self.fetch_own_maps, max_results, prefetch)
+
+    def iter_favorite_maps(self, max_results: Union[int, None] = None, prefetch=2) -> AsyncIterator[Bonk2Map]:
+        """
+        Iterates over all pages of account favorite maps. Next pages are fetched concurrently while maps of
+        the current page are yielded.
+
+        :param max_results: maximal amount of yielded maps. None means all maps.
+        :param prefetch: amount of pages fetched ahead.
+        """
+
+        return _iter_pages(self.fetch_favorite_maps, max_results, prefetch)
+
     async def fetch_friend_list(self) -> FriendList:
         """Returns account friend list that contains friends and friend requests."""
 
@@ -0,0 +1,70 @@
+import time
+from collections import deque
+from typing import Deque, Tuple, Union
+
+
+class ClockSync:
+    """
+    Estimates offset between local monotonic clock and bonk server clock from timesync packets. Every answered packet
+    gives a sample of round-trip time and offset; the sample with the lowest round-trip time among the latest ones is
+    used, since it's the least affected by network and server delays. Until the first sample arrives, local clock is
+    used as is.
+
+    :param window: amount of the latest samples the best one is chosen from.
+    """
+
+    def __init__(self, window=16) -> None:
+        # (round-trip time, offset) in seconds
+        self.__samples: Deque[Tuple[float, float]] = deque(maxlen=window)
+        self.__best: Union[Tuple[float, float], None] = None
+
+    @property
+    def is_synced(self) -> bool:
+        """Whether at least one sample has been received."""
+
+        return self.__best is not None
+
+    @property
+    def offset(self) -> float:
+        """Estimated server time minus local monotonic time in seconds."""
+
+        return 0.0 if self.__best is None else self.__best[1]
+
+    @property
+    def rtt(self) -> Union[float, None]:
+        """Round-trip time of the chosen sample in seconds."""
+
+        return None if self.__best is None else self.__best[0]
+
+    @property
+    def error(self) -> Union[float, None]:
+        """Maximal error of the estimated offset in seconds, which is half of the chosen round-trip time."""
+
+        return None if self.__best is None else self.__best[0] / 2
+
+    def add_sample(self, sent_time: float, received_time: float, server_time: float) -> None:
+        """
+        Adds timesync sample.
+
+        :param sent_time: local monotonic time when timesync packet was sent, in seconds.
+        :param received_time: local monotonic time when the answer was received, in seconds.
+        :param server_time: server time from the answer, in milliseconds.
+        """
+
+        rtt = received_time - sent_time
+
+        # Server time is assumed to be taken halfway through the round trip
+        self.__samples.append((rtt, server_time / 1000 - (sent_time + received_time) / 2))
+        self.__best = min(self.__samples)
+
+    def server_time(self, local_time: Union[float, None] = None) -> float:
+        """
+        Returns estimated server time in seconds.
+
+        :param local_time: local monotonic time to convert. Default is current time.
+        """
+
+        if local_time is None:
+            local_time = time.monotonic()
+
+        return local_time + self.offset
@@ -1,10 +1,10 @@
 import datetime
 from functools import cached_property
-from typing import List, Union, TYPE_CHECKING
+from typing import Dict, List, Union, TYPE_CHECKING
 import socketio
 
 from .settings import links
-from .parsers import db_id_to_date
+from .parsers import db_id_to_date, db_ids_to_dates
 from .game import Game
 from .types import Modes
 
@@ -68,11 +68,12 @@ class Friend:
 
         return db_id_to_date(self.user_id)
 
-    async def join_game(self, password="") -> Game:
+    async def join_game(self, password="", timeout: Union[float, None] = 30.0) -> Game:
         """
-        Establish connection with room where friend is playing.
+        Establish connection with room where friend is playing. Raises GameConnectionError if game can't be joined.
 
         :param password: password that is required to join the game.
+        :param timeout: maximal time in seconds to wait for the connection. None means no limit.
 
         Example usage::
 
@@ -82,7 +83,7 @@ class Friend:
             friend = [friend for friend in friend_list.get_friends() if friend.username == "test" and friend.room_id][0]
 
             async def main():
-                game = friend.join_game()
+                game = await friend.join_game()
                 await game.send_message("Hello!")
 
                 await bot.run()
@@ -90,7 +91,7 @@ class Friend:
             asyncio.run(main())
         """
 
-        return Game(
+        return await Game(
             self.bot,
             None,
             "Unknown",
@@ -100,7 +101,7 @@ class Friend:
             False,
             True,
             game_join_params=[self.room_id, password]
-        )
+        ).open(timeout)
 
 
 class FriendRequest:
@@ -228,6 +229,14 @@ class FriendList:
             ) for friend in self.__raw_data["friends"]
         ]
 
+    @cached_property
+    def friends_creation_dates(self) -> Dict[int, str]:
+        """Get approximate account creation dates of all friends, by their account database IDs."""
+
+        user_ids = [friend["id"] for friend in self.__raw_data["friends"]]
+
+        return dict(zip(user_ids, db_ids_to_dates(user_ids)))
+
     @cached_property
     def friend_requests(self) -> List[FriendRequest]:
         """Get friend requests from account friend list."""
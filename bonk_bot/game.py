@@ -1,13 +1,19 @@
 import asyncio
 import random
 import time
+import uuid
+from collections import deque
 from random import shuffle
 from string import ascii_lowercase
 import socketio
 import re
-from typing import List, Union, TYPE_CHECKING
+from typing import Deque, Dict, Iterable, List, Mapping, Tuple, Union, TYPE_CHECKING
 
 from .avatar import Avatar
+from .clock_sync import ClockSync
+from .history import History
+from .input_log import InputLog
+from .input_timeline import InputTimeline
 from .bonk_maps import OwnMap, Bonk2Map, Bonk1Map
 from .settings import PROTOCOL_VERSION, links
 from .types import Servers, AnyServer
@@ -24,6 +30,60 @@ from .parsers.parsers import (
 if TYPE_CHECKING:
     from .bot import BonkBot, GuestBonkBot, AccountBonkBot
 
+# Server errors after which bot leaves the game, retrying the join won't help
+_FATAL_GAME_ERRORS = frozenset([
+    "invalid_params",
+    "password_wrong",
+    "room_full",
+    "players_xp_too_high",
+    "players_xp_too_low",
+    "guests_not_allowed",
+    "already_in_this_room",
+    "room_not_found",
+    "avatar_data_invalid"
+])
+
+
+class _OpenTimeout:
+    """
+    Timeout of Game.open() that can be paused, so waits for join semaphores don't count against it.
+
+    :param timeout: time in seconds after which the task is cancelled. None means no limit.
+    :param task: task that connects the game.
+    """
+
+    def __init__(self, timeout: Union[float, None], task: asyncio.Future) -> None:
+        self.__time_left = timeout
+        self.__task = task
+        self.__handle: Union[asyncio.TimerHandle, None] = None
+        self.__started_at = 0.0
+        self.is_expired = False
+
+    def start(self) -> None:
+        """Starts or resumes the countdown."""
+
+        if self.__time_left is None or self.__handle is not None or self.is_expired:
+            return
+
+        loop = asyncio.get_running_loop()
+        self.__started_at = loop.time()
+        self.__handle = loop.call_later(self.__time_left, self.__expire)
+
+    def pause(self) -> None:
+        """Pauses the countdown, time that is left is kept for the next start()."""
+
+        if self.__handle is None:
+            return
+
+        self.__handle.cancel()
+        self.__handle = None
+        self.__time_left -= asyncio.get_running_loop().time() - self.__started_at
+
+    def __expire(self) -> None:
+        self.__handle = None
+        self.is_expired = True
+        self.__task.cancel()
+
 
 class Game:
     """
@@ -60,11 +120,24 @@ class Game:
         self.server: Union[AnyServer, None] = server
         self.room_name: str = room_name
         self.room_password = ""
-        self._players: List[Player] = []
-        self.messages: List[Message] = []
+        self._players: PlayerList = PlayerList()
+        # Unique key of the game's history streams in spill, since room names aren't unique
+        self.history_key: str = uuid.uuid4().hex
+        self.messages: History[Message] = History(
+            bot.history_size,
+            bot.history_spill,
+            f"{self.history_key}:messages",
+            Message.to_record
+        )
         self._match: Union[Match, None] = None
         self._bot_move_count = 0
         self.bot_ping: Union[int, None] = None
+        # Round-trip times of the latest timesync packets in milliseconds
+        self.timesync_rtts: Deque[float] = deque(maxlen=20)
+        self.clock: ClockSync = ClockSync()
+        self.__timesync_id = 0
+        # Send times of timesync packets that aren't answered yet
+        self.__pending_timesyncs: Dict[int, float] = {}
         self._is_host = is_host
         self.host: Union[Player, None] = None
         self.is_bot_ready = False
@@ -84,7 +157,12 @@ class Game:
             472,
             83
         )
-        self.requested_maps: List[MapRequestHost] = []
+        self.requested_maps: History[MapRequestHost] = History(
+            bot.history_size,
+            bot.history_spill,
+            f"{self.history_key}:requested_maps",
+            MapRequestHost.to_record
+        )
         self.join_link = ""
         self._socket_client = socketio.AsyncClient(ssl_verify=False)
         self.__is_created_by_bot: bool = is_created_by_bot
@@ -93,15 +171,19 @@ class Game:
         self.__game_create_params: Union[list, None] = game_create_params
         self.__game_join_params: Union[list, None] = game_join_params
         self.__is_connected = False
-
-        asyncio.run(self.__connect())
+        # Resolved when server acknowledges the join, created by open()
+        self.__join_result: Union[asyncio.Future, None] = None
+        self.__server_semaphores: Union[Mapping[str, asyncio.Semaphore], None] = None
+        self.__semaphore: Union[asyncio.Semaphore, None] = None
+        self.__held_semaphores: List[asyncio.Semaphore] = []
+        self.__open_timeout: Union[_OpenTimeout, None] = None
 
     @property
     def bot(self) -> "Union[BonkBot, GuestBonkBot, AccountBonkBot]":
         return self._bot
 
     @property
-    def players(self) -> "List[Player]":
+    def players(self) -> "PlayerList":
         return self._players
 
     @property
@@ -144,6 +226,123 @@ class Game:
     def socket_client(self) -> socketio.AsyncClient:
         return self._socket_client
 
+    async def open(
+        self,
+        timeout: Union[float, None] = 30.0,
+        server_semaphores: Union[Mapping[str, asyncio.Semaphore], None] = None,
+        semaphore: Union[asyncio.Semaphore, None] = None
+    ) -> "Game":
+        """
+        Connects to the game. Resolves once server acknowledges the join (or the room creation) without blocking event
+        loop, so many games can be connected at once with asyncio.gather. Raises GameConnectionError if connection
+        fails or times out.
+
+        :param timeout: maximal time in seconds to wait for the connection, not counting waits for semaphores. None
+                means no limit.
+        :param server_semaphores: semaphores keyed by server api name (for example collections.defaultdict of
+                semaphores). If set, connection to the server holds its semaphore until the join is acknowledged.
+        :param semaphore: semaphore shared by joins to all servers. It's acquired after the server semaphore and held
+                until the join is acknowledged as well, so joins queued for a busy server don't take its slots.
+
+        Example usage::
+
+            rooms = await bot.fetch_rooms()
+            games = await asyncio.gather(*[room.join() for room in rooms[:50]], return_exceptions=True)
+        """
+
+        if self.__join_result is not None:
+            raise GameConnectionError("Game is already opened", self)
+
+        self.__join_result = asyncio.get_running_loop().create_future()
+        self.__server_semaphores = server_semaphores
+        self.__semaphore = semaphore
+
+        if self.bot.session_recorder is not None:
+            self.bot.session_recorder.attach(self.socket_client, self.room_name)
+
+        async def connect_and_wait() -> None:
+            await self.__connect()
+            await self.__join_result
+
+        connection = asyncio.ensure_future(connect_and_wait())
+        self.__open_timeout = _OpenTimeout(timeout, connection)
+        self.__open_timeout.start()
+
+        try:
+            await connection
+        except (Exception, asyncio.CancelledError):
+            # CancelledError isn't an Exception subclass, but cancelled open() must be cleaned up as well
+            await self.__abort_open()
+
+            if self.__open_timeout.is_expired:
+                raise GameConnectionError("Game connection timed out", self) from None
+
+            raise
+        finally:
+            self.__open_timeout.pause()
+
+            while self.__held_semaphores:
+                self.__held_semaphores.pop().release()
+
+        return self
+
+    async def _prepare_replay(self) -> None:
+        """Registers packet handlers without connecting, so recorded packets can be fed to the game by SessionReplay."""
+
+        if self.__join_result is not None:
+            raise GameConnectionError("Game is already opened", self)
+
+        self.bot.games.append(self)
+        await self.__socket_events()
+
+    async def __abort_open(self) -> None:
+        """Cleans up after failed open()."""
+
+        self.__join_result.cancel()
+        self.__is_connected = False
+        self.bot.keep_alive.remove(self)
+
+        if self in self.bot.games:
+            self.bot.games.remove(self)
+
+        if self.socket_client.connected:
+            await self.socket_client.disconnect()
+
+    def __resolve_join(self, error: Union[str, None] = None) -> None:
+        """Resolves open() with successful join or with error."""
+
+        if self.__join_result is None or self.__join_result.done():
+            return
+
+        if error is None:
+            self.__join_result.set_result(None)
+        else:
+            self.__join_result.set_exception(GameConnectionError(error, self))
+
+    async def __connect_socket(self, server_name: str) -> None:
+        """
+        Connects socket to bonk server, waiting for server semaphore and then for shared semaphore if open() got
+        them. Open timeout is paused while waiting.
+
+        :param server_name: server api name.
+        """
+
+        semaphores = [] if self.__server_semaphores is None else [self.__server_semaphores[server_name]]
+
+        if self.__semaphore is not None:
+            semaphores.append(self.__semaphore)
+
+        if semaphores and self.__open_timeout is not None:
+            self.__open_timeout.pause()
+
+            for semaphore in semaphores:
+                await semaphore.acquire()
+                self.__held_semaphores.append(semaphore)
+
+            self.__open_timeout.start()
+
+        await self.socket_client.connect(links["game_server"].format(server=server_name))
+
     async def __connect(self) -> None:
         """Method that establishes connection with game."""
 
@@ -442,11 +641,23 @@ class Game:
 
         await self.socket_client.disconnect()
 
+        self.__resolve_join("Disconnected before joining the game")
         self.__is_connected = False
-        self.bot.games.remove(self)
+        self.bot.keep_alive.remove(self)
+        self.__end_match()
+
+        # Game is already removed if it's left while open() is being aborted
+        if self in self.bot.games:
+            self.bot.games.remove(self)
 
         self.bot.event_emitter.emit("game_disconnect", self)
 
+    def __end_match(self) -> None:
+        """Cancels bot inputs that are scheduled in the current match."""
+
+        if self._match is not None:
+            self._match.timeline.close()
+
     @staticmethod
     def __get_peer_id() -> str:
         """Generates new peer_id that is needed for game connection."""
@@ -458,9 +669,7 @@ class Game:
     def __get_player_from_short_id(self, short_id: int) -> "Player":
         """Finds player in the room by their short id."""
 
-        for player in self.players:
-            if player.short_id == short_id:
-                return player
+        return self.players.get_by_short_id(short_id)
 
     async def __create(
         self,
@@ -483,7 +692,6 @@ class Game:
         :param max_level: the maximum level required from other players to join; can't be lower than bot's level.
         """
 
-        socket_address = f"https://{server.api_name}.bonk.io/socket.io"
         base_room_name = f"{self.bot.username}'s game"
 
         if name == "":
@@ -565,8 +773,7 @@ class Game:
 
         await self.__socket_events()
 
-        await self.socket_client.connect(socket_address)
-        await self.__keep_alive()
+        await self.__connect_socket(server.api_name)
 
     async def __join_from_friend_list(self, room_id: int, password="") -> None:
         """
@@ -586,6 +793,7 @@ class Game:
         error = room_data.get("e")
 
         if error:
+            self.__resolve_join(error)
             self.bot.event_emitter.emit("error", GameConnectionError(error, self))
             return
 
@@ -624,8 +832,7 @@ class Game:
 
         await self.__socket_events()
 
-        await self.socket_client.connect(f"https://{room_data['server']}.bonk.io/socket.io")
-        await self.__keep_alive()
+        await self.__connect_socket(room_data["server"])
 
     async def __join_from_room_link(self, link: str, password="") -> None:
         """
@@ -680,9 +887,9 @@ class Game:
 
             await self.__socket_events()
 
-            await self.socket_client.connect(f"https://{room_data[2]}.bonk.io/socket.io")
-            await self.__keep_alive()
+            await self.__connect_socket(room_data[2])
         except IndexError:
+            self.__resolve_join("Room is not found")
             self.bot.event_emitter.emit(
                 "error",
                 GameConnectionError("Room is not found", self)
@@ -707,6 +914,7 @@ class Game:
         error = room_data.get("e")
 
         if error:
+            self.__resolve_join(error)
             self.bot.event_emitter.emit("error", GameConnectionError(error, self))
             return
 
@@ -745,30 +953,36 @@ class Game:
 
         await self.__socket_events()
 
-        await self.socket_client.connect(f"https://{room_data['server']}.bonk.io/socket.io")
-        await self.__keep_alive()
+        await self.__connect_socket(room_data["server"])
 
-    async def __keep_alive(self) -> None:
-        """Sends timesync packet every 5 seconds to prevent bonk server from kicking bot."""
+    async def _send_timesync(self) -> None:
+        """Sends timesync packet. Called by bot's keep alive scheduler to prevent bonk server from kicking bot."""
 
-        ping_id = 1
+        self.__timesync_id += 1
 
-        while self.__is_connected:
-            await self.socket_client.emit(
-                18,
-                {
-                    "jsonrpc": "2.0",
-                    "id": ping_id,
-                    "method": "timesync",
-                }
-            )
-            await asyncio.sleep(5)
+        # Unanswered packets are forgotten, so lost answers don't pile up
+        if len(self.__pending_timesyncs) >= self.timesync_rtts.maxlen:
+            del self.__pending_timesyncs[next(iter(self.__pending_timesyncs))]
 
-            ping_id += 1
+        self.__pending_timesyncs[self.__timesync_id] = time.monotonic()
+
+        await self.socket_client.emit(
+            18,
+            {
+                "jsonrpc": "2.0",
+                "id": self.__timesync_id,
+                "method": "timesync",
+            }
+        )
 
     async def __socket_events(self) -> None:
         """Game event listener."""
 
+        @self.socket_client.on("disconnect")
+        async def on_disconnect() -> None:
+            # Server dropped the connection before acknowledging the join, so open() doesn't wait until timeout
+            self.__resolve_join("Disconnected before joining the game")
+
         @self.socket_client.on(1)
         async def on_ping(ping_data: dict, ping_id: int) -> None:
             for ping in ping_data.keys():
@@ -800,9 +1014,8 @@ class Game:
             bypass: str,
             w8
         ) -> None:
-            for player in players:
+            for player_short_id, player in enumerate(players):
                 if player:
-                    player_short_id = players.index(player)
                     self.players.append(
                         Player(
                             self.bot,
@@ -830,6 +1043,8 @@ class Game:
                     self._teams = True
 
             self.__is_connected = True
+            self.__resolve_join()
+            self.bot.keep_alive.add(self)
             self.bot.event_emitter.emit("game_connect", self)
 
         @self.socket_client.on(4)
@@ -950,6 +1165,9 @@ class Game:
                 player = self.__get_player_from_short_id(player_short_id)
                 move_direction = move_direction_from_number(move_data["i"])
 
+                if self.match is not None and self.match.input_log is not None:
+                    self.match.input_log.append(move_data["f"], player_short_id, move_data["i"], move_data["c"])
+
                 player_move = PlayerMove(
                     move_direction,
                     self,
@@ -959,7 +1177,7 @@ class Game:
                     move_data["c"]
                 )
                 self.bot.event_emitter.emit("player_move", player_move)
-            except KeyError:
+            except (KeyError, ValueError):
                 pass
 
         @self.socket_client.on(8)
@@ -972,11 +1190,13 @@ class Game:
 
         @self.socket_client.on(13)
         async def on_match_abort() -> None:
+            self.__end_match()
             self._in_lobby = True
             self.bot.event_emitter.emit("match_abort", self)
 
         @self.socket_client.on(15)
         async def on_match_start(timestamp: int, map_data: str, additional_data: dict) -> None:
+            self.__end_match()
             self._in_lobby = False
             new_match = Match(self.bot, self, self.bonk_map)
 
@@ -985,20 +1205,14 @@ class Game:
 
         @self.socket_client.on(16)
         async def on_error(error) -> None:
+            # Join is resolved before emitting, since error event raises if it isn't handled
+            if error in _FATAL_GAME_ERRORS:
+                self.__resolve_join(error)
+
             if error != "rate_limit_pong":
                 self.bot.event_emitter.emit("error", GameConnectionError(error, self))
 
-            if error in [
-                "invalid_params",
-                "password_wrong",
-                "room_full",
-                "players_xp_too_high",
-                "players_xp_too_low",
-                "guests_not_allowed",
-                "already_in_this_room",
-                "room_not_found",
-                "avatar_data_invalid"
-            ]:
+            if error in _FATAL_GAME_ERRORS:
                 await self.leave()
 
         @self.socket_client.on(18)
@@ -1033,6 +1247,17 @@ class Game:
             self._team_lock = data["tl"]
             self._rounds = data["wl"]
 
+        @self.socket_client.on(23)
+        async def on_timesync(data: dict) -> None:
+            received_time = time.monotonic()
+            sent_time = self.__pending_timesyncs.pop(data.get("id"), None)
+
+            if sent_time is not None:
+                self.timesync_rtts.append((received_time - sent_time) * 1000)
+
+                if "result" in data:
+                    self.clock.add_sample(sent_time, received_time, data["result"])
+
         @self.socket_client.on(24)
         async def on_player_kick(player_short_id: int, kick_only: bool) -> None:
             player = self.__get_player_from_short_id(player_short_id)
@@ -1174,6 +1399,7 @@ class Game:
 
         @self.socket_client.on(48)
         async def on_match_info(data: dict) -> None:
+            self.__end_match()
             self._match = Match(self.bot, self, self.bonk_map, data["fc"])
             self._in_lobby = False
 
@@ -1181,6 +1407,8 @@ class Game:
         async def on_join_link_receive(join_link_number: int, bypass: str) -> None:
             self.join_link = f"https://bonk.io/{join_link_number:06}{bypass}"
             self.__is_connected = True
+            self.__resolve_join()
+            self.bot.keep_alive.add(self)
             self.bot.event_emitter.emit("game_connect", self)
 
         @self.socket_client.on(52)
@@ -1207,6 +1435,98 @@ class Game:
                 self.bot.event_emitter.emit("room_password_clear", self)
 
 
+class PlayerList(list):
+    """
+    List of game players that is also indexed by players' short id, peer id and username, so players are found
+    without scanning the list.
+
+    :param players: initial players.
+    """
+
+    def __init__(self, players: "Iterable[Player]" = ()) -> None:
+        super().__init__()
+        self.__by_short_id: "Dict[int, Player]" = {}
+        self.__by_peer_id: "Dict[str, Player]" = {}
+        self.__by_username: "Dict[str, Player]" = {}
+        self.extend(players)
+
+    def get_by_short_id(self, short_id: int) -> "Union[Player, None]":
+        """Finds player by their short id. Returns None if there is no such player."""
+
+        return self.__by_short_id.get(short_id)
+
+    def get_by_peer_id(self, peer_id: str) -> "Union[Player, None]":
+        """Finds player by their peer id. Returns None if there is no such player."""
+
+        return self.__by_peer_id.get(peer_id)
+
+    def get_by_username(self, username: str) -> "Union[Player, None]":
+        """Finds player by their username. Returns None if there is no such player."""
+
+        return self.__by_username.get(username)
+
+    def __index(self, player: "Player") -> None:
+        self.__by_short_id[player.short_id] = player
+        self.__by_peer_id[player.peer_id] = player
+        self.__by_username[player.username] = player
+
+    def __unindex(self, player: "Player") -> None:
+        for index, key in (
+            (self.__by_short_id, player.short_id),
+            (self.__by_peer_id, player.peer_id),
+            (self.__by_username, player.username)
+        ):
+            if index.get(key) is player:
+                del index[key]
+
+    def __reindex(self) -> None:
+        self.__by_short_id.clear()
+        self.__by_peer_id.clear()
+        self.__by_username.clear()
+
+        for player in self:
+            self.__index(player)
+
+    def append(self, player: "Player") -> None:
+        super().append(player)
+        self.__index(player)
+
+    def extend(self, players: "Iterable[Player]") -> None:
+        for player in players:
+            self.append(player)
+
+    def insert(self, index: int, player: "Player") -> None:
+        super().insert(index, player)
+        self.__index(player)
+
+    def remove(self, player: "Player") -> None:
+        super().remove(player)
+        self.__unindex(player)
+
+    def pop(self, index=-1) -> "Player":
+        player = super().pop(index)
+        self.__unindex(player)
+
+        return player
+
+    def clear(self) -> None:
+        super().clear()
+        self.__reindex()
+
+    def __setitem__(self, index, value) -> None:
+        super().__setitem__(index, value)
+        self.__reindex()
+
+    def __delitem__(self, index) -> None:
+        super().__delitem__(index)
+        self.__reindex()
+
+    def __iadd__(self, players: "Iterable[Player]") -> "PlayerList":
+        self.extend(players)
+
+        return self
+
+
 class Player:
     """
     Class that holds bonk.io game players' info.
@@ -1284,6 +1604,10 @@ class Player:
     def short_id(self) -> int:
         return self._short_id
 
+    @property
+    def peer_id(self) -> str:
+        return self.__peer_id
+
     async def kick(self) -> None:
         """Kick player from game."""
 
@@ -1414,6 +1738,14 @@ class Message:
         self.author: Player = author
         self.content: str = content
 
+    def to_record(self) -> dict:
+        """Returns message data that is written to history spill."""
+
+        return {
+            "author": self.author.username if self.author else None,
+            "content": self.content
+        }
+
 
 class MapRequestHost:
     """
@@ -1444,6 +1776,14 @@ class MapRequestHost:
     def level_data(self) -> str:
         return self._level_data
 
+    def to_record(self) -> dict:
+        """Returns map request data that is written to history spill."""
+
+        return {
+            "player": self.player_requested.username if self.player_requested else None,
+            "level_data": self.level_data
+        }
+
     @property
     def bonk_map(self) -> Bonk2Map:
         map_decoded_data = decode_bonk_map_metadata(self.level_data)
@@ -1575,9 +1915,16 @@ class Match:
         self.bot: "Union[BonkBot, GuestBonkBot, AccountBonkBot]" = bot
         self._game: Game = game
         self.bonk_map: Union[OwnMap, Bonk2Map, Bonk1Map] = bonk_map
-        self._inputs: List[AnyGameInput] = []
+        self.timeline: InputTimeline = InputTimeline(self)
+        # Inputs of all players, recorded if bot.record_inputs is set
+        self.input_log: Union[InputLog, None] = InputLog() if bot.record_inputs else None
         self.__offset: int = offset
-        self.__start = time.time()
+        # Local monotonic time when frame number offset was played. Packet that started the match or told the frame
+        # count was sent by server one-way delay ago
+        self.__start = time.monotonic() - (game.clock.error or 0.0)
+        # Clock offset that converts start to server time. If match starts before the clock is synced, it's taken
+        # from the first estimate, since the clock switches from local time to server time then
+        self.__start_offset: Union[float, None] = game.clock.offset if game.clock.is_synced else None
 
     @property
     def game(self) -> Game:
@@ -1585,44 +1932,79 @@ class Match:
 
     @property
     def inputs(self) -> List[AnyGameInput]:
-        return self._inputs
+        return self.timeline.keys
 
     @property
     def current_frame(self) -> int:
-        return int((time.time() - self.__start) * 30) + self.__offset
+        """Predicted current server frame. It follows game clock, so it's corrected as clock estimate improves."""
+
+        return int((self.game.clock.server_time() - self.__server_start()) * 30) + self.__offset
+
+    @property
+    def frame_error(self) -> Union[float, None]:
+        """Estimated maximal error of current_frame in frames. None if game clock isn't synced yet."""
+
+        if self.game.clock.error is None:
+            return None
+
+        return self.game.clock.error * 30
+
+    def frame_time(self, frame: int) -> float:
+        """
+        Returns local monotonic time when the frame starts.
+
+        :param frame: match frame.
+        """
+
+        return self.__server_start() + (frame - self.__offset) / 30 - self.game.clock.offset
+
+    def __server_start(self) -> float:
+        """Returns start in the same time base as game clock."""
+
+        if self.__start_offset is None:
+            if not self.game.clock.is_synced:
+                return self.__start
+
+            self.__start_offset = self.game.clock.offset
+
+        return self.__start + self.__start_offset
 
     async def move(self, time_in_ms: int, *input_keys: AnyGameInput) -> None:
         """
-        Presses input key(s) in the game.
+        Presses input key(s) in the game. Keys are pressed on the current frame and released on the frame boundary
+        after the given time. Overlapping moves can hold the same key, it's released when the last of them ends.
 
         :param time_in_ms: how long should key be pressed (in ms).
         :param input_keys: what keys should be pressed.
         """
 
-        self.inputs.extend(input_keys)
-        new_input = 0
-
-        for input_key in self.inputs:
-            new_input |= input_key.bits
+        frame = self.current_frame
+        self.timeline.schedule(frame, input_keys)
 
-        await self.__send_move_packet(new_input)
-        await asyncio.sleep(time_in_ms / 1000)
+        await self.timeline.schedule(frame + max(1, round(time_in_ms * 30 / 1000)), keys_up=input_keys)
 
-        for unpressed_key in input_keys:
-            new_input ^= unpressed_key.bits
-            self.inputs.remove(unpressed_key)
+    async def _send_move_packet(self, bits: int, frame: int) -> None:
+        """
+        Sends bot inputs. Called by input timeline.
 
-        await self.__send_move_packet(new_input)
+        :param bits: bitmask of held keys.
+        :param frame: frame when keys are changed.
+        """
 
-    async def __send_move_packet(self, bits: int) -> None:
         await self.game.socket_client.emit(
             4,
             {
                 "i": bits,
-                "f": self.current_frame,
+                "f": frame,
                 "c": self.game._bot_move_count
             }
         )
+
+        if self.input_log is not None:
+            bot_player = self.game.players.get_by_username(self.bot.username)
+
+            if bot_player is not None:
+                self.input_log.append(frame, bot_player.short_id, bits, self.game._bot_move_count)
         self.game._bot_move_count += 1
 
 
@@ -1639,14 +2021,14 @@ class PlayerMove:
 
     def __init__(
         self,
-        input_keys: List[AnyGameInput],
+        input_keys: Tuple[AnyGameInput, ...],
         game: Game,
         match: Match,
         player: Player,
         frame: int,
         sequence_number: int
     ) -> None:
-        self.input_keys: List[AnyGameInput] = input_keys
+        self.input_keys: Tuple[AnyGameInput, ...] = input_keys
         self.game: Game = game
         self.match: Match = match
         self.player: Player = player
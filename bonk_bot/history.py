@@ -0,0 +1,212 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Generic, Iterator, List, Tuple, TypeVar, Union
+
+from .sqlite_writer import BatchedSQLiteWriter, connect_sqlite
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    stream TEXT NOT NULL,
+    time REAL NOT NULL,
+    record TEXT NOT NULL
+)
+"""
+_INDEX = "CREATE INDEX IF NOT EXISTS history_stream ON history (stream, id)"
+
+_T = TypeVar("_T")
+
+
+class HistorySpill:
+    """
+    Append-only SQLite log that game histories write their items to, so items that no longer fit in memory can still
+    be read. Rows are written in batches by a background thread. One spill can be shared by many games, every history
+    writes to its own stream.
+
+    :param path: path to SQLite database file.
+    :param batch_size: maximal amount of rows written in one transaction.
+    :param flush_interval: maximal time in seconds new row waits before it's written.
+    """
+
+    def __init__(self, path: str, batch_size=256, flush_interval=1.0) -> None:
+        if path == ":memory:":
+            raise ValueError("In-memory databases are not supported")
+
+        self.path: str = path
+        self.__reader_lock = threading.Lock()
+        self.__reader = connect_sqlite(path)
+        self.__reader.execute(_SCHEMA)
+        self.__reader.execute(_INDEX)
+        self.__reader.commit()
+        self.__writer = BatchedSQLiteWriter(
+            path,
+            self.__write_batch,
+            batch_size,
+            flush_interval,
+            "bonk_bot history writer"
+        )
+
+    @property
+    def batch_size(self) -> int:
+        """Maximal amount of rows written in one transaction."""
+
+        return self.__writer.batch_size
+
+    @property
+    def flush_interval(self) -> float:
+        """Maximal time in seconds new row waits before it's written."""
+
+        return self.__writer.flush_interval
+
+    def write(self, stream: str, record: dict) -> None:
+        """
+        Queues record to be written.
+
+        :param stream: name of the stream record belongs to.
+        :param record: JSON serializable record.
+        """
+
+        if self.__writer.is_closed:
+            raise ValueError("History spill is closed")
+
+        self.__writer.put((stream, time.time(), json.dumps(record)))
+
+    def iter_pages(self, stream: str, page_size=100) -> Iterator[List[dict]]:
+        """
+        Pages back through records of the stream, from the newest one. Only one page is loaded at a time. Every
+        record also has "time" key with unix time when it was written. Records that are still queued aren't included,
+        call flush() first (it blocks, so from a thread when event loop is running) to include them.
+
+        :param stream: name of the stream.
+        :param page_size: amount of records in every page.
+        """
+
+        last_id = None
+
+        while True:
+            with self.__reader_lock:
+                if last_id is None:
+                    rows = self.__reader.execute(
+                        "SELECT id, time, record FROM history WHERE stream = ? ORDER BY id DESC LIMIT ?",
+                        (stream, page_size)
+                    ).fetchall()
+                else:
+                    rows = self.__reader.execute(
+                        "SELECT id, time, record FROM history WHERE stream = ? AND id < ? ORDER BY id DESC LIMIT ?",
+                        (stream, last_id, page_size)
+                    ).fetchall()
+
+            if not rows:
+                return
+
+            last_id = rows[-1][0]
+
+            yield [dict(json.loads(record), time=record_time) for _, record_time, record in rows]
+
+    def flush(self) -> None:
+        """Blocks until all queued records are written."""
+
+        self.__writer.flush()
+
+    def close(self) -> None:
+        """Writes queued records and closes database."""
+
+        if self.__writer.is_closed:
+            return
+
+        self.__writer.close()
+
+        with self.__reader_lock:
+            self.__reader.close()
+
+    def __enter__(self) -> "HistorySpill":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __write_batch(self, connection: sqlite3.Connection, rows: List[Tuple[str, float, str]]) -> None:
+        with connection:
+            connection.executemany("INSERT INTO history (stream, time, record) VALUES (?, ?, ?)", rows)
+
+
+class History(Generic[_T]):
+    """
+    Ring buffer that keeps the latest game items (messages, map requests) in memory. Supports iteration, len() and
+    indexing like a list. If spill is set, every item is also written to it as a record, so older items can be paged
+    back through with iter_spilled.
+
+    :param max_items: amount of items kept in memory. None means all items are kept.
+    :param spill: history spill to write items to.
+    :param stream: name of the stream that items are written to in spill.
+    :param to_record: converts item to JSON serializable record for spill.
+    """
+
+    def __init__(
+        self,
+        max_items: Union[int, None] = 1000,
+        spill: Union[HistorySpill, None] = None,
+        stream="",
+        to_record: Union[Callable[[_T], dict], None] = None
+    ) -> None:
+        if spill is not None and to_record is None:
+            raise ValueError("to_record is required to write items to spill")
+
+        self.__items: Deque[_T] = deque(maxlen=max_items)
+        self.spill: Union[HistorySpill, None] = spill
+        self.stream: str = stream
+        self.__to_record: Union[Callable[[_T], dict], None] = to_record
+
+    @property
+    def max_items(self) -> Union[int, None]:
+        """Amount of items kept in memory. When it's lowered, the oldest items are dropped."""
+
+        return self.__items.maxlen
+
+    @max_items.setter
+    def max_items(self, max_items: Union[int, None]) -> None:
+        self.__items = deque(self.__items, maxlen=max_items)
+
+    def append(self, item: _T) -> None:
+        self.__items.append(item)
+
+        if self.spill is not None:
+            self.spill.write(self.stream, self.__to_record(item))
+
+    def clear(self) -> None:
+        """Removes all items from memory. Spilled records are kept."""
+
+        self.__items.clear()
+
+    def iter_spilled(self, page_size=100) -> Iterator[List[dict]]:
+        """
+        Pages back through all spilled records of this history, from the newest one.
+
+        :param page_size: amount of records in every page.
+        """
+
+        if self.spill is None:
+            return iter(())
+
+        return self.spill.iter_pages(self.stream, page_size)
+
+    def __len__(self) -> int:
+        return len(self.__items)
+
+    def __iter__(self) -> Iterator[_T]:
+        return iter(self.__items)
+
+    def __reversed__(self) -> Iterator[_T]:
+        return reversed(self.__items)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[_T, List[_T]]:
+        if isinstance(index, slice):
+            return list(self.__items)[index]
+
+        return self.__items[index]
+
+    def __repr__(self) -> str:
+        return f"History({list(self.__items)!r})"
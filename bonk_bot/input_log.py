@@ -0,0 +1,307 @@
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Header of saved input log: magic, format version and amount of inputs
+_HEADER = struct.Struct("<4sHI")
+_MAGIC = b"BKIL"
+_VERSION = 1
+
+# Column names and array type codes, in the order columns are saved
+_COLUMNS = (("frames", "I"), ("short_ids", "B"), ("bits", "B"), ("sequences", "I"))
+
+
+class PlayerInputs:
+    """
+    Read-only view of inputs of one player. Columns are memoryviews over input log arrays, so no Python object is
+    created per input until a value is read.
+
+    :param short_id: player short id.
+    :param frames: frames when inputs were performed.
+    :param bits: input bitmasks, see GameInputs.
+    :param sequences: sequence numbers of inputs.
+    :param is_sorted: whether frames never go back, which allows frame range views without copying.
+    """
+
+    def __init__(
+        self,
+        short_id: int,
+        frames: memoryview,
+        bits: memoryview,
+        sequences: memoryview,
+        is_sorted=True
+    ) -> None:
+        self.short_id: int = short_id
+        self.frames: memoryview = frames
+        self.bits: memoryview = bits
+        self.sequences: memoryview = sequences
+        self.__is_sorted: bool = is_sorted
+
+    def between(self, start_frame: int, end_frame: int) -> "PlayerInputs":
+        """
+        Returns inputs performed from start frame up to, but not including, end frame. Returned view shares memory
+        with this one, unless frames of the player went back (then matching inputs are copied).
+
+        :param start_frame: first frame.
+        :param end_frame: frame after the last one.
+        """
+
+        if self.__is_sorted:
+            start = bisect_left(self.frames, start_frame)
+            end = bisect_left(self.frames, end_frame, start)
+
+            return PlayerInputs(
+                self.short_id,
+                self.frames[start:end],
+                self.bits[start:end],
+                self.sequences[start:end]
+            )
+
+        indices = [index for index, frame in enumerate(self.frames) if start_frame <= frame < end_frame]
+
+        return PlayerInputs(
+            self.short_id,
+            memoryview(array("I", [self.frames[index] for index in indices])),
+            memoryview(array("B", [self.bits[index] for index in indices])),
+            memoryview(array("I", [self.sequences[index] for index in indices]))
+        )
+
+    def to_numpy(self) -> Tuple["numpy.ndarray", "numpy.ndarray", "numpy.ndarray"]:
+        """Returns frames, bits and sequences as numpy arrays that share memory with the log. Requires numpy."""
+
+        if numpy is None:
+            raise ImportError("numpy is required to convert inputs to numpy arrays")
+
+        return numpy.frombuffer(self.frames, numpy.uint32), numpy.frombuffer(self.bits, numpy.uint8), \
+            numpy.frombuffer(self.sequences, numpy.uint32)
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def __repr__(self) -> str:
+        return f"PlayerInputs(short_id={self.short_id}, inputs={len(self)})"
+
+
+class _PlayerColumns:
+    """Growable typed arrays with inputs of one player."""
+
+    def __init__(self, capacity: int) -> None:
+        self.frames = array("I", bytes(4 * capacity))
+        self.bits = array("B", bytes(capacity))
+        self.sequences = array("I", bytes(4 * capacity))
+        self.size = 0
+        self.is_sorted = True
+
+    def append(self, frame: int, bits: int, sequence: int) -> None:
+        if self.size == len(self.frames):
+            self.grow()
+
+        if self.size and frame < self.frames[self.size - 1]:
+            self.is_sorted = False
+
+        self.frames[self.size] = frame
+        self.bits[self.size] = bits
+        self.sequences[self.size] = sequence
+        self.size += 1
+
+    def grow(self) -> None:
+        # New arrays are allocated instead of resizing, since views handed out earlier hold buffers of the old ones
+        # (resizing an exported array raises BufferError). Old views stay valid and keep seeing the old inputs
+        capacity = max(2 * len(self.frames), 16)
+
+        for name in ("frames", "bits", "sequences"):
+            old = getattr(self, name)
+            new = array(old.typecode, bytes(old.itemsize * capacity))
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+
+class InputLog:
+    """
+    Records inputs of all players in the match into typed arrays, one set of arrays per player, so recording and
+    analysing inputs doesn't create a Python object per input. Arrays are preallocated and grow geometrically.
+    Enabled by setting bot.record_inputs to True before the match starts; the log is available as match.input_log.
+
+    :param capacity: amount of inputs preallocated for every player.
+
+    Example usage::
+
+        bot.record_inputs = True
+
+        @bot.event
+        async def on_match_abort(game: Game) -> None:
+            log = game.match.input_log
+            print(len(log.player(0).between(0, 300)))
+            log.save("inputs.bin")
+    """
+
+    def __init__(self, capacity=256) -> None:
+        if capacity < 1:
+            raise ValueError("Capacity must be a positive number")
+
+        self.capacity: int = capacity
+        self.__players: Dict[int, _PlayerColumns] = {}
+
+    @property
+    def short_ids(self) -> List[int]:
+        """Short ids of players that have inputs in the log."""
+
+        return list(self.__players)
+
+    def append(self, frame: int, short_id: int, bits: int, sequence: int) -> None:
+        """
+        Records input.
+
+        :param frame: frame when input was performed.
+        :param short_id: short id of player that performed input.
+        :param bits: input bitmask.
+        :param sequence: sequence number of input.
+        """
+
+        columns = self.__players.get(short_id)
+
+        if columns is None:
+            columns = self.__players[short_id] = _PlayerColumns(self.capacity)
+
+        columns.append(frame, bits, sequence)
+
+    def player(self, short_id: int) -> PlayerInputs:
+        """
+        Returns view of player inputs. View doesn't copy data and doesn't see inputs recorded after it's created.
+
+        :param short_id: player short id.
+        """
+
+        columns = self.__players.get(short_id)
+
+        if columns is None:
+            empty = memoryview(array("I"))
+            return PlayerInputs(short_id, empty, memoryview(array("B")), empty)
+
+        size = columns.size
+
+        return PlayerInputs(
+            short_id,
+            memoryview(columns.frames)[:size],
+            memoryview(columns.bits)[:size],
+            memoryview(columns.sequences)[:size],
+            columns.is_sorted
+        )
+
+    def between(self, start_frame: int, end_frame: int) -> Dict[int, PlayerInputs]:
+        """
+        Returns views of every player's inputs performed from start frame up to, but not including, end frame.
+
+        :param start_frame: first frame.
+        :param end_frame: frame after the last one.
+        """
+
+        return {short_id: self.player(short_id).between(start_frame, end_frame) for short_id in self.__players}
+
+    def to_numpy(self) -> Dict[str, "numpy.ndarray"]:
+        """
+        Returns inputs of all players as numpy arrays keyed by column name (frames, short_ids, bits, sequences), sorted
+        by frame. Requires numpy.
+        """
+
+        if numpy is None:
+            raise ImportError("numpy is required to convert inputs to numpy arrays")
+
+        columns = {name: numpy.frombuffer(self.__column(name), typecode) for name, typecode in _COLUMNS}
+        order = numpy.argsort(columns["frames"], kind="stable")
+
+        return {name: column[order] for name, column in columns.items()}
+
+    def save_npz(self, path: str) -> None:
+        """
+        Saves inputs to numpy .npz file with frames, short_ids, bits and sequences arrays. Requires numpy.
+
+        :param path: file path.
+        """
+
+        if numpy is None:
+            raise ImportError("numpy is required to save inputs to .npz files")
+
+        numpy.savez(path, **self.to_numpy())
+
+    def save(self, path: str) -> None:
+        """
+        Saves inputs to binary file: little-endian header (b"BKIL", version, amount of inputs) followed by frames
+        (uint32), short ids (uint8), bits (uint8) and sequences (uint32) columns. Inputs are grouped by player.
+
+        :param path: file path.
+        """
+
+        with open(path, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, _VERSION, len(self)))
+
+            for name, _ in _COLUMNS:
+                column = self.__column(name)
+
+                if sys.byteorder == "big":
+                    column.byteswap()
+
+                column.tofile(file)
+
+    @classmethod
+    def load(cls, path: str) -> "InputLog":
+        """
+        Loads inputs saved with save().
+
+        :param path: file path.
+        """
+
+        with open(path, "rb") as file:
+            magic, version, count = _HEADER.unpack(file.read(_HEADER.size))
+
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError("File is not an input log")
+
+            columns = {}
+
+            for name, typecode in _COLUMNS:
+                column = array(typecode)
+                column.fromfile(file, count)
+
+                if sys.byteorder == "big":
+                    column.byteswap()
+
+                columns[name] = column
+
+        input_log = cls()
+
+        for frame, short_id, bits, sequence in zip(
+            columns["frames"],
+            columns["short_ids"],
+            columns["bits"],
+            columns["sequences"]
+        ):
+            input_log.append(frame, short_id, bits, sequence)
+
+        return input_log
+
+    def __column(self, name: str) -> array:
+        """Returns column of all players concatenated in one array."""
+
+        column = array(dict(_COLUMNS)[name])
+
+        for short_id, columns in self.__players.items():
+            if name == "short_ids":
+                column.frombytes(bytes([short_id]) * columns.size)
+            else:
+                column.extend(getattr(columns, name)[:columns.size])
+
+        return column
+
+    def __len__(self) -> int:
+        return sum(columns.size for columns in self.__players.values())
+
+    def __repr__(self) -> str:
+        return f"InputLog(players={len(self.__players)}, inputs={len(self)})"
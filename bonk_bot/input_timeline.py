@@ -0,0 +1,229 @@
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Iterable, List, Sequence, Tuple, Union, TYPE_CHECKING
+
+from .types import GameInputs, AnyGameInput
+
+if TYPE_CHECKING:
+    from .game import Match
+
+# Single key bits, every key is reference counted separately
+_KEY_BITS = (1, 2, 4, 8, 16, 32)
+
+InputChange = Tuple[int, Sequence[AnyGameInput], Sequence[AnyGameInput]]
+
+
+def compile_macro(steps: Iterable[Tuple[int, Iterable[AnyGameInput]]]) -> List[InputChange]:
+    """
+    Compiles macro to input changes with frames relative to macro start, which can be passed to
+    InputTimeline.schedule_sequence. Every step holds its keys for the given amount of frames; all keys are released
+    after the last step.
+
+    :param steps: (frames, keys) pairs.
+
+    Example usage::
+
+        jump_right = compile_macro([(10, [GameInputs.Right]), (5, [GameInputs.Right, GameInputs.Up]), (3, [])])
+    """
+
+    changes = []
+    frame = 0
+    held = GameInputs.NoneInput
+
+    for frames, keys in steps:
+        if frames < 0:
+            raise ValueError("Step length must not be negative")
+
+        step_keys = GameInputs.NoneInput
+
+        for key in keys:
+            step_keys |= key
+
+        if step_keys != held:
+            changes.append((frame, _split_keys(step_keys & ~held), _split_keys(held & ~step_keys)))
+            held = step_keys
+
+        frame += frames
+
+    if held:
+        changes.append((frame, (), _split_keys(held)))
+
+    return changes
+
+
+def _split_keys(keys: int) -> Tuple[GameInputs, ...]:
+    return tuple(GameInputs(bit) for bit in _KEY_BITS if keys & bit)
+
+
+def _keys_to_bits(keys: Iterable[AnyGameInput]) -> int:
+    bits = 0
+
+    for key in keys:
+        if not isinstance(key, GameInputs):
+            raise TypeError("Key is not a game input")
+
+        bits |= key.bits
+
+    return bits
+
+
+class InputTimeline:
+    """
+    Keeps the keys that bot holds in the match and changes them at scheduled frames. Every key has a reference
+    count, so overlapping moves that hold the same key don't release it for each other. Changes are applied by one
+    task that wakes up on frame boundaries of the match clock; changes that land on the same frame are sent in one
+    packet.
+
+    :param match: match that inputs are sent to.
+    """
+
+    def __init__(self, match: "Match") -> None:
+        self.match: "Match" = match
+        self.__key_counts: List[int] = [0] * len(_KEY_BITS)
+        self.__sent_bits = 0
+        # Heap of (frame, insertion number, keys down bits, keys up bits, future resolved when change is sent)
+        self.__changes: List[Tuple[int, int, int, int, asyncio.Future]] = []
+        self.__counter = itertools.count()
+        self.__task: Union[asyncio.Task, None] = None
+        self.__wake: Union[asyncio.Event, None] = None
+        self.__closed = False
+
+    @property
+    def is_closed(self) -> bool:
+        return self.__closed
+
+    @property
+    def bits(self) -> int:
+        """Bitmask of the keys that are held."""
+
+        return sum(bit for bit, count in zip(_KEY_BITS, self.__key_counts) if count)
+
+    @property
+    def keys(self) -> List[GameInputs]:
+        """Keys that are held."""
+
+        return list(_split_keys(self.bits))
+
+    def schedule(
+        self,
+        frame: int,
+        keys_down: Iterable[AnyGameInput] = (),
+        keys_up: Iterable[AnyGameInput] = ()
+    ) -> asyncio.Future:
+        """
+        Schedules keys to be pressed and released at the frame. Changes for frames that have already passed are sent
+        right away, in one packet with other changes that are due. Returns future that is resolved when the change is
+        sent, or when the timeline is closed. Changes scheduled after the timeline is closed are ignored and get an
+        already resolved future.
+
+        :param frame: match frame.
+        :param keys_down: keys to press.
+        :param keys_up: keys to release.
+        """
+
+        future = asyncio.get_running_loop().create_future()
+
+        if self.__closed:
+            future.set_result(None)
+            return future
+
+        heapq.heappush(
+            self.__changes,
+            (frame, next(self.__counter), _keys_to_bits(keys_down), _keys_to_bits(keys_up), future)
+        )
+
+        if self.__task is None or self.__task.done():
+            self.__wake = asyncio.Event()
+            self.__task = asyncio.ensure_future(self.__run())
+        else:
+            self.__wake.set()
+
+        return future
+
+    def schedule_sequence(self, changes: Iterable[InputChange], start_frame: Union[int, None] = None) -> asyncio.Future:
+        """
+        Schedules (frame, keys_down, keys_up) changes, for example compiled macro. Returns future that is resolved
+        when the last change is sent.
+
+        :param changes: changes with frames relative to start frame.
+        :param start_frame: frame that changes start from. Default is the next frame.
+        """
+
+        if start_frame is None:
+            start_frame = self.match.current_frame + 1
+
+        futures = [self.schedule(start_frame + frame, keys_down, keys_up) for frame, keys_down, keys_up in changes]
+
+        if not futures:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(None)
+            return future
+
+        return asyncio.ensure_future(asyncio.gather(*futures))
+
+    def close(self) -> None:
+        """
+        Drops scheduled changes and releases all keys. Called when match ends. Futures of dropped changes are resolved
+        rather than cancelled, so tasks that wait for them (like Match.move) aren't cancelled.
+        """
+
+        self.__closed = True
+
+        if self.__task is not None:
+            self.__task.cancel()
+
+        for *_, future in self.__changes:
+            if not future.done():
+                future.set_result(None)
+
+        self.__changes.clear()
+        self.__key_counts = [0] * len(_KEY_BITS)
+        self.__sent_bits = 0
+
+    async def __run(self) -> None:
+        while self.__changes:
+            frame = self.__changes[0][0]
+            delay = self.match.frame_time(frame) - time.monotonic()
+
+            if delay > 0:
+                # Woken up early if change for an earlier frame is scheduled
+                self.__wake.clear()
+
+                try:
+                    await asyncio.wait_for(self.__wake.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+
+                continue
+
+            # If loop is late, every change that is already due is sent in one packet
+            frame = max(frame, self.match.current_frame)
+            futures = []
+
+            while self.__changes and self.__changes[0][0] <= frame:
+                _, _, keys_down, keys_up, future = heapq.heappop(self.__changes)
+                self.__apply(keys_down, keys_up)
+                futures.append(future)
+
+            bits = self.bits
+
+            try:
+                if bits != self.__sent_bits:
+                    self.__sent_bits = bits
+                    await self.match._send_move_packet(bits, frame)
+            finally:
+                # Resolved even if sending fails or timeline is closed meanwhile, so nobody waits for them forever
+                for future in futures:
+                    if not future.done():
+                        future.set_result(None)
+
+    def __apply(self, keys_down: int, keys_up: int) -> None:
+        for index, bit in enumerate(_KEY_BITS):
+            if keys_down & bit:
+                self.__key_counts[index] += 1
+
+            if keys_up & bit and self.__key_counts[index] > 0:
+                self.__key_counts[index] -= 1
+
@@ -0,0 +1,103 @@
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Dict, List, Tuple, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .game import Game
+
+
+class KeepAliveScheduler:
+    """
+    Sends timesync packets that keep bonk servers from kicking the bot. Every connected game of the bot is serviced by
+    one task, which sleeps until the next game is due, so the overhead doesn't grow with the amount of games. Games
+    are added when they're connected and removed when they're left.
+
+    :param interval: time in seconds between timesync packets of every game.
+    """
+
+    def __init__(self, interval=5.0) -> None:
+        if interval <= 0:
+            raise ValueError("Interval must be a positive number")
+
+        self.interval: float = interval
+        # Heap of (due time, insertion number, game). Entries of removed games are skipped when they're popped
+        self.__heap: List[Tuple[float, int, "Game"]] = []
+        self.__due: Dict["Game", float] = {}
+        self.__counter = itertools.count()
+        self.__task: Union[asyncio.Task, None] = None
+        self.__wake: Union[asyncio.Event, None] = None
+
+    @property
+    def games(self) -> List["Game"]:
+        """Games that are being kept alive."""
+
+        return list(self.__due)
+
+    def add(self, game: "Game") -> None:
+        """
+        Starts keeping game alive. The first timesync packet is sent right away.
+
+        :param game: connected game.
+        """
+
+        if game in self.__due:
+            return
+
+        self.__schedule(game, time.monotonic())
+
+        if self.__task is None or self.__task.done():
+            self.__wake = asyncio.Event()
+            self.__task = asyncio.ensure_future(self.__run())
+        else:
+            self.__wake.set()
+
+    def remove(self, game: "Game") -> None:
+        """
+        Stops keeping game alive.
+
+        :param game: game to remove.
+        """
+
+        self.__due.pop(game, None)
+
+    def __schedule(self, game: "Game", due: float) -> None:
+        self.__due[game] = due
+        heapq.heappush(self.__heap, (due, next(self.__counter), game))
+
+    async def __run(self) -> None:
+        while self.__due:
+            due, _, game = self.__heap[0]
+
+            if self.__due.get(game) != due:
+                heapq.heappop(self.__heap)
+                continue
+
+            delay = due - time.monotonic()
+
+            if delay > 0:
+                # Woken up early when a game is added, since it's due right away
+                self.__wake.clear()
+
+                try:
+                    await asyncio.wait_for(self.__wake.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+
+                continue
+
+            heapq.heappop(self.__heap)
+
+            try:
+                await game._send_timesync()
+            except Exception:
+                # Socket is gone, game will be removed when it's left
+                self.__due.pop(game, None)
+                continue
+
+            if self.__due.get(game) == due:
+                # If loop is behind, games aren't sent a burst of packets to catch up
+                self.__schedule(game, max(due + self.interval, time.monotonic()))
+
+        self.__heap.clear()
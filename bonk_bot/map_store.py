@@ -0,0 +1,212 @@
+import json
+import sqlite3
+import threading
+from typing import List, Tuple, Union
+
+from .parsers.map_cache import MapCache
+from .parsers.parsers import decode_bonk_map
+from .parsers.lazy_map import decode_bonk_map_lazy
+from .sqlite_writer import BatchedSQLiteWriter, connect_sqlite
+
+# Decoded maps are stored as JSON, since they only consist of JSON types
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS decoded_maps (
+    map_id INTEGER NOT NULL,
+    dbv INTEGER NOT NULL,
+    content_hash BLOB NOT NULL,
+    encoded_data TEXT NOT NULL,
+    decoded_data TEXT NOT NULL,
+    PRIMARY KEY (map_id, dbv, content_hash)
+)
+"""
+
+
+class MapStore:
+    """
+    Persistent SQLite store for decoded maps, so decoded map library survives restarts. Maps are keyed by map id,
+    database version (1 for bonk1 maps, 2 for bonk2 maps) and content hash of encoded map data, so edited maps are
+    decoded again. Decoded maps are stored as JSON. Writing new maps is done in batches by a background thread.
+
+    :param path: path to SQLite database file. ":memory:" is not supported since writer thread has its own connection.
+    :param batch_size: maximal amount of maps written in one transaction.
+    :param flush_interval: maximal time in seconds new map waits before it's written.
+
+    Example usage::
+
+        set_map_store(MapStore("maps.sqlite3"))
+
+        maps = await bot.fetch_b2_maps("parkour")
+        print(maps[0].decoded_data["m"]["n"])
+    """
+
+    def __init__(self, path: str, batch_size=64, flush_interval=1.0) -> None:
+        if path == ":memory:":
+            raise ValueError("In-memory databases are not supported")
+
+        self.path: str = path
+        self.__reader_lock = threading.Lock()
+        self.__reader = connect_sqlite(path)
+        self.__reader.execute(_SCHEMA)
+        self.__reader.commit()
+        # Maps that are queued but not written yet, so they're not decoded twice
+        self.__pending: set = set()
+        self.__writer = BatchedSQLiteWriter(
+            path,
+            self.__write_batch,
+            batch_size,
+            flush_interval,
+            "bonk_bot map store writer"
+        )
+
+    @property
+    def batch_size(self) -> int:
+        """Maximal amount of maps written in one transaction."""
+
+        return self.__writer.batch_size
+
+    @property
+    def flush_interval(self) -> float:
+        """Maximal time in seconds new map waits before it's written."""
+
+        return self.__writer.flush_interval
+
+    def get(self, map_id: int, dbv: int, encoded_map: str) -> Union[dict, None]:
+        """
+        Returns stored decoded map or None if map isn't stored yet.
+
+        :param map_id: map database ID.
+        :param dbv: map database version.
+        :param encoded_map: base64 encoded map data.
+        """
+
+        return self.__get((map_id, dbv, MapCache.content_hash(encoded_map)))
+
+    def __get(self, key: Tuple[int, int, bytes]) -> Union[dict, None]:
+        with self.__reader_lock:
+            row = self.__reader.execute(
+                "SELECT decoded_data FROM decoded_maps WHERE map_id = ? AND dbv = ? AND content_hash = ?",
+                key
+            ).fetchone()
+
+        return None if row is None else json.loads(row[0])
+
+    def put(self, map_id: int, dbv: int, encoded_map: str) -> None:
+        """
+        Queues map to be decoded and stored by writer thread.
+
+        :param map_id: map database ID.
+        :param dbv: map database version.
+        :param encoded_map: base64 encoded map data.
+        """
+
+        self.__put((map_id, dbv, MapCache.content_hash(encoded_map)), encoded_map, None)
+
+    def __put(self, key: Tuple[int, int, bytes], encoded_map: str, decoded_data: Union[str, None]) -> None:
+        if self.__writer.is_closed:
+            raise ValueError("Map store is closed")
+
+        if key in self.__pending:
+            return
+
+        self.__pending.add(key)
+        self.__writer.put((key, encoded_map, decoded_data))
+
+    def decode(self, map_id: int, dbv: int, encoded_map: str) -> dict:
+        """
+        Returns stored decoded map. If map isn't stored yet, it's decoded and queued to be stored.
+
+        :param map_id: map database ID.
+        :param dbv: map database version.
+        :param encoded_map: base64 encoded map data.
+        """
+
+        key = (map_id, dbv, MapCache.content_hash(encoded_map))
+        decoded_map = self.__get(key)
+
+        if decoded_map is None:
+            decoded_map = decode_bonk_map(encoded_map)
+            # Serialized right away, so changes made to returned map don't end up in the store
+            self.__put(key, encoded_map, json.dumps(decoded_map, separators=(",", ":")))
+
+        return decoded_map
+
+    def flush(self) -> None:
+        """Blocks until all queued maps are written."""
+
+        self.__writer.flush()
+
+    def close(self) -> None:
+        """Writes queued maps and closes database."""
+
+        if self.__writer.is_closed:
+            return
+
+        self.__writer.close()
+
+        with self.__reader_lock:
+            self.__reader.close()
+
+    def __len__(self) -> int:
+        with self.__reader_lock:
+            return self.__reader.execute("SELECT COUNT(*) FROM decoded_maps").fetchone()[0]
+
+    def __enter__(self) -> "MapStore":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __write_batch(
+        self,
+        connection: sqlite3.Connection,
+        batch: List[Tuple[Tuple[int, int, bytes], str, Union[str, None]]]
+    ) -> None:
+        rows = []
+
+        for key, encoded_map, decoded_data in batch:
+            if decoded_data is None:
+                try:
+                    decoded_data = json.dumps(decode_bonk_map(encoded_map), separators=(",", ":"))
+                except Exception:
+                    # Broken maps aren't stored and are decoded again next time, same way as without store
+                    continue
+
+            rows.append((*key, encoded_map, decoded_data))
+
+        try:
+            if rows:
+                with connection:
+                    connection.executemany("INSERT OR REPLACE INTO decoded_maps VALUES (?, ?, ?, ?, ?)", rows)
+        finally:
+            # Maps of failed batch can be queued again
+            for key, *_ in batch:
+                self.__pending.discard(key)
+
+
+map_store: Union[MapStore, None] = None
+
+
+def set_map_store(store: Union[MapStore, None]) -> None:
+    """
+    Sets store used by decoded_data of Bonk2Map and OwnMap. None disables store.
+
+    :param store: map store.
+    """
+
+    global map_store
+    map_store = store
+
+
+def decode_stored_map(map_id: int, dbv: int, encoded_map: str) -> dict:
+    """
+    Decodes map through map store if it's set, otherwise decodes map lazily.
+
+    :param map_id: map database ID.
+    :param dbv: map database version.
+    :param encoded_map: base64 encoded map data.
+    """
+
+    if map_store is None:
+        return decode_bonk_map_lazy(encoded_map)
+
+    return map_store.decode(map_id, dbv, encoded_map)
@@ -1,9 +1,20 @@
 from .parsers import (
     decode_avatar,
+    encode_avatar,
     decode_bonk_map_metadata,
     decode_bonk_map,
+    encode_bonk_map,
+    decode_map_payload,
+    iter_bonk1_map_search_results,
     db_id_to_date,
+    db_ids_to_dates,
     team_from_number,
     mode_from_short_name,
-    move_direction_from_number
+    move_direction_from_number,
+    decode_moves,
+    MOVE_INPUTS
 )
+from .lazy_map import LazyBonkMap, decode_bonk_map_lazy
+from .compact_map import CompactBonkMap, CompactTable, CompactRecord, decode_bonk_map_compact
+from .batch import decode_bonk_maps, decode_bonk_maps_async, iter_decoded_bonk_maps
+from .map_cache import MapCache, map_cache
@@ -0,0 +1,233 @@
+import asyncio
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+from typing import AsyncIterator, Deque, Dict, Iterable, Iterator, List, Tuple, Union
+
+from bonk_bot.parsers.parsers import decode_bonk_map
+
+
+def _decode_chunk(encoded_maps: List[str], return_exceptions: bool) -> List[Union[dict, Exception]]:
+    """Decodes a chunk of maps in a worker process."""
+
+    results = []
+
+    for encoded_map in encoded_maps:
+        try:
+            results.append(decode_bonk_map(encoded_map))
+        except Exception as error:
+            if not return_exceptions:
+                raise
+
+            results.append(error)
+
+    return results
+
+
+def _chunks(encoded_maps: Iterable[str], chunksize: int) -> Iterator[List[str]]:
+    iterator = iter(encoded_maps)
+
+    while True:
+        chunk = list(islice(iterator, chunksize))
+
+        if not chunk:
+            return
+
+        yield chunk
+
+
+def decode_bonk_maps(
+    encoded_maps: Iterable[str],
+    workers: Union[int, None] = None,
+    chunksize=16,
+    ordered=True,
+    return_exceptions=False,
+    executor: Union[Executor, None] = None
+) -> Iterator[Tuple[int, Union[dict, Exception]]]:
+    """
+    Decodes many bonk maps in a process pool and yields (index, decoded map) pairs as soon as they are ready.
+    Input is consumed lazily and only a few chunks per worker are in flight, so it can be a generator of any size.
+
+    :param encoded_maps: base64 encoded maps data.
+    :param workers: amount of worker processes. Defaults to the amount of CPUs. Ignored if executor is provided.
+    :param chunksize: amount of maps sent to a worker at once.
+    :param ordered: yield results in input order (True) or as soon as their chunk is decoded (False).
+    :param return_exceptions: yield decoding errors in place of maps instead of raising them.
+    :param executor: already running executor to use instead of creating a process pool.
+
+    Example usage::
+
+        maps = await bot.fetch_b2_maps("parkour")
+
+        for index, decoded_map in decode_bonk_maps(bonk_map.encoded_data for bonk_map in maps):
+            print(maps[index].name, len(decoded_map["spawns"]))
+    """
+
+    if chunksize < 1:
+        raise ValueError("Chunk size must be a positive number")
+
+    owns_executor = executor is None
+
+    if owns_executor:
+        workers = workers or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(max_workers=workers)
+    else:
+        workers = workers or getattr(executor, "_max_workers", None) or os.cpu_count() or 1
+
+    max_in_flight = workers * 2
+    chunks = enumerate(_chunks(encoded_maps, chunksize))
+    in_flight: Dict[Future, int] = {}
+    # Futures in submission order, used to yield results in input order
+    submitted: Deque[Future] = deque()
+
+    def submit_next() -> bool:
+        for chunk_index, chunk in chunks:
+            future = executor.submit(_decode_chunk, chunk, return_exceptions)
+            in_flight[future] = chunk_index * chunksize
+
+            if ordered:
+                submitted.append(future)
+
+            return True
+
+        return False
+
+    try:
+        while len(in_flight) < max_in_flight and submit_next():
+            pass
+
+        while in_flight:
+            if ordered:
+                done = [submitted.popleft()]
+            else:
+                done = wait(in_flight, return_when=FIRST_COMPLETED).done
+
+            for future in done:
+                first_index = in_flight.pop(future)
+
+                for offset, result in enumerate(future.result()):
+                    yield first_index + offset, result
+
+                submit_next()
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+        if owns_executor:
+            executor.shutdown(wait=True)
+
+
+async def iter_decoded_bonk_maps(
+    encoded_maps: Iterable[str],
+    workers: Union[int, None] = None,
+    chunksize=16,
+    ordered=True,
+    return_exceptions=False,
+    executor: Union[Executor, None] = None
+) -> AsyncIterator[Tuple[int, Union[dict, Exception]]]:
+    """
+    Async version of decode_bonk_maps: decodes maps in a process pool without blocking the event loop, so game
+    connections keep being served, and yields (index, decoded map) pairs as soon as they are ready. Like
+    decode_bonk_maps, input is consumed lazily and only a few chunks per worker are in flight.
+
+    :param encoded_maps: base64 encoded maps data.
+    :param workers: amount of worker processes. Defaults to the amount of CPUs. Ignored if executor is provided.
+    :param chunksize: amount of maps sent to a worker at once.
+    :param ordered: yield results in input order (True) or as soon as their chunk is decoded (False).
+    :param return_exceptions: yield decoding errors in place of maps instead of raising them.
+    :param executor: already running executor to use instead of creating a process pool.
+
+    Example usage::
+
+        maps = await bot.fetch_b2_maps("parkour")
+
+        async for index, decoded_map in iter_decoded_bonk_maps(bonk_map.encoded_data for bonk_map in maps):
+            print(maps[index].name, len(decoded_map["spawns"]))
+    """
+
+    if chunksize < 1:
+        raise ValueError("Chunk size must be a positive number")
+
+    loop = asyncio.get_running_loop()
+    owns_executor = executor is None
+
+    if owns_executor:
+        workers = workers or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(max_workers=workers)
+    else:
+        workers = workers or getattr(executor, "_max_workers", None) or os.cpu_count() or 1
+
+    max_in_flight = workers * 2
+    chunks = enumerate(_chunks(encoded_maps, chunksize))
+    in_flight: Dict[asyncio.Future, int] = {}
+    # Futures in submission order, used to yield results in input order
+    submitted: Deque[asyncio.Future] = deque()
+
+    def submit_next() -> bool:
+        for chunk_index, chunk in chunks:
+            future = loop.run_in_executor(executor, _decode_chunk, chunk, return_exceptions)
+            in_flight[future] = chunk_index * chunksize
+
+            if ordered:
+                submitted.append(future)
+
+            return True
+
+        return False
+
+    try:
+        while len(in_flight) < max_in_flight and submit_next():
+            pass
+
+        while in_flight:
+            if ordered:
+                done = [submitted.popleft()]
+            else:
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+
+            for future in done:
+                chunk_results = await future
+                first_index = in_flight.pop(future)
+
+                for offset, result in enumerate(chunk_results):
+                    yield first_index + offset, result
+
+                submit_next()
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+        if owns_executor:
+            executor.shutdown(wait=False)
+
+
+async def decode_bonk_maps_async(
+    encoded_maps: Iterable[str],
+    workers: Union[int, None] = None,
+    chunksize=16,
+    return_exceptions=False,
+    executor: Union[Executor, None] = None
+) -> List[Union[dict, Exception]]:
+    """
+    Awaitable version of decode_bonk_maps: decodes maps in a process pool without blocking the event loop, so game
+    connections keep being served. Returns decoded maps in input order. Use iter_decoded_bonk_maps to process maps as
+    they are decoded instead of keeping all of them in memory.
+
+    :param encoded_maps: base64 encoded maps data.
+    :param workers: amount of worker processes. Defaults to the amount of CPUs. Ignored if executor is provided.
+    :param chunksize: amount of maps sent to a worker at once.
+    :param return_exceptions: return decoding errors in place of maps instead of raising them.
+    :param executor: already running executor to use instead of creating a process pool.
+    """
+
+    return [
+        decoded_map async for _, decoded_map in iter_decoded_bonk_maps(
+            encoded_maps,
+            workers,
+            chunksize,
+            True,
+            return_exceptions,
+            executor
+        )
+    ]
@@ -1,76 +1,142 @@
 import struct
+from functools import lru_cache
+from typing import Sequence, Tuple, Union
+
+# Precompiled big-endian packers, so format strings aren't parsed again on every call
+_BYTE = struct.Struct("B")
+_SHORT = struct.Struct(">h")
+_INT = struct.Struct(">i")
+_UINT = struct.Struct(">I")
+_FLOAT = struct.Struct(">f")
+_DOUBLE = struct.Struct(">d")
+
+
+@lru_cache(maxsize=256)
+def _bulk_struct(type_char: str, count: int) -> struct.Struct:
+    return struct.Struct(f">{count}{type_char}")
 
 
 class ByteBuffer:
-    def __init__(self, data: bytes) -> None:
-        self.data: bytes = data
+    """
+    Big-endian byte buffer used for bonk.io binary formats.
+
+    Read methods use ``unpack_from`` and never slice the underlying data, so passing a ``memoryview`` makes reading
+    zero-copy (including ``read_utf``).
+
+    :param data: bytes to read from or write to. A new empty bytearray is used if not provided.
+    """
+
+    def __init__(self, data: Union[bytes, bytearray, memoryview, None] = None) -> None:
+        self.data: Union[bytes, bytearray, memoryview] = bytearray() if data is None else data
         self.position = 0
 
-    # Write methods
+    # Write methods. They append in place, which is amortized O(1) when data is a bytearray (the default).
     def write_boolean(self, value: bool) -> None:
-        self.data += value.to_bytes()
+        self.data += _BYTE.pack(1 if value else 0)
 
     def write_byte(self, value: bytes) -> None:
         self.data += value
 
     def write_short(self, value: int) -> None:
-        self.data += struct.pack(">h", value)
+        self.data += _SHORT.pack(value)
 
     def write_int(self, value: int) -> None:
-        self.data += struct.pack(">i", value)
+        self.data += _INT.pack(value)
 
     def write_uint(self, value: int) -> None:
-        self.data += struct.pack(">I", value)
+        self.data += _UINT.pack(value)
 
     def write_float(self, value: float) -> None:
-        self.data += struct.pack(">f", value)
+        self.data += _FLOAT.pack(value)
 
     def write_double(self, value: float) -> None:
-        self.data += struct.pack(">d", value)
+        self.data += _DOUBLE.pack(value)
 
     def write_utf(self, value: str) -> None:
-        self.data += struct.pack(">h", len(value))
-        self.data += value.encode()
+        encoded = value.encode("utf-8")
+        self.data += _SHORT.pack(len(encoded))
+        self.data += encoded
+
+    def write_shorts(self, values: Sequence[int]) -> None:
+        self.data += _bulk_struct("h", len(values)).pack(*values)
+
+    def write_doubles(self, values: Sequence[float]) -> None:
+        self.data += _bulk_struct("d", len(values)).pack(*values)
+
+    def to_bytes(self) -> bytes:
+        """Returns buffer data as immutable bytes."""
+
+        return bytes(self.data)
 
     # Read methods
     def read_boolean(self) -> bool:
         return self.read_byte() != 0
 
-    def read_byte(self) -> bytes:
-        value = struct.unpack("B", self.data[self.position:self.position + 1])[0]
+    def read_byte(self) -> int:
+        value = _BYTE.unpack_from(self.data, self.position)[0]
         self.position += 1
         return value
 
     def read_short(self) -> int:
-        value = struct.unpack(">h", self.data[self.position:self.position + 2])[0]
+        value = _SHORT.unpack_from(self.data, self.position)[0]
         self.position += 2
         return value
 
     def read_int(self) -> int:
-        value = struct.unpack(">i", self.data[self.position:self.position + 4])[0]
+        value = _INT.unpack_from(self.data, self.position)[0]
         self.position += 4
         return value
 
     def read_uint(self) -> int:
-        value = struct.unpack(">I", self.data[self.position:self.position + 4])[0]
+        value = _UINT.unpack_from(self.data, self.position)[0]
         self.position += 4
         return value
 
     def read_float(self) -> float:
-        value = struct.unpack(">f", self.data[self.position:self.position + 4])[0]
+        value = _FLOAT.unpack_from(self.data, self.position)[0]
         self.position += 4
         return value
 
     def read_padding(self) -> None:
         self.position += 7
 
+    def skip(self, count: int) -> None:
+        self.position += count
+
+    def skip_utf(self) -> None:
+        length = self.read_short()
+        self.position += length
+
     def read_double(self) -> float:
-        value = struct.unpack(">d", self.data[self.position:self.position + 8])[0]
+        value = _DOUBLE.unpack_from(self.data, self.position)[0]
         self.position += 8
         return value
 
     def read_utf(self) -> str:
         length = self.read_short()
-        value = self.data[self.position:self.position + length].decode("utf-8")
+        value = str(self.data[self.position:self.position + length], "utf-8")
         self.position += length
         return value
+
+    # Bulk read methods
+    def read_shorts(self, count: int) -> Tuple[int, ...]:
+        """
+        Reads several shorts at once.
+
+        :param count: amount of shorts to read.
+        """
+
+        values = _bulk_struct("h", count).unpack_from(self.data, self.position)
+        self.position += 2 * count
+        return values
+
+    def read_doubles(self, count: int) -> Tuple[float, ...]:
+        """
+        Reads several doubles at once.
+
+        :param count: amount of doubles to read.
+        """
+
+        values = _bulk_struct("d", count).unpack_from(self.data, self.position)
+        self.position += 8 * count
+        return values
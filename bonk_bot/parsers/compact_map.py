@@ -0,0 +1,520 @@
+import sys
+from array import array
+from typing import Any, Dict, Iterator, List, Union
+
+from bonk_bot.parsers.parsers import decode_bonk_map
+
+# Value that bonk map format uses for empty fixture friction, restitution and density
+_NONE_DOUBLE = 1.7976931348623157e+308
+
+_SHAPE_TYPES = ["bx", "ci", "po"]
+_JOINT_TYPES = ["rv", "d", "lpj", "lsj", "g"]
+
+# Per joint type layout of the joint values in the flat joint columns
+_JOINT_DOUBLES = {
+    "rv": [("d", "la"), ("d", "ua"), ("d", "mmt"), ("d", "ms"), ("aa", 0), ("aa", 1)],
+    "d": [("d", "fh"), ("d", "dr"), ("aa", 0), ("aa", 1), ("ab", 0), ("ab", 1)],
+    "lpj": [(None, "pax"), (None, "pay"), (None, "pa"), (None, "pf"), (None, "pl"), (None, "pu"), (None, "plen"),
+            (None, "pms")],
+    "lsj": [(None, "sax"), (None, "say"), (None, "sf"), (None, "slen")],
+    "g": [(None, "r")]
+}
+_JOINT_BOOLEANS = {"rv": ["el", "em"], "d": [], "lpj": [], "lsj": [], "g": []}
+
+
+def _new_columns(spec: Dict[str, Union[str, None]]) -> Dict[str, Union[array, list]]:
+    return {name: list() if typecode is None else array(typecode) for name, typecode in spec.items()}
+
+
+def _optional_double(value: Union[float, None]) -> float:
+    return _NONE_DOUBLE if value is None else value
+
+
+def _from_optional_double(value: float) -> Union[float, None]:
+    return None if value == _NONE_DOUBLE else value
+
+
+class CompactRecord:
+    """
+    Read-only view of one row of CompactTable.
+
+    :param table: table that holds the row.
+    :param index: row index.
+    """
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "CompactTable", index: int) -> None:
+        self._table: CompactTable = table
+        self._index: int = index
+
+    def __getitem__(self, field: str) -> Any:
+        return self._table.columns[field][self._index]
+
+    def __repr__(self) -> str:
+        return f"CompactRecord({ {name: column[self._index] for name, column in self._table.columns.items()} })"
+
+
+class CompactTable:
+    """
+    Struct-of-arrays table: every field is stored in its own typed array (or list for strings).
+
+    :param columns: table columns by field name, all of the same length.
+    """
+
+    __slots__ = ("columns",)
+
+    def __init__(self, columns: Dict[str, Union[array, list]]) -> None:
+        self.columns: Dict[str, Union[array, list]] = columns
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def __getitem__(self, index: int) -> CompactRecord:
+        if not -len(self) <= index < len(self):
+            raise IndexError("CompactTable index out of range")
+
+        return CompactRecord(self, index % len(self))
+
+    def __iter__(self) -> Iterator[CompactRecord]:
+        return (CompactRecord(self, index) for index in range(len(self)))
+
+    @property
+    def nbytes(self) -> int:
+        """Returns approximate memory used by table arrays (string lists are counted by pointers only)."""
+
+        return sum(
+            column.itemsize * len(column) if isinstance(column, array) else sys.getsizeof(column)
+            for column in self.columns.values()
+        )
+
+
+class CompactBonkMap:
+    """
+    Compact representation of decoded bonk map. Shapes, fixtures, bodies, spawns, capZones and joints are stored as
+    CompactTable columns instead of a dict per object, and names are interned so equal strings are shared between
+    maps. Settings and metadata are kept as dicts since they are small.
+
+    Conversion with from_dict / to_dict is lossless for dicts returned by decode_bonk_map.
+    """
+
+    __slots__ = (
+        "v", "s", "m", "ppm", "bro", "shapes", "shape_vertices", "fixtures", "bodies", "body_fixtures", "spawns",
+        "cap_zones", "joints", "joint_doubles", "joint_booleans", "joint_names"
+    )
+
+    def __init__(self) -> None:
+        self.v: int = 1
+        self.s: dict = {}
+        self.m: dict = {}
+        self.ppm: int = 12
+        self.bro: array = array("h")
+        self.shapes: CompactTable = CompactTable(
+            _new_columns(
+                {
+                    "type": "b", "w": "d", "h": "d", "r": "d", "s": "d", "a": "d", "cx": "d", "cy": "d", "sk": "b",
+                    "v_start": "l", "v_count": "l"
+                }
+            )
+        )
+        self.shape_vertices: array = array("d")
+        self.fixtures: CompactTable = CompactTable(
+            _new_columns(
+                {
+                    "sh": "h", "n": None, "fr": "d", "fp": "b", "re": "d", "de": "d", "f": "L", "d": "b", "np": "b",
+                    "ng": "b", "ig": "b"
+                }
+            )
+        )
+        self.bodies: CompactTable = CompactTable(
+            _new_columns(
+                {
+                    "type": None, "n": None, "px": "d", "py": "d", "a": "d", "fric": "d", "fricp": "b", "re": "d",
+                    "de": "d", "lvx": "d", "lvy": "d", "av": "d", "ld": "d", "ad": "d", "fr": "b", "bu": "b",
+                    "cf_x": "d", "cf_y": "d", "cf_ct": "d", "cf_w": "b", "f_c": "h", "f_p": "b", "f_1": "b",
+                    "f_2": "b", "f_3": "b", "f_4": "b", "fz_on": "b", "fz_x": "d", "fz_y": "d", "fz_d": "b",
+                    "fz_p": "b", "fz_a": "b", "fz_t": "h", "fz_cf": "d", "fx_start": "l", "fx_count": "l"
+                }
+            )
+        )
+        self.body_fixtures: array = array("h")
+        self.spawns: CompactTable = CompactTable(
+            _new_columns(
+                {
+                    "x": "d", "y": "d", "xv": "d", "yv": "d", "priority": "h", "r": "b", "f": "b", "b": "b",
+                    "gr": "b", "ye": "b", "n": None
+                }
+            )
+        )
+        self.cap_zones: CompactTable = CompactTable(_new_columns({"n": None, "l": "d", "i": "h", "ty": "h"}))
+        self.joints: CompactTable = CompactTable(
+            _new_columns(
+                {
+                    "type": "b", "ba": "h", "bb": "h", "cc": "b", "bf": "d", "dl": "b", "ja": "h", "jb": "h",
+                    "values_start": "l", "booleans_start": "l", "name": "l"
+                }
+            )
+        )
+        self.joint_doubles: array = array("d")
+        self.joint_booleans: array = array("b")
+        self.joint_names: List[str] = []
+
+    @property
+    def nbytes(self) -> int:
+        """Returns approximate memory used by map arrays."""
+
+        flat_arrays = [self.bro, self.shape_vertices, self.body_fixtures, self.joint_doubles, self.joint_booleans]
+
+        return (
+            sum(table.nbytes for table in (self.shapes, self.fixtures, self.bodies, self.spawns, self.cap_zones,
+                                           self.joints)) +
+            sum(flat_array.itemsize * len(flat_array) for flat_array in flat_arrays)
+        )
+
+    @classmethod
+    def from_dict(cls, decoded_map: dict) -> "CompactBonkMap":
+        """
+        Creates compact map from decoded map dict.
+
+        :param decoded_map: decoded map data in the same format that decode_bonk_map returns.
+        """
+
+        compact_map = cls()
+        physics = decoded_map["physics"]
+
+        compact_map.v = decoded_map["v"]
+        compact_map.s = dict(decoded_map["s"])
+        compact_map.m = dict(decoded_map["m"], cr=[sys.intern(name) for name in decoded_map["m"]["cr"]])
+        compact_map.ppm = physics["ppm"]
+        compact_map.bro.extend(physics["bro"])
+
+        columns = compact_map.shapes.columns
+
+        for shape in physics["shapes"]:
+            columns["type"].append(_SHAPE_TYPES.index(shape["type"]))
+            columns["w"].append(shape.get("w", 0.0))
+            columns["h"].append(shape.get("h", 0.0))
+            columns["r"].append(shape.get("r", 0.0))
+            columns["s"].append(shape.get("s", 0.0))
+            columns["a"].append(shape.get("a", 0.0))
+            columns["cx"].append(shape["c"][0])
+            columns["cy"].append(shape["c"][1])
+            columns["sk"].append(shape.get("sk", False))
+            columns["v_start"].append(len(compact_map.shape_vertices))
+            columns["v_count"].append(len(shape.get("v", ())))
+
+            for vertex in shape.get("v", ()):
+                compact_map.shape_vertices.extend(vertex)
+
+        columns = compact_map.fixtures.columns
+
+        for fixture in physics["fixtures"]:
+            columns["sh"].append(fixture["sh"])
+            columns["n"].append(sys.intern(fixture["n"]))
+            columns["fr"].append(_optional_double(fixture["fr"]))
+            columns["fp"].append(0 if fixture["fp"] is None else 1 if fixture["fp"] is False else 2)
+            columns["re"].append(_optional_double(fixture["re"]))
+            columns["de"].append(_optional_double(fixture["de"]))
+            columns["f"].append(fixture["f"])
+            columns["d"].append(fixture["d"])
+            columns["np"].append(fixture["np"])
+            columns["ng"].append(fixture["ng"])
+            columns["ig"].append(fixture.get("ig", False))
+
+        columns = compact_map.bodies.columns
+
+        for body in physics["bodies"]:
+            body_settings = body["s"]
+            force_zone = body["fz"]
+
+            columns["type"].append(sys.intern(body_settings["type"]))
+            columns["n"].append(sys.intern(body_settings["n"]))
+            columns["px"].append(body["p"][0])
+            columns["py"].append(body["p"][1])
+            columns["a"].append(body["a"])
+            columns["lvx"].append(body["lv"][0])
+            columns["lvy"].append(body["lv"][1])
+            columns["av"].append(body["av"])
+            columns["cf_x"].append(body["cf"]["x"])
+            columns["cf_y"].append(body["cf"]["y"])
+            columns["cf_ct"].append(body["cf"]["ct"])
+            columns["cf_w"].append(body["cf"]["w"])
+
+            for key in ("fric", "fricp", "re", "de", "ld", "ad", "fr", "bu", "f_c", "f_p", "f_1", "f_2", "f_3", "f_4"):
+                columns[key].append(body_settings[key])
+
+            for key in ("on", "x", "y", "d", "p", "a", "t", "cf"):
+                columns["fz_" + key].append(force_zone[key])
+
+            columns["fx_start"].append(len(compact_map.body_fixtures))
+            columns["fx_count"].append(len(body["fx"]))
+            compact_map.body_fixtures.extend(body["fx"])
+
+        columns = compact_map.spawns.columns
+
+        for spawn in decoded_map["spawns"]:
+            for key in ("x", "y", "xv", "yv", "priority", "r", "f", "b", "gr", "ye"):
+                columns[key].append(spawn[key])
+
+            columns["n"].append(sys.intern(spawn["n"]))
+
+        columns = compact_map.cap_zones.columns
+
+        for cap_zone in decoded_map["capZones"]:
+            columns["n"].append(sys.intern(cap_zone["n"]))
+            columns["l"].append(cap_zone["l"])
+            columns["i"].append(cap_zone["i"])
+            columns["ty"].append(cap_zone.get("ty", 0))
+
+        columns = compact_map.joints.columns
+
+        for joint in physics["joints"]:
+            joint_type = joint["type"]
+
+            columns["type"].append(_JOINT_TYPES.index(joint_type))
+            columns["values_start"].append(len(compact_map.joint_doubles))
+            columns["booleans_start"].append(len(compact_map.joint_booleans))
+
+            for group, key in _JOINT_DOUBLES[joint_type]:
+                compact_map.joint_doubles.append(joint[key] if group is None else joint[group][key])
+
+            for key in _JOINT_BOOLEANS[joint_type]:
+                compact_map.joint_booleans.append(joint["d"][key])
+
+            if joint_type == "g":
+                columns["name"].append(len(compact_map.joint_names))
+                compact_map.joint_names.append(sys.intern(joint["n"]))
+                columns["ja"].append(joint["ja"])
+                columns["jb"].append(joint["jb"])
+                columns["ba"].append(0)
+                columns["bb"].append(0)
+                columns["cc"].append(False)
+                columns["bf"].append(0.0)
+                columns["dl"].append(False)
+            else:
+                columns["name"].append(-1)
+                columns["ja"].append(0)
+                columns["jb"].append(0)
+                columns["ba"].append(joint["ba"])
+                columns["bb"].append(joint["bb"])
+                columns["cc"].append(joint["d"]["cc"])
+                columns["bf"].append(joint["d"]["bf"])
+                columns["dl"].append(joint["d"]["dl"])
+
+        return compact_map
+
+    def to_dict(self) -> dict:
+        """Converts compact map back to the dict format that decode_bonk_map returns."""
+
+        return {
+            "v": self.v,
+            "s": dict(self.s),
+            "physics": {
+                "shapes": self.__shapes_to_list(),
+                "fixtures": self.__fixtures_to_list(),
+                "bodies": self.__bodies_to_list(),
+                "bro": list(self.bro),
+                "joints": self.__joints_to_list(),
+                "ppm": self.ppm
+            },
+            "spawns": self.__spawns_to_list(),
+            "capZones": self.__cap_zones_to_list(),
+            "m": dict(self.m, cr=list(self.m["cr"]))
+        }
+
+    def __shapes_to_list(self) -> List[dict]:
+        columns = self.shapes.columns
+        shapes = []
+
+        for index in range(len(self.shapes)):
+            shape_type = _SHAPE_TYPES[columns["type"][index]]
+            center = [columns["cx"][index], columns["cy"][index]]
+
+            if shape_type == "bx":
+                shapes.append(
+                    {
+                        "type": "bx",
+                        "w": columns["w"][index],
+                        "h": columns["h"][index],
+                        "c": center,
+                        "a": columns["a"][index],
+                        "sk": bool(columns["sk"][index])
+                    }
+                )
+            elif shape_type == "ci":
+                shapes.append({"type": "ci", "r": columns["r"][index], "c": center, "sk": bool(columns["sk"][index])})
+            else:
+                start = columns["v_start"][index]
+                vertices = self.shape_vertices[start:start + columns["v_count"][index] * 2]
+
+                shapes.append(
+                    {
+                        "type": "po",
+                        "v": [[vertices[i], vertices[i + 1]] for i in range(0, len(vertices), 2)],
+                        "s": columns["s"][index],
+                        "a": columns["a"][index],
+                        "c": center
+                    }
+                )
+
+        return shapes
+
+    def __fixtures_to_list(self) -> List[dict]:
+        columns = self.fixtures.columns
+        fixtures = []
+
+        for index in range(len(self.fixtures)):
+            fixture = {
+                "sh": columns["sh"][index],
+                "n": columns["n"][index],
+                "fr": _from_optional_double(columns["fr"][index]),
+                "fp": [None, False, True][columns["fp"][index]],
+                "re": _from_optional_double(columns["re"][index]),
+                "de": _from_optional_double(columns["de"][index]),
+                "f": columns["f"][index],
+                "d": bool(columns["d"][index]),
+                "np": bool(columns["np"][index]),
+                "ng": bool(columns["ng"][index])
+            }
+
+            if self.v >= 12:
+                fixture["ig"] = bool(columns["ig"][index])
+
+            fixtures.append(fixture)
+
+        return fixtures
+
+    def __bodies_to_list(self) -> List[dict]:
+        columns = self.bodies.columns
+        bodies = []
+
+        for index in range(len(self.bodies)):
+            fx_start = columns["fx_start"][index]
+
+            bodies.append(
+                {
+                    "p": [columns["px"][index], columns["py"][index]],
+                    "a": columns["a"][index],
+                    "lv": [columns["lvx"][index], columns["lvy"][index]],
+                    "av": columns["av"][index],
+                    "cf": {
+                        "x": columns["cf_x"][index],
+                        "y": columns["cf_y"][index],
+                        "w": bool(columns["cf_w"][index]),
+                        "ct": columns["cf_ct"][index]
+                    },
+                    "fx": list(self.body_fixtures[fx_start:fx_start + columns["fx_count"][index]]),
+                    "fz": {
+                        "on": bool(columns["fz_on"][index]),
+                        "x": columns["fz_x"][index],
+                        "y": columns["fz_y"][index],
+                        "d": bool(columns["fz_d"][index]),
+                        "p": bool(columns["fz_p"][index]),
+                        "a": bool(columns["fz_a"][index]),
+                        "t": columns["fz_t"][index],
+                        "cf": columns["fz_cf"][index]
+                    },
+                    "s": {
+                        "type": columns["type"][index],
+                        "n": columns["n"][index],
+                        "fric": columns["fric"][index],
+                        "fricp": bool(columns["fricp"][index]),
+                        "re": columns["re"][index],
+                        "de": columns["de"][index],
+                        "ld": columns["ld"][index],
+                        "ad": columns["ad"][index],
+                        "fr": bool(columns["fr"][index]),
+                        "bu": bool(columns["bu"][index]),
+                        "f_c": columns["f_c"][index],
+                        "f_p": bool(columns["f_p"][index]),
+                        "f_1": bool(columns["f_1"][index]),
+                        "f_2": bool(columns["f_2"][index]),
+                        "f_3": bool(columns["f_3"][index]),
+                        "f_4": bool(columns["f_4"][index])
+                    }
+                }
+            )
+
+        return bodies
+
+    def __spawns_to_list(self) -> List[dict]:
+        columns = self.spawns.columns
+
+        return [
+            {
+                "x": columns["x"][index],
+                "y": columns["y"][index],
+                "xv": columns["xv"][index],
+                "yv": columns["yv"][index],
+                "priority": columns["priority"][index],
+                "r": bool(columns["r"][index]),
+                "f": bool(columns["f"][index]),
+                "b": bool(columns["b"][index]),
+                "gr": bool(columns["gr"][index]),
+                "ye": bool(columns["ye"][index]),
+                "n": columns["n"][index]
+            } for index in range(len(self.spawns))
+        ]
+
+    def __cap_zones_to_list(self) -> List[dict]:
+        columns = self.cap_zones.columns
+        cap_zones = []
+
+        for index in range(len(self.cap_zones)):
+            cap_zone = {"n": columns["n"][index], "l": columns["l"][index], "i": columns["i"][index]}
+
+            if self.v >= 6:
+                cap_zone["ty"] = columns["ty"][index]
+
+            cap_zones.append(cap_zone)
+
+        return cap_zones
+
+    def __joints_to_list(self) -> List[dict]:
+        columns = self.joints.columns
+        joints = []
+
+        for index in range(len(self.joints)):
+            joint_type = _JOINT_TYPES[columns["type"][index]]
+            joint = {"d": {}, "type": joint_type}
+            values_start = columns["values_start"][index]
+            booleans_start = columns["booleans_start"][index]
+
+            if joint_type == "g":
+                joint["n"] = self.joint_names[columns["name"][index]]
+                joint["ja"] = columns["ja"][index]
+                joint["jb"] = columns["jb"][index]
+
+            for offset, (group, key) in enumerate(_JOINT_DOUBLES[joint_type]):
+                value = self.joint_doubles[values_start + offset]
+
+                if group is None:
+                    joint[key] = value
+                elif group == "d":
+                    joint["d"][key] = value
+                else:
+                    joint.setdefault(group, [0.0, 0.0])[key] = value
+
+            for offset, key in enumerate(_JOINT_BOOLEANS[joint_type]):
+                joint["d"][key] = bool(self.joint_booleans[booleans_start + offset])
+
+            if joint_type != "g":
+                joint["ba"] = columns["ba"][index]
+                joint["bb"] = columns["bb"][index]
+                joint["d"]["cc"] = bool(columns["cc"][index])
+                joint["d"]["bf"] = columns["bf"][index]
+                joint["d"]["dl"] = bool(columns["dl"][index])
+
+            joints.append(joint)
+
+        return joints
+
+
+def decode_bonk_map_compact(encoded_map: str) -> CompactBonkMap:
+    """
+    Used to decode bonk maps to compact representation.
+
+    :param encoded_map: base64 encoded map data.
+    """
+
+    return CompactBonkMap.from_dict(decode_bonk_map(encoded_map))
@@ -0,0 +1,178 @@
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from bonk_bot.parsers.byte_buffer import ByteBuffer
+from bonk_bot.parsers.parsers import (
+    decode_map_payload,
+    _read_map_version,
+    _read_map_settings,
+    _skip_map_settings,
+    _read_map_metadata,
+    _skip_map_metadata,
+    _read_map_shapes,
+    _skip_map_shapes,
+    _read_map_fixtures,
+    _skip_map_fixtures,
+    _read_map_bodies,
+    _skip_map_bodies,
+    _read_map_spawns,
+    _skip_map_spawns,
+    _read_map_cap_zones,
+    _skip_map_cap_zones,
+    _read_map_joints
+)
+
+# Placeholder stored under keys that aren't decoded yet. Keys are always present in the underlying dict storage so
+# json (which socketio uses for packets) sees a non-empty dict and serializes it through the overridden items()
+_NOT_DECODED = object()
+
+
+class LazySections(dict):
+    """
+    Dict that decodes its values on first access.
+
+    :param loaders: functions that decode values of the lazy keys.
+    :param values: the rest of the dict values. Keys of both params define the key order.
+    """
+
+    def __init__(self, loaders: Dict[str, Callable[[], Any]], values: Dict[str, Any]) -> None:
+        super().__init__()
+
+        for key, value in values.items():
+            super().__setitem__(key, _NOT_DECODED if key in loaders else value)
+
+        self._loaders: Dict[str, Callable[[], Any]] = loaders
+
+    @property
+    def decoded_keys(self) -> List[str]:
+        """Returns the keys that have been decoded already."""
+
+        return [key for key in self.keys() if dict.__getitem__(self, key) is not _NOT_DECODED]
+
+    def __getitem__(self, key: str) -> Any:
+        value = super().__getitem__(key)
+
+        if value is _NOT_DECODED:
+            value = self._loaders.pop(key)()
+            super().__setitem__(key, value)
+
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    def keys(self) -> List[str]:
+        return list(super().keys())
+
+    def __iter__(self) -> Iterator[str]:
+        # Overriding __iter__ makes dict(), {**lazy} and dict.update copy through keys() and __getitem__ instead of
+        # copying the underlying storage, which holds placeholders for sections that aren't decoded yet
+        return iter(super().keys())
+
+    def values(self) -> List[Any]:
+        return [self[key] for key in self.keys()]
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return [(key, self[key]) for key in self.keys()]
+
+    def pop(self, key: str, *default: Any) -> Any:
+        if key in self:
+            value = self[key]
+            super().pop(key)
+            return value
+
+        return super().pop(key, *default)
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key in self:
+            return self[key]
+
+        return super().setdefault(key, default)
+
+    def copy(self) -> dict:
+        return dict(self.items())
+
+    def __eq__(self, other: Any) -> bool:
+        return dict(self.items()) == other
+
+    def __ne__(self, other: Any) -> bool:
+        return not self == other
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+    def __reduce__(self) -> tuple:
+        return dict, (dict(self.items()),)
+
+
+class LazyBonkMap(LazySections):
+    """
+    Decoded bonk map that decodes each section (settings, metadata, shapes, fixtures, bodies, spawns, capZones and
+    joints) only when it's accessed. Section offsets are found with one scan that skips over the data without building
+    any objects. Behaves like the dict returned by decode_bonk_map.
+
+    :param payload: raw (decompressed and base64 decoded) map data.
+    """
+
+    def __init__(self, payload: bytes) -> None:
+        data = memoryview(payload)
+        byte_buffer = ByteBuffer(data)
+        map_version = _read_map_version(byte_buffer)
+        offsets = {}
+
+        def scan(section: str, skip_section: Callable[[ByteBuffer, int], None]) -> None:
+            offsets[section] = byte_buffer.position
+            skip_section(byte_buffer, map_version)
+
+        def loader(section: str, read_section: Callable[[ByteBuffer, int], Any]) -> Callable[[], Any]:
+            def load() -> Any:
+                section_buffer = ByteBuffer(data)
+                section_buffer.position = offsets[section]
+                return read_section(section_buffer, map_version)
+
+            return load
+
+        scan("s", _skip_map_settings)
+        scan("m", _skip_map_metadata)
+
+        ppm = byte_buffer.read_short()
+        bro_len = byte_buffer.read_short()
+        bro = list(byte_buffer.read_shorts(bro_len))
+
+        scan("shapes", _skip_map_shapes)
+        scan("fixtures", _skip_map_fixtures)
+        scan("bodies", _skip_map_bodies)
+        scan("spawns", _skip_map_spawns)
+        scan("capZones", _skip_map_cap_zones)
+        offsets["joints"] = byte_buffer.position
+
+        physics = LazySections(
+            {
+                "shapes": loader("shapes", _read_map_shapes),
+                "fixtures": loader("fixtures", _read_map_fixtures),
+                "bodies": loader("bodies", _read_map_bodies),
+                "joints": loader("joints", _read_map_joints)
+            },
+            {"shapes": None, "fixtures": None, "bodies": None, "bro": bro, "joints": None, "ppm": ppm}
+        )
+
+        super().__init__(
+            {
+                "s": loader("s", _read_map_settings),
+                "spawns": loader("spawns", _read_map_spawns),
+                "capZones": loader("capZones", _read_map_cap_zones),
+                "m": loader("m", _read_map_metadata)
+            },
+            {"v": map_version, "s": None, "physics": physics, "spawns": None, "capZones": None, "m": None}
+        )
+        self.offsets: Dict[str, int] = offsets
+
+
+def decode_bonk_map_lazy(encoded_map: str) -> LazyBonkMap:
+    """
+    Used to decode bonk maps lazily: map sections are decoded on first access. Raw map data is shared with other
+    decoded copies of the same map through the map cache.
+
+    :param encoded_map: base64 encoded map data.
+    """
+
+    return LazyBonkMap(decode_map_payload(encoded_map))
@@ -0,0 +1,157 @@
+import binascii
+from typing import Iterator, List
+
+_URI_SAFE_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+-$"
+
+# Every alphabet character mapped to its 6-bit value written MSB first, the order LZString reads bits in
+_CHAR_BITS = {char: format(index, "06b") for index, char in enumerate(_URI_SAFE_ALPHABET)}
+_CHAR_BITS[" "] = _CHAR_BITS["+"]
+
+# LZString pads the stream with zero bits when reading past the last character
+_PADDING_BITS = "0" * 32
+
+_BLOCK_CHARS = 512
+# Dictionary code (at most 16 bits for maps under 64k entries) plus an 8-bit literal, with room to spare
+_MAX_BITS_PER_STEP = 64
+
+
+def iter_decompress_from_encoded_uri_component(compressed: str) -> Iterator[bytes]:
+    """
+    Lazily decompresses LZString.compressToEncodedURIComponent output, yielding decompressed chunks as soon as they
+    are decoded. Only 8-bit literals are supported, which is always the case for base64 encoded payloads like bonk
+    maps.
+
+    :param compressed: LZString compressed string.
+    """
+
+    if not compressed:
+        return
+
+    loaded_chars = 0
+    # Bits are kept reversed, LZString assembles values LSB first, so int() can parse every value from one slice.
+    # The window is refilled from the input block by block, so stopping early skips converting the rest of it.
+    reversed_bits = ""
+    end = 0
+
+    def refill() -> None:
+        nonlocal reversed_bits, end, loaded_chars
+
+        block = compressed[loaded_chars:loaded_chars + _BLOCK_CHARS]
+        loaded_chars += len(block)
+
+        try:
+            new_bits = "".join([_CHAR_BITS[char] for char in block])
+        except KeyError as error:
+            raise ValueError(f"Invalid LZString character {error.args[0]!r}") from None
+
+        if loaded_chars == len(compressed):
+            new_bits += _PADDING_BITS
+
+        reversed_bits = new_bits[::-1] + reversed_bits[:end]
+        end = len(reversed_bits)
+
+    refill()
+
+    dictionary: List[bytes] = [b"", b"", b""]
+    enlarge_in = 4
+    num_bits = 3
+
+    value = int(reversed_bits[end - 2:end], 2)
+    end -= 2
+
+    if value == 0:
+        entry = bytes((int(reversed_bits[end - 8:end], 2),))
+        end -= 8
+    elif value == 1:
+        raise ValueError("16-bit LZString literals are not supported")
+    else:
+        return
+
+    dictionary.append(entry)
+    previous = entry
+    yield entry
+
+    while True:
+        if end < _MAX_BITS_PER_STEP:
+            if loaded_chars < len(compressed):
+                refill()
+            elif end < len(_PADDING_BITS):
+                raise ValueError("Unexpected end of LZString data")
+
+        code = int(reversed_bits[end - num_bits:end], 2)
+        end -= num_bits
+
+        if code == 0:
+            dictionary.append(bytes((int(reversed_bits[end - 8:end], 2),)))
+            end -= 8
+            code = len(dictionary) - 1
+            enlarge_in -= 1
+        elif code == 1:
+            raise ValueError("16-bit LZString literals are not supported")
+        elif code == 2:
+            return
+
+        if enlarge_in == 0:
+            enlarge_in = 1 << num_bits
+            num_bits += 1
+
+        if code < len(dictionary):
+            entry = dictionary[code]
+        elif code == len(dictionary):
+            entry = previous + previous[:1]
+        else:
+            raise ValueError("Invalid LZString dictionary reference")
+
+        yield entry
+        dictionary.append(previous + entry[:1])
+        enlarge_in -= 1
+        previous = entry
+
+        if enlarge_in == 0:
+            enlarge_in = 1 << num_bits
+            num_bits += 1
+
+
+def decompress_from_encoded_uri_component(compressed: str) -> bytes:
+    """
+    Bundled LZString.decompressFromEncodedURIComponent that returns bytes instead of building a str char by char.
+
+    :param compressed: LZString compressed string.
+    """
+
+    return b"".join(iter_decompress_from_encoded_uri_component(compressed))
+
+
+def iter_decode_lz_base64(compressed: str, chunk_size=128) -> Iterator[bytes]:
+    """
+    Lazily decodes LZString compressed base64 payload, yielding raw bytes in chunks of roughly chunk_size bytes.
+    Consumers that only need a prefix of the payload can stop iterating early and skip the rest of decompression.
+
+    :param compressed: LZString compressed base64 string.
+    :param chunk_size: minimal amount of raw bytes in every chunk except the last one.
+    """
+
+    pending = bytearray()
+    # Every 4 base64 characters make 3 raw bytes
+    pending_limit = (chunk_size + 2) // 3 * 4
+
+    for entry in iter_decompress_from_encoded_uri_component(compressed):
+        pending += entry
+
+        if len(pending) >= pending_limit:
+            cut = len(pending) - len(pending) % 4
+            yield binascii.a2b_base64(pending[:cut])
+            del pending[:cut]
+
+    if pending:
+        yield binascii.a2b_base64(pending)
+
+
+def decode_lz_base64(compressed: str) -> bytes:
+    """
+    Decodes LZString compressed base64 payload (the format of bonk maps) to raw bytes.
+
+    :param compressed: LZString compressed base64 string.
+    """
+
+    return binascii.a2b_base64(decompress_from_encoded_uri_component(compressed))
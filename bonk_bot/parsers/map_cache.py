@@ -0,0 +1,110 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Tuple, Union
+
+
+class MapCache:
+    """
+    Process-wide LRU cache for decoded map data, keyed by the content hash of encoded map data. Bounded both by
+    the amount of entries and by their estimated size in bytes. Thread safe.
+
+    :param max_entries: maximal amount of cached entries.
+    :param max_bytes: maximal estimated size of cached entries.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024) -> None:
+        self.max_entries: int = max_entries
+        self.max_bytes: int = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__size = 0
+        self.__entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def content_hash(encoded_map: str) -> bytes:
+        """
+        Returns hash of encoded map data that is used as a part of cache keys.
+
+        :param encoded_map: base64 encoded map data.
+        """
+
+        return hashlib.blake2b(encoded_map.encode(), digest_size=16).digest()
+
+    @property
+    def size(self) -> int:
+        """Returns estimated size of all cached entries in bytes."""
+
+        return self.__size
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Returns cache counters."""
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.__entries),
+            "bytes": self.__size
+        }
+
+    def get(self, key: Hashable) -> Union[Any, None]:
+        """
+        Returns cached value or None if there is no value with such key.
+
+        :param key: cache key.
+        """
+
+        with self.__lock:
+            entry = self.__entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.__entries.move_to_end(key)
+            self.hits += 1
+
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, size: int) -> None:
+        """
+        Caches value, evicting the least recently used entries if the cache is full.
+
+        :param key: cache key.
+        :param value: value to cache. Cached values are shared, so they should be immutable.
+        :param size: estimated size of value in bytes.
+        """
+
+        with self.__lock:
+            old_entry = self.__entries.pop(key, None)
+
+            if old_entry is not None:
+                self.__size -= old_entry[1]
+
+            if size > self.max_bytes or self.max_entries < 1:
+                return
+
+            self.__entries[key] = (value, size)
+            self.__size += size
+
+            while len(self.__entries) > self.max_entries or self.__size > self.max_bytes:
+                _, (_, evicted_size) = self.__entries.popitem(last=False)
+                self.__size -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Removes all cached entries and resets counters."""
+
+        with self.__lock:
+            self.__entries.clear()
+            self.__size = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+
+map_cache = MapCache()
@@ -1,19 +1,39 @@
 import base64
+import binascii
 import datetime
 import json
-from typing import Union, List
-from urllib.parse import unquote
+import os
+import re
+import struct
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, Sequence, Tuple, Union, List
+from urllib.parse import unquote, unquote_plus
 
 from lzstring import LZString
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from bonk_bot.parsers.byte_buffer import ByteBuffer
-from bonk_bot.types import Modes, AnyMode, GameInputs, AnyGameInput, Teams, AnyTeam
+from bonk_bot.parsers.lz_string import decode_lz_base64, iter_decode_lz_base64
+from bonk_bot.parsers.map_cache import map_cache
+from bonk_bot.types import Modes, AnyMode, GameInputs, AnyGameInput, all_game_inputs, Teams, AnyTeam
 from bonk_bot.avatar import Avatar
 
+# Percent sign that isn't followed by two hex digits, unquote_plus keeps these as is
+_INVALID_ESCAPE = re.compile(r"%(?![0-9A-Fa-f]{2})")
+
+# Rough size of decoded metadata dict with its strings, used for map cache accounting
+_METADATA_SIZE_ESTIMATE = 2048
+
 
+@lru_cache(maxsize=2048)
 def decode_avatar(avatar: str) -> Avatar:
     """
-    Used to decode bonk avatars.
+    Used to decode bonk avatars. Results are memoized by avatar string, avatars are immutable so they can be shared.
 
     :param avatar: base64 encoded avatar data.
     """
@@ -44,7 +64,7 @@ def decode_avatar(avatar: str) -> Avatar:
     if avatar == "":
         return Avatar({"layers": [], "bc": 4492031})
 
-    byte_buffer = ByteBuffer(base64.b64decode(unquote(avatar)))
+    byte_buffer = ByteBuffer(memoryview(base64.b64decode(unquote(avatar))))
     avatar_data = {"layers": [], "bc": 0}
 
     byte_buffer.read_padding()
@@ -72,77 +92,87 @@ def decode_avatar(avatar: str) -> Avatar:
     return Avatar(avatar_data)
 
 
-def decode_bonk_map_metadata(encoded_map: str) -> dict:
+@lru_cache(maxsize=2048)
+def encode_avatar(avatar: Avatar) -> str:
     """
-    Used to decode bonk maps metadata.
+    Used to encode bonk avatars, inverse of decode_avatar. Results are memoized by avatar.
 
-    :param encoded_map: base64 encoded map data.
+    :param avatar: avatar to encode.
     """
 
-    map_data = {
-        "m": {
-            "a": "nob_author",
-            "n": "nob_name",
-            "dbv": 2,
-            "dbid": -1,
-            "authid": -1,
-            "date": "",
-            "rxid": 0,
-            "rxn": "",
-            "rxa": "",
-            "rxdb": 1,
-            "cr": [],
-            "pub": False,
-            "mo": ""
-        }
-    }
-    byte_buffer = ByteBuffer(base64.b64decode(LZString.decompressFromEncodedURIComponent(encoded_map)))
+    layers = avatar.layers
 
-    map_version = byte_buffer.read_short()
+    # Layers count is written as a single AMF3 integer byte
+    if len(layers) > 63:
+        raise ValueError("Avatar has too many layers")
 
-    if map_version > 61:
-        raise ValueError("Future map version")
+    byte_buffer = ByteBuffer()
 
-    byte_buffer.read_boolean()
-    byte_buffer.read_boolean()
+    # AMF3 object of class "a" with one dense array of layers
+    byte_buffer.write_byte(b"\x0a\x07\x03a")
+    byte_buffer.write_short(2)
+    byte_buffer.write_byte(b"\x09")
+    byte_buffer.write_byte(bytes((len(layers) * 2 + 1,)))
+    byte_buffer.write_byte(b"\x01")
 
-    if map_version >= 3:
-        byte_buffer.read_short()
+    for index, layer in enumerate(layers):
+        # Layer objects are of class "al", class definition is written once and referenced afterwards
+        byte_buffer.write_byte(b"\x0a\x07\x05al" if index == 0 else b"\x0a\x05")
+        byte_buffer.write_short(1)
+        byte_buffer.write_short(layer["id"])
+        byte_buffer.write_float(layer["scale"])
+        byte_buffer.write_float(layer["angle"])
+        byte_buffer.write_float(layer["x"])
+        byte_buffer.write_float(layer["y"])
+        byte_buffer.write_boolean(layer["flipX"])
+        byte_buffer.write_boolean(layer["flipY"])
+        byte_buffer.write_int(layer["color"])
 
-    if 4 <= map_version <= 12:
-        byte_buffer.read_short()
-    elif map_version >= 13:
-        byte_buffer.read_float()
+    byte_buffer.write_int(avatar.base_color)
 
-    if map_version >= 9:
-        byte_buffer.read_boolean()
+    return base64.b64encode(byte_buffer.data).decode()
 
-    map_data["m"]["rxn"] = byte_buffer.read_utf()
-    map_data["m"]["rxa"] = byte_buffer.read_utf()
-    map_data["m"]["rxid"] = byte_buffer.read_uint()
-    map_data["m"]["rxdb"] = byte_buffer.read_short()
-    map_data["m"]["n"] = byte_buffer.read_utf()
-    map_data["m"]["a"] = byte_buffer.read_utf()
 
-    if map_version >= 10:
-        map_data["m"]["vu"] = byte_buffer.read_uint()
-        map_data["m"]["vd"] = byte_buffer.read_uint()
+def decode_bonk_map_metadata(encoded_map: str) -> dict:
+    """
+    Used to decode bonk maps metadata.
 
-    if map_version >= 4:
-        cr_len = byte_buffer.read_short()
-        map_data["m"]["cr"] = [byte_buffer.read_utf() for _ in range(cr_len)]
+    :param encoded_map: base64 encoded map data.
+    """
 
-    if map_version >= 5:
-        map_data["m"]["mo"] = byte_buffer.read_utf()
-        map_data["m"]["dbid"] = byte_buffer.read_int()
+    def read_metadata(byte_buffer: ByteBuffer) -> dict:
+        map_version = _read_map_version(byte_buffer)
+        _skip_map_settings(byte_buffer, map_version)
 
-    if map_version >= 7:
-        map_data["m"]["pub"] = byte_buffer.read_boolean()
+        return _read_map_metadata(byte_buffer, map_version)
 
-    if map_version >= 8:
-        map_data["m"]["dbv"] = byte_buffer.read_int()
+    def decode_metadata() -> dict:
+        # Metadata is stored at the beginning of the map, so decompression stops as soon as it's been read
+        payload = bytearray()
+
+        for chunk in iter_decode_lz_base64(encoded_map):
+            payload += chunk
+            byte_buffer = ByteBuffer(payload)
+
+            try:
+                metadata = read_metadata(byte_buffer)
+            except (struct.error, UnicodeDecodeError):
+                continue
+
+            if byte_buffer.position <= len(payload):
+                return metadata
+
+        return read_metadata(ByteBuffer(payload))
 
-    return map_data
+    cache_key = ("metadata", map_cache.content_hash(encoded_map))
+    cached_metadata = map_cache.get(cache_key)
+
+    if cached_metadata is None:
+        cached_metadata = decode_metadata()
+        map_cache.put(cache_key, cached_metadata, _METADATA_SIZE_ESTIMATE)
+
+    # Cached metadata is shared, so every caller gets its own copy
+    return {"m": dict(cached_metadata, cr=list(cached_metadata["cr"]))}
 
 
 def decode_bonk_map(encoded_map: str) -> dict:
@@ -152,131 +182,242 @@ def decode_bonk_map(encoded_map: str) -> dict:
     :param encoded_map: base64 encoded map data.
     """
 
-    map_data = {
-        "v": 1,
-        "s": {
-            "re": False,
-            "nc": False,
-            "pq": 1,
-            "gd": 25.0,
-            "fl": False
-        },
+    byte_buffer = ByteBuffer(memoryview(decode_map_payload(encoded_map)))
+
+    map_version = _read_map_version(byte_buffer)
+    settings = _read_map_settings(byte_buffer, map_version)
+    metadata = _read_map_metadata(byte_buffer, map_version)
+
+    ppm = byte_buffer.read_short()
+    bro_len = byte_buffer.read_short()
+    bro = list(byte_buffer.read_shorts(bro_len))
+
+    shapes = _read_map_shapes(byte_buffer, map_version)
+    fixtures = _read_map_fixtures(byte_buffer, map_version)
+    bodies = _read_map_bodies(byte_buffer, map_version)
+    spawns = _read_map_spawns(byte_buffer, map_version)
+    cap_zones = _read_map_cap_zones(byte_buffer, map_version)
+    joints = _read_map_joints(byte_buffer, map_version)
+
+    return {
+        "v": map_version,
+        "s": settings,
         "physics": {
-            "shapes": [],
-            "fixtures": [],
-            "bodies": [],
-            "bro": [],
-            "joints": [],
-            "ppm": 12
+            "shapes": shapes,
+            "fixtures": fixtures,
+            "bodies": bodies,
+            "bro": bro,
+            "joints": joints,
+            "ppm": ppm
         },
-        "spawns": [],
-        "capZones": [],
-        "m": {
-            "a": "nob_author",
-            "n": "nob_name",
-            "dbv": 2,
-            "dbid": -1,
-            "authid": -1,
-            "date": "",
-            "rxid": 0,
-            "rxn": "",
-            "rxa": "",
-            "rxdb": 1,
-            "cr": [],
-            "pub": False,
-            "mo": ""
-        }
+        "spawns": spawns,
+        "capZones": cap_zones,
+        "m": metadata
     }
-    byte_buffer = ByteBuffer(base64.b64decode(LZString.decompressFromEncodedURIComponent(encoded_map)))
 
-    physics = map_data["physics"]
-    map_data["v"] = byte_buffer.read_short()
 
-    if map_data["v"] > 61:
+def decode_map_payload(encoded_map: str) -> bytes:
+    """
+    Returns raw (decompressed and base64 decoded) map data. Results are cached process-wide by map content, so
+    the same map is decompressed only once.
+
+    :param encoded_map: base64 encoded map data.
+    """
+
+    cache_key = ("payload", map_cache.content_hash(encoded_map))
+    payload = map_cache.get(cache_key)
+
+    if payload is None:
+        payload = decode_lz_base64(encoded_map)
+        map_cache.put(cache_key, payload, len(payload))
+
+    return payload
+
+
+# Map sections readers. Every section of bonk map can be decoded (_read_map_*) or skipped (_skip_map_*) on its own
+def _read_map_version(byte_buffer: ByteBuffer) -> int:
+    map_version = byte_buffer.read_short()
+
+    if map_version > 61:
         raise ValueError("Future map version")
 
-    map_data["s"]["re"] = byte_buffer.read_boolean()
-    map_data["s"]["nc"] = byte_buffer.read_boolean()
+    return map_version
+
+
+def _read_map_settings(byte_buffer: ByteBuffer, map_version: int) -> dict:
+    settings = {
+        "re": False,
+        "nc": False,
+        "pq": 1,
+        "gd": 25.0,
+        "fl": False
+    }
+
+    settings["re"] = byte_buffer.read_boolean()
+    settings["nc"] = byte_buffer.read_boolean()
+
+    if map_version >= 3:
+        settings["pq"] = byte_buffer.read_short()
+
+    if 4 <= map_version <= 12:
+        settings["gd"] = byte_buffer.read_short()
+    elif map_version >= 13:
+        settings["gd"] = byte_buffer.read_float()
+
+    if map_version >= 9:
+        settings["fl"] = byte_buffer.read_boolean()
+
+    return settings
+
+
+def _skip_map_settings(byte_buffer: ByteBuffer, map_version: int) -> None:
+    byte_buffer.skip(2)
 
-    if map_data["v"] >= 3:
-        map_data["s"]["pq"] = byte_buffer.read_short()
+    if map_version >= 3:
+        byte_buffer.skip(2)
 
-    if 4 <= map_data["v"] <= 12:
-        map_data["s"]["gd"] = byte_buffer.read_short()
-    elif map_data["v"] >= 13:
-        map_data["s"]["gd"] = byte_buffer.read_float()
+    if 4 <= map_version <= 12:
+        byte_buffer.skip(2)
+    elif map_version >= 13:
+        byte_buffer.skip(4)
 
-    if map_data["v"] >= 9:
-        map_data["s"]["fl"] = byte_buffer.read_boolean()
+    if map_version >= 9:
+        byte_buffer.skip(1)
+
+
+def _read_map_metadata(byte_buffer: ByteBuffer, map_version: int) -> dict:
+    metadata = {
+        "a": "nob_author",
+        "n": "nob_name",
+        "dbv": 2,
+        "dbid": -1,
+        "authid": -1,
+        "date": "",
+        "rxid": 0,
+        "rxn": "",
+        "rxa": "",
+        "rxdb": 1,
+        "cr": [],
+        "pub": False,
+        "mo": ""
+    }
 
-    map_data["m"]["rxn"] = byte_buffer.read_utf()
-    map_data["m"]["rxa"] = byte_buffer.read_utf()
-    map_data["m"]["rxid"] = byte_buffer.read_uint()
-    map_data["m"]["rxdb"] = byte_buffer.read_short()
-    map_data["m"]["n"] = byte_buffer.read_utf()
-    map_data["m"]["a"] = byte_buffer.read_utf()
+    metadata["rxn"] = byte_buffer.read_utf()
+    metadata["rxa"] = byte_buffer.read_utf()
+    metadata["rxid"] = byte_buffer.read_uint()
+    metadata["rxdb"] = byte_buffer.read_short()
+    metadata["n"] = byte_buffer.read_utf()
+    metadata["a"] = byte_buffer.read_utf()
 
-    if map_data["v"] >= 10:
-        map_data["m"]["vu"] = byte_buffer.read_uint()
-        map_data["m"]["vd"] = byte_buffer.read_uint()
+    if map_version >= 10:
+        metadata["vu"] = byte_buffer.read_uint()
+        metadata["vd"] = byte_buffer.read_uint()
 
-    if map_data["v"] >= 4:
+    if map_version >= 4:
         cr_len = byte_buffer.read_short()
-        map_data["m"]["cr"] = [byte_buffer.read_utf() for _ in range(cr_len)]
+        metadata["cr"] = [byte_buffer.read_utf() for _ in range(cr_len)]
+
+    if map_version >= 5:
+        metadata["mo"] = byte_buffer.read_utf()
+        metadata["dbid"] = byte_buffer.read_int()
 
-    if map_data["v"] >= 5:
-        map_data["m"]["mo"] = byte_buffer.read_utf()
-        map_data["m"]["dbid"] = byte_buffer.read_int()
+    if map_version >= 7:
+        metadata["pub"] = byte_buffer.read_boolean()
 
-    if map_data["v"] >= 7:
-        map_data["m"]["pub"] = byte_buffer.read_boolean()
+    if map_version >= 8:
+        metadata["dbv"] = byte_buffer.read_int()
 
-    if map_data["v"] >= 8:
-        map_data["m"]["dbv"] = byte_buffer.read_int()
+    return metadata
 
-    physics["ppm"] = byte_buffer.read_short()
-    bro_len = byte_buffer.read_short()
-    physics["bro"] = [byte_buffer.read_short() for _ in range(bro_len)]
 
+def _skip_map_metadata(byte_buffer: ByteBuffer, map_version: int) -> None:
+    byte_buffer.skip_utf()
+    byte_buffer.skip_utf()
+    byte_buffer.skip(6)
+    byte_buffer.skip_utf()
+    byte_buffer.skip_utf()
+
+    if map_version >= 10:
+        byte_buffer.skip(8)
+
+    if map_version >= 4:
+        for _ in range(byte_buffer.read_short()):
+            byte_buffer.skip_utf()
+
+    if map_version >= 5:
+        byte_buffer.skip_utf()
+        byte_buffer.skip(4)
+
+    if map_version >= 7:
+        byte_buffer.skip(1)
+
+    if map_version >= 8:
+        byte_buffer.skip(4)
+
+
+def _read_map_shapes(byte_buffer: ByteBuffer, map_version: int) -> list:
+    shapes = []
     shape_len = byte_buffer.read_short()
 
     for _ in range(shape_len):
         shape_type = byte_buffer.read_short()
 
         if shape_type == 1:
-            physics["shapes"].append(
+            w, h, cx, cy, a = byte_buffer.read_doubles(5)
+            shapes.append(
                 {
                     "type": "bx",
-                    "w": byte_buffer.read_double(),
-                    "h": byte_buffer.read_double(),
-                    "c": [byte_buffer.read_double(), byte_buffer.read_double()],
-                    "a": byte_buffer.read_double(),
+                    "w": w,
+                    "h": h,
+                    "c": [cx, cy],
+                    "a": a,
                     "sk": byte_buffer.read_boolean()
                 }
             )
         elif shape_type == 2:
-            physics["shapes"].append(
+            r, cx, cy = byte_buffer.read_doubles(3)
+            shapes.append(
                 {
                     "type": "ci",
-                    "r": byte_buffer.read_double(),
-                    "c": [byte_buffer.read_double(), byte_buffer.read_double()],
+                    "r": r,
+                    "c": [cx, cy],
                     "sk": byte_buffer.read_boolean()
                 }
             )
         elif shape_type == 3:
+            s, a, cx, cy = byte_buffer.read_doubles(4)
             shape = {
                 "type": "po",
                 "v": [],
-                "s": byte_buffer.read_double(),
-                "a": byte_buffer.read_double(),
-                "c": [byte_buffer.read_double(), byte_buffer.read_double()],
+                "s": s,
+                "a": a,
+                "c": [cx, cy],
             }
 
             vertex_count = byte_buffer.read_short()
-            shape["v"] = [[byte_buffer.read_double(), byte_buffer.read_double()] for _ in range(vertex_count)]
+            vertices = byte_buffer.read_doubles(vertex_count * 2)
+            shape["v"] = [[vertices[i], vertices[i + 1]] for i in range(0, vertex_count * 2, 2)]
+
+            shapes.append(shape)
+
+    return shapes
+
+
+def _skip_map_shapes(byte_buffer: ByteBuffer, map_version: int) -> None:
+    for _ in range(byte_buffer.read_short()):
+        shape_type = byte_buffer.read_short()
+
+        if shape_type == 1:
+            byte_buffer.skip(41)
+        elif shape_type == 2:
+            byte_buffer.skip(25)
+        elif shape_type == 3:
+            byte_buffer.skip(32)
+            byte_buffer.skip(byte_buffer.read_short() * 16)
 
-            physics["shapes"].append(shape)
 
+def _read_map_fixtures(byte_buffer: ByteBuffer, map_version: int) -> list:
+    fixtures = []
     fix_count = byte_buffer.read_short()
 
     for _ in range(fix_count):
@@ -318,14 +459,29 @@ def decode_bonk_map(encoded_map: str) -> dict:
         fixture["d"] = byte_buffer.read_boolean()
         fixture["np"] = byte_buffer.read_boolean()
 
-        if map_data["v"] >= 11:
+        if map_version >= 11:
             fixture["ng"] = byte_buffer.read_boolean()
 
-        if map_data["v"] >= 12:
+        if map_version >= 12:
             fixture["ig"] = byte_buffer.read_boolean()
 
-        physics["fixtures"].append(fixture)
+        fixtures.append(fixture)
 
+    return fixtures
+
+
+def _skip_map_fixtures(byte_buffer: ByteBuffer, map_version: int) -> None:
+    # sh, n, then fr, fp, re, de, f, d, np and optional ng and ig flags
+    fixture_size = 32 + (map_version >= 11) + (map_version >= 12)
+
+    for _ in range(byte_buffer.read_short()):
+        byte_buffer.skip(2)
+        byte_buffer.skip_utf()
+        byte_buffer.skip(fixture_size)
+
+
+def _read_map_bodies(byte_buffer: ByteBuffer, map_version: int) -> list:
+    bodies = []
     body_len = byte_buffer.read_short()
 
     for _ in range(body_len):
@@ -395,10 +551,10 @@ def decode_bonk_map(encoded_map: str) -> dict:
         body["s"]["f_3"] = byte_buffer.read_boolean()
         body["s"]["f_4"] = byte_buffer.read_boolean()
 
-        if map_data["v"] >= 2:
+        if map_version >= 2:
             body["s"]["f_p"] = byte_buffer.read_boolean()
 
-        if map_data["v"] >= 14:
+        if map_version >= 14:
             body["fz"]["on"] = byte_buffer.read_boolean()
 
             if body["fz"]["on"]:
@@ -408,21 +564,40 @@ def decode_bonk_map(encoded_map: str) -> dict:
                 body["fz"]["p"] = byte_buffer.read_boolean()
                 body["fz"]["a"] = byte_buffer.read_boolean()
 
-                if map_data["v"] >= 15:
+                if map_version >= 15:
                     body["fz"]["t"] = byte_buffer.read_short()
                     body["fz"]["cf"] = byte_buffer.read_double()
 
         fx_len = byte_buffer.read_short()
+        body["fx"] = list(byte_buffer.read_shorts(fx_len))
+
+        bodies.append(body)
 
-        for _ in range(fx_len):
-            body["fx"].append(byte_buffer.read_short())
+    return bodies
 
-        physics["bodies"].append(body)
 
+def _skip_map_bodies(byte_buffer: ByteBuffer, map_version: int) -> None:
+    # Everything between the name and the force zone: p, a, fric, fricp, re, de, lv, av, ld, ad, fr, bu, cf, f_c,
+    # f_1-f_4 and optional f_p
+    body_size = 122 + (map_version >= 2)
+
+    for _ in range(byte_buffer.read_short()):
+        byte_buffer.skip_utf()
+        byte_buffer.skip_utf()
+        byte_buffer.skip(body_size)
+
+        if map_version >= 14 and byte_buffer.read_boolean():
+            byte_buffer.skip(29 if map_version >= 15 else 19)
+
+        byte_buffer.skip(byte_buffer.read_short() * 2)
+
+
+def _read_map_spawns(byte_buffer: ByteBuffer, map_version: int) -> list:
+    spawns = []
     spawn_len = byte_buffer.read_short()
 
     for _ in range(spawn_len):
-        map_data["spawns"].append(
+        spawns.append(
             {
                 "x": byte_buffer.read_double(),
                 "y": byte_buffer.read_double(),
@@ -438,6 +613,17 @@ def decode_bonk_map(encoded_map: str) -> dict:
             }
         )
 
+    return spawns
+
+
+def _skip_map_spawns(byte_buffer: ByteBuffer, map_version: int) -> None:
+    for _ in range(byte_buffer.read_short()):
+        byte_buffer.skip(39)
+        byte_buffer.skip_utf()
+
+
+def _read_map_cap_zones(byte_buffer: ByteBuffer, map_version: int) -> list:
+    cap_zones = []
     cap_zone_len = byte_buffer.read_short()
 
     for _ in range(cap_zone_len):
@@ -447,11 +633,24 @@ def decode_bonk_map(encoded_map: str) -> dict:
             "i": byte_buffer.read_short()
         }
 
-        if map_data["v"] >= 6:
+        if map_version >= 6:
             cap_zone["ty"] = byte_buffer.read_short()
 
-        map_data["capZones"].append(cap_zone)
+        cap_zones.append(cap_zone)
+
+    return cap_zones
+
+
+def _skip_map_cap_zones(byte_buffer: ByteBuffer, map_version: int) -> None:
+    cap_zone_size = 12 if map_version >= 6 else 10
 
+    for _ in range(byte_buffer.read_short()):
+        byte_buffer.skip_utf()
+        byte_buffer.skip(cap_zone_size)
+
+
+def _read_map_joints(byte_buffer: ByteBuffer, map_version: int) -> list:
+    joints = []
     joint_len = byte_buffer.read_short()
 
     for _ in range(joint_len):
@@ -503,9 +702,299 @@ def decode_bonk_map(encoded_map: str) -> dict:
             joint["d"]["bf"] = byte_buffer.read_double()
             joint["d"]["dl"] = byte_buffer.read_boolean()
 
-        physics["joints"].append(joint)
+        joints.append(joint)
+
+    return joints
+
+
+def encode_bonk_map(decoded_map: dict) -> str:
+    """
+    Used to encode bonk maps. Inverse of decode_bonk_map.
+
+    :param decoded_map: decoded map data in the same format that decode_bonk_map returns.
+    """
+
+    def optional_double(value: Union[float, None]) -> float:
+        return 1.7976931348623157e+308 if value is None else value
+
+    map_version = decoded_map["v"]
+
+    if map_version > 61:
+        raise ValueError("Future map version")
+
+    settings = decoded_map["s"]
+    metadata = decoded_map["m"]
+    physics = decoded_map["physics"]
+    byte_buffer = ByteBuffer()
+
+    byte_buffer.write_short(map_version)
+    byte_buffer.write_boolean(settings["re"])
+    byte_buffer.write_boolean(settings["nc"])
+
+    if map_version >= 3:
+        byte_buffer.write_short(settings["pq"])
+
+    if 4 <= map_version <= 12:
+        byte_buffer.write_short(int(settings["gd"]))
+    elif map_version >= 13:
+        byte_buffer.write_float(settings["gd"])
+
+    if map_version >= 9:
+        byte_buffer.write_boolean(settings["fl"])
+
+    byte_buffer.write_utf(metadata["rxn"])
+    byte_buffer.write_utf(metadata["rxa"])
+    byte_buffer.write_uint(metadata["rxid"])
+    byte_buffer.write_short(metadata["rxdb"])
+    byte_buffer.write_utf(metadata["n"])
+    byte_buffer.write_utf(metadata["a"])
+
+    if map_version >= 10:
+        byte_buffer.write_uint(metadata.get("vu", 0))
+        byte_buffer.write_uint(metadata.get("vd", 0))
+
+    if map_version >= 4:
+        byte_buffer.write_short(len(metadata["cr"]))
+
+        for contributor in metadata["cr"]:
+            byte_buffer.write_utf(contributor)
+
+    if map_version >= 5:
+        byte_buffer.write_utf(metadata["mo"])
+        byte_buffer.write_int(metadata["dbid"])
+
+    if map_version >= 7:
+        byte_buffer.write_boolean(metadata["pub"])
+
+    if map_version >= 8:
+        byte_buffer.write_int(metadata["dbv"])
+
+    byte_buffer.write_short(physics["ppm"])
+    byte_buffer.write_short(len(physics["bro"]))
+    byte_buffer.write_shorts(physics["bro"])
+
+    byte_buffer.write_short(len(physics["shapes"]))
+
+    for shape in physics["shapes"]:
+        if shape["type"] == "bx":
+            byte_buffer.write_short(1)
+            byte_buffer.write_doubles((shape["w"], shape["h"], shape["c"][0], shape["c"][1], shape["a"]))
+            byte_buffer.write_boolean(shape["sk"])
+        elif shape["type"] == "ci":
+            byte_buffer.write_short(2)
+            byte_buffer.write_doubles((shape["r"], shape["c"][0], shape["c"][1]))
+            byte_buffer.write_boolean(shape["sk"])
+        elif shape["type"] == "po":
+            byte_buffer.write_short(3)
+            byte_buffer.write_doubles((shape["s"], shape["a"], shape["c"][0], shape["c"][1]))
+            byte_buffer.write_short(len(shape["v"]))
+            byte_buffer.write_doubles([coordinate for vertex in shape["v"] for coordinate in vertex])
+        else:
+            raise ValueError(f"Unknown shape type {shape['type']}")
+
+    byte_buffer.write_short(len(physics["fixtures"]))
+
+    for fixture in physics["fixtures"]:
+        byte_buffer.write_short(fixture["sh"])
+        byte_buffer.write_utf(fixture["n"])
+        byte_buffer.write_double(optional_double(fixture["fr"]))
+
+        if fixture["fp"] is None:
+            byte_buffer.write_short(0)
+        elif fixture["fp"] is False:
+            byte_buffer.write_short(1)
+        else:
+            byte_buffer.write_short(2)
+
+        byte_buffer.write_double(optional_double(fixture["re"]))
+        byte_buffer.write_double(optional_double(fixture["de"]))
+        byte_buffer.write_uint(fixture["f"])
+        byte_buffer.write_boolean(fixture["d"])
+        byte_buffer.write_boolean(fixture["np"])
+
+        if map_version >= 11:
+            byte_buffer.write_boolean(fixture["ng"])
+
+        if map_version >= 12:
+            byte_buffer.write_boolean(fixture.get("ig", False))
+
+    byte_buffer.write_short(len(physics["bodies"]))
+
+    for body in physics["bodies"]:
+        body_settings = body["s"]
+
+        byte_buffer.write_utf(body_settings["type"])
+        byte_buffer.write_utf(body_settings["n"])
+        byte_buffer.write_doubles((body["p"][0], body["p"][1], body["a"], body_settings["fric"]))
+        byte_buffer.write_boolean(body_settings["fricp"])
+        byte_buffer.write_doubles(
+            (
+                body_settings["re"],
+                body_settings["de"],
+                body["lv"][0],
+                body["lv"][1],
+                body["av"],
+                body_settings["ld"],
+                body_settings["ad"]
+            )
+        )
+        byte_buffer.write_boolean(body_settings["fr"])
+        byte_buffer.write_boolean(body_settings["bu"])
+        byte_buffer.write_doubles((body["cf"]["x"], body["cf"]["y"], body["cf"]["ct"]))
+        byte_buffer.write_boolean(body["cf"]["w"])
+        byte_buffer.write_short(body_settings["f_c"])
+        byte_buffer.write_boolean(body_settings["f_1"])
+        byte_buffer.write_boolean(body_settings["f_2"])
+        byte_buffer.write_boolean(body_settings["f_3"])
+        byte_buffer.write_boolean(body_settings["f_4"])
+
+        if map_version >= 2:
+            byte_buffer.write_boolean(body_settings["f_p"])
+
+        if map_version >= 14:
+            byte_buffer.write_boolean(body["fz"]["on"])
+
+            if body["fz"]["on"]:
+                byte_buffer.write_doubles((body["fz"]["x"], body["fz"]["y"]))
+                byte_buffer.write_boolean(body["fz"]["d"])
+                byte_buffer.write_boolean(body["fz"]["p"])
+                byte_buffer.write_boolean(body["fz"]["a"])
+
+                if map_version >= 15:
+                    byte_buffer.write_short(body["fz"]["t"])
+                    byte_buffer.write_double(body["fz"]["cf"])
+
+        byte_buffer.write_short(len(body["fx"]))
+        byte_buffer.write_shorts(body["fx"])
+
+    byte_buffer.write_short(len(decoded_map["spawns"]))
+
+    for spawn in decoded_map["spawns"]:
+        byte_buffer.write_doubles((spawn["x"], spawn["y"], spawn["xv"], spawn["yv"]))
+        byte_buffer.write_short(spawn["priority"])
+        byte_buffer.write_boolean(spawn["r"])
+        byte_buffer.write_boolean(spawn["f"])
+        byte_buffer.write_boolean(spawn["b"])
+        byte_buffer.write_boolean(spawn["gr"])
+        byte_buffer.write_boolean(spawn["ye"])
+        byte_buffer.write_utf(spawn["n"])
+
+    byte_buffer.write_short(len(decoded_map["capZones"]))
+
+    for cap_zone in decoded_map["capZones"]:
+        byte_buffer.write_utf(cap_zone["n"])
+        byte_buffer.write_double(cap_zone["l"])
+        byte_buffer.write_short(cap_zone["i"])
+
+        if map_version >= 6:
+            byte_buffer.write_short(cap_zone["ty"])
+
+    byte_buffer.write_short(len(physics["joints"]))
+
+    for joint in physics["joints"]:
+        joint_data = joint["d"]
+
+        if joint["type"] == "rv":
+            byte_buffer.write_short(1)
+            byte_buffer.write_doubles((joint_data["la"], joint_data["ua"], joint_data["mmt"], joint_data["ms"]))
+            byte_buffer.write_boolean(joint_data["el"])
+            byte_buffer.write_boolean(joint_data["em"])
+            byte_buffer.write_doubles(joint["aa"])
+        elif joint["type"] == "d":
+            byte_buffer.write_short(2)
+            byte_buffer.write_doubles((joint_data["fh"], joint_data["dr"], *joint["aa"], *joint["ab"]))
+        elif joint["type"] == "lpj":
+            byte_buffer.write_short(3)
+            byte_buffer.write_doubles(
+                (
+                    joint["pax"],
+                    joint["pay"],
+                    joint["pa"],
+                    joint["pf"],
+                    joint["pl"],
+                    joint["pu"],
+                    joint["plen"],
+                    joint["pms"]
+                )
+            )
+        elif joint["type"] == "lsj":
+            byte_buffer.write_short(4)
+            byte_buffer.write_doubles((joint["sax"], joint["say"], joint["sf"], joint["slen"]))
+        elif joint["type"] == "g":
+            byte_buffer.write_short(5)
+            byte_buffer.write_utf(joint["n"])
+            byte_buffer.write_short(joint["ja"])
+            byte_buffer.write_short(joint["jb"])
+            byte_buffer.write_double(joint["r"])
+        else:
+            raise ValueError(f"Unknown joint type {joint['type']}")
+
+        if joint["type"] != "g":
+            byte_buffer.write_short(joint["ba"])
+            byte_buffer.write_short(joint["bb"])
+            byte_buffer.write_boolean(joint_data["cc"])
+            byte_buffer.write_double(joint_data["bf"])
+            byte_buffer.write_boolean(joint_data["dl"])
+
+    return LZString.compressToEncodedURIComponent(base64.b64encode(byte_buffer.data).decode())
+
+
+def iter_bonk1_map_search_results(data: str) -> Iterator[Dict[str, str]]:
+    """
+    Used to parse bonk1 map search results ("mapid0=...&mapname0=...&leveldata0=...&mapid1=..."). Yields fields of
+    every map as soon as they're read. Input is tokenized pair by pair and only values are unquoted, so names and
+    level data can contain any characters.
+
+    :param data: url encoded map search results.
+    """
+
+    position = 0
+    data_length = len(data)
+    map_index = None
+    fields: Dict[str, str] = {}
+
+    while position < data_length:
+        pair_end = data.find("&", position)
+
+        if pair_end == -1:
+            pair_end = data_length
+
+        separator = data.find("=", position, pair_end)
+
+        if separator != -1:
+            key = data[position:separator]
+            # Every key ends with index of the map it belongs to
+            name = key.rstrip("0123456789")
+            index = key[len(name):]
+
+            if index != map_index:
+                if "mapid" in fields:
+                    yield fields
+
+                fields = {}
+                map_index = index
+
+            fields[name] = _unquote_plus(data[separator + 1:pair_end])
+
+        position = pair_end + 1
+
+    if "mapid" in fields:
+        yield fields
+
+
+def _unquote_plus(value: str) -> str:
+    """Same as urllib unquote_plus, but escapes are decoded in C by binascii quoted-printable decoder."""
 
-    return map_data
+    if "%" not in value:
+        return value.replace("+", " ")
+
+    if not value.isascii() or _INVALID_ESCAPE.search(value):
+        return unquote_plus(value)
+
+    # Quoted-printable escapes are "=XX", so literal "=" is escaped first
+    quoted_printable = value.replace("=", "=3D").replace("%", "=").replace("+", " ")
+
+    return binascii.a2b_qp(quoted_printable).decode("utf-8", "replace")
 
 
 # Credits to https://shaunx777.github.io/dbid2date/
@@ -516,32 +1005,53 @@ def db_id_to_date(db_id: int) -> Union[datetime.datetime, str]:
     :param db_id: account database ID.
     """
 
-    json_path = __file__.replace(r"parsers\parsers.py", "") + "dbids.json"
+    return db_ids_to_dates([db_id])[0]
 
-    with open(json_path) as file:
-        db_ids = json.load(file)
-        index = 0
 
-    while index < len(db_ids) and db_ids[index]["number"] < db_id:
-        index += 1
+def db_ids_to_dates(db_ids: Iterable[int]) -> List[str]:
+    """
+    Returns approximate account creation dates of many accounts at once, in the same order as database IDs.
+
+    :param db_ids: accounts database IDs.
+    """
+
+    numbers, timestamps, dates = _load_db_ids()
+    last_index = len(numbers)
+    results = []
+
+    for db_id in db_ids:
+        index = bisect_left(numbers, db_id)
+
+        if index == 0:
+            results.append(f"Before {dates[0]}")
+        elif index == last_index:
+            results.append(f"After {dates[-1]}")
+        else:
+            first_number = numbers[index - 1]
+            first_timestamp = timestamps[index - 1]
+
+            diff = (db_id - first_number) / (numbers[index] - first_number)
+            time = first_timestamp + diff * (timestamps[index] - first_timestamp)
+
+            results.append(datetime.date.fromtimestamp(time).isoformat())
 
-    if index == 0:
-        return f"Before {db_ids[0]['date']}"
-    elif index == len(db_ids):
-        return f"After {db_ids[-1]['date']}"
+    return results
 
-    first_number = db_ids[index - 1]["number"]
-    second_number = db_ids[index]["number"]
 
-    first_date = db_ids[index - 1]["date"]
-    second_date = db_ids[index]["date"]
-    first_timestamp = datetime.datetime.strptime(first_date, "%Y-%m-%d").timestamp()
-    second_timestamp = datetime.datetime.strptime(second_date, "%Y-%m-%d").timestamp()
+@lru_cache(maxsize=None)
+def _load_db_ids() -> Tuple[List[int], List[float], List[str]]:
+    """Loads known account database IDs and their dates once, as sorted parallel lists."""
 
-    diff = (db_id - first_number) / (second_number - first_number)
-    time = first_timestamp + diff * (second_timestamp - first_timestamp)
+    json_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dbids.json")
 
-    return datetime.datetime.fromtimestamp(time).strftime("%Y-%m-%d")
+    with open(json_path) as file:
+        db_ids = sorted(json.load(file), key=lambda db_id: db_id["number"])
+
+    return (
+        [db_id["number"] for db_id in db_ids],
+        [datetime.datetime.strptime(db_id["date"], "%Y-%m-%d").timestamp() for db_id in db_ids],
+        [db_id["date"] for db_id in db_ids]
+    )
 
 
 def team_from_number(number: int) -> AnyTeam:
@@ -583,49 +1093,70 @@ def mode_from_short_name(short_name: str) -> AnyMode:
     return modes[short_name]
 
 
-def move_direction_from_number(number: int) -> List[AnyGameInput]:
+# Input keys of every move bits value, directions are in the order move_direction_from_number always returned them
+_MOVE_DIRECTIONS = (
+    (GameInputs.NoneInput,),
+    (GameInputs.Left,),
+    (GameInputs.Right,),
+    (GameInputs.Left, GameInputs.Right),
+    (GameInputs.Up,),
+    (GameInputs.Up, GameInputs.Left),
+    (GameInputs.Up, GameInputs.Right),
+    (GameInputs.Up, GameInputs.Left, GameInputs.Right),
+    (GameInputs.Down,),
+    (GameInputs.Down, GameInputs.Left),
+    (GameInputs.Down, GameInputs.Right),
+    (GameInputs.Down, GameInputs.Left, GameInputs.Right),
+    (GameInputs.Up, GameInputs.Down),
+    (GameInputs.Up, GameInputs.Down, GameInputs.Left),
+    (GameInputs.Up, GameInputs.Down, GameInputs.Right),
+    (GameInputs.Up, GameInputs.Down, GameInputs.Left, GameInputs.Right)
+)
+_MOVE_MODIFIERS = ((), (GameInputs.Heavy,), (GameInputs.Special,), (GameInputs.Heavy, GameInputs.Special))
+
+MOVE_INPUTS: Tuple[Tuple[AnyGameInput, ...], ...] = tuple(
+    _MOVE_MODIFIERS[number >> 4] + _MOVE_DIRECTIONS[number & 15] for number in range(64)
+)
+
+_KEY_ROWS: Tuple[Tuple[bool, ...], ...] = tuple(
+    tuple(bool(number & game_input) for game_input in all_game_inputs) for number in range(64)
+)
+_KEY_BITS_ARRAY = None if numpy is None else numpy.array([int(game_input) for game_input in all_game_inputs])
+
+
+def move_direction_from_number(number: int) -> Tuple[AnyGameInput, ...]:
     """
     Parses the move bits to get input keys pressed for move.
 
     :param number: move bits.
     """
 
-    heavy = 15 < number < 32
-    special = 31 < number < 46
-    heavy_and_special = number > 45
-    movement_clear_number = number
-    inputs = []
-
-    if heavy:
-        movement_clear_number -= 16
-        inputs.append(GameInputs.Heavy)
-    elif special:
-        movement_clear_number -= 32
-        inputs.append(GameInputs.Special)
-    elif heavy_and_special:
-        movement_clear_number -= 48
-        inputs.append(GameInputs.Heavy)
-        inputs.append(GameInputs.Special)
-
-    move_directions = {
-        0: [GameInputs.NoneInput],
-        1: [GameInputs.Left],
-        2: [GameInputs.Right],
-        3: [GameInputs.Left, GameInputs.Right],
-        4: [GameInputs.Up],
-        5: [GameInputs.Up, GameInputs.Left],
-        6: [GameInputs.Up, GameInputs.Right],
-        7: [GameInputs.Up, GameInputs.Left, GameInputs.Right],
-        8: [GameInputs.Down],
-        9: [GameInputs.Down, GameInputs.Left],
-        10: [GameInputs.Down, GameInputs.Right],
-        11: [GameInputs.Down, GameInputs.Left, GameInputs.Right],
-        12: [GameInputs.Up, GameInputs.Down],
-        13: [GameInputs.Up, GameInputs.Down, GameInputs.Left],
-        14: [GameInputs.Up, GameInputs.Down, GameInputs.Right],
-        15: [GameInputs.Up, GameInputs.Down, GameInputs.Left, GameInputs.Right]
-    }
+    if not 0 <= number < len(MOVE_INPUTS):
+        raise ValueError(f"Invalid move bits {number}")
+
+    return MOVE_INPUTS[number]
+
+
+def decode_moves(moves: Sequence[int]) -> Union["numpy.ndarray", List[Tuple[bool, ...]]]:
+    """
+    Decodes many move bits at once (for example all moves of a recorded match) into a matrix of pressed keys: one row
+    per move, one column per key in all_game_inputs order. Returns boolean numpy array if numpy is installed,
+    otherwise list of tuples. Raises ValueError if any move bits are out of range, same as move_direction_from_number.
+
+    :param moves: move bits.
+    """
+
+    if numpy is not None:
+        moves_array = numpy.asarray(moves, dtype=numpy.int64)
+        invalid_moves = moves_array[(moves_array < 0) | (moves_array >= len(_KEY_ROWS))]
+
+        if invalid_moves.size:
+            raise ValueError(f"Invalid move bits {invalid_moves[0]}")
+
+        return (moves_array[:, None] & _KEY_BITS_ARRAY) != 0
 
-    inputs.extend(move_directions[movement_clear_number])
+    for move in moves:
+        if not 0 <= move < len(_KEY_ROWS):
+            raise ValueError(f"Invalid move bits {move}")
 
-    return inputs
+    return [_KEY_ROWS[move] for move in moves]
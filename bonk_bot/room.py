@@ -1,6 +1,7 @@
 from functools import cached_property
+import asyncio
 import socketio
-from typing import TYPE_CHECKING, Union
+from typing import Mapping, TYPE_CHECKING, Union
 
 from .game import Game
 from .types import AnyMode
@@ -63,11 +64,21 @@ class Room:
     def mode(self) -> AnyMode:
         return mode_from_short_name(self._mode)
 
-    async def join(self, password="") -> Game:
+    async def join(
+        self,
+        password="",
+        timeout: Union[float, None] = 30.0,
+        server_semaphores: Union[Mapping[str, asyncio.Semaphore], None] = None,
+        semaphore: Union[asyncio.Semaphore, None] = None
+    ) -> Game:
         """
-        Joins game from room list.
+        Joins game from room list. Raises GameConnectionError if game can't be joined.
 
         :param password: password to join room.
+        :param timeout: maximal time in seconds to wait for the connection, not counting waits for semaphores. None
+                means no limit.
+        :param server_semaphores: semaphores keyed by server api name that limit simultaneous joins to every server.
+        :param semaphore: semaphore that limits simultaneous joins to all servers, acquired after the server semaphore.
 
         Example usage::
 
@@ -82,7 +93,7 @@ class Room:
             asyncio.run(main())
         """
 
-        return Game(
+        return await Game(
             self.bot,
             None,
             self.name,
@@ -92,4 +103,4 @@ class Room:
             False,
             False,
             game_join_params=[self.room_id, password]
-        )
+        ).open(timeout, server_semaphores, semaphore)
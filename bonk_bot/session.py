@@ -0,0 +1,264 @@
+import asyncio
+import gzip
+import json
+import threading
+import time
+from typing import Any, Iterator, List, Tuple, Union, TYPE_CHECKING
+
+import socketio
+
+if TYPE_CHECKING:
+    from .game import Game
+
+# Record directions
+INBOUND = "in"
+OUTBOUND = "out"
+# First record of every session, its args are [room name]
+_START = "start"
+
+
+class SessionRecorder:
+    """
+    Records socket.io packets of games into gzip compressed log of JSON lines, so sessions can be replayed offline
+    with SessionReplay. Every record has monotonic time, session id, direction, packet id and packet args. Log is
+    append-only: new sessions are added to the end of existing file, and records written before a crash stay
+    readable. Games are recorded if the recorder is set as bot.session_recorder before they're opened.
+
+    :param path: path to log file.
+    :param flush_interval: maximal time in seconds records are kept in compressor buffer before they're flushed. Records
+            are flushed by a background thread, so they reach the file even if no more packets arrive.
+
+    Example usage::
+
+        bot.session_recorder = SessionRecorder("sessions.jsonl.gz")
+        game = await bot.create_game()
+    """
+
+    def __init__(self, path: str, flush_interval=1.0) -> None:
+        self.path: str = path
+        self.flush_interval: float = flush_interval
+        self.__file = gzip.open(path, "at", encoding="utf-8")
+        self.__lock = threading.Lock()
+        # Whether records were written since the last flush
+        self.__has_unflushed = False
+        # Session ids are unique across recorders appending to the same file
+        self.__prefix = str(time.time_ns())
+        self.__sessions = 0
+        self.__closed = threading.Event()
+        self.__flusher = threading.Thread(target=self.__flush_loop, name="bonk_bot session flusher", daemon=True)
+        self.__flusher.start()
+
+    def attach(self, socket_client: socketio.AsyncClient, name="") -> str:
+        """
+        Starts recording packets of socket client. Returns session id.
+
+        :param socket_client: socket client of the game.
+        :param name: session name, for example room name.
+        """
+
+        session = f"{self.__prefix}:{self.__sessions}"
+        self.__sessions += 1
+        self.record(session, _START, None, [name])
+
+        trigger_event = socket_client._trigger_event
+        emit = socket_client.emit
+
+        async def recorded_trigger_event(event: Any, namespace: str, *args) -> Any:
+            self.record(session, INBOUND, event, list(args))
+            return await trigger_event(event, namespace, *args)
+
+        async def recorded_emit(event: Any, data=None, namespace=None, callback=None) -> None:
+            self.record(session, OUTBOUND, event, [] if data is None else [data])
+            await emit(event, data, namespace, callback)
+
+        socket_client._trigger_event = recorded_trigger_event
+        socket_client.emit = recorded_emit
+
+        return session
+
+    def record(self, session: str, direction: str, event: Any, args: List[Any]) -> None:
+        """
+        Writes record to the log.
+
+        :param session: session id.
+        :param direction: INBOUND or OUTBOUND.
+        :param event: packet id.
+        :param args: packet args.
+        """
+
+        now = time.monotonic()
+        line = json.dumps([now, session, direction, event, args], separators=(",", ":"), default=repr)
+
+        with self.__lock:
+            self.__file.write(line)
+            self.__file.write("\n")
+            self.__has_unflushed = True
+
+    def flush(self) -> None:
+        """Flushes buffered records to the file."""
+
+        with self.__lock:
+            if not self.__file.closed:
+                self.__file.flush()
+
+            self.__has_unflushed = False
+
+    def close(self) -> None:
+        """Flushes records and closes the file."""
+
+        self.__closed.set()
+        self.__flusher.join()
+
+        with self.__lock:
+            self.__file.close()
+
+    def __flush_loop(self) -> None:
+        while not self.__closed.wait(self.flush_interval):
+            if self.__has_unflushed:
+                self.flush()
+
+    def __enter__(self) -> "SessionRecorder":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class ReplayStats:
+    """
+    Result of replayed session.
+
+    :param packets: amount of inbound packets that were fed to the game.
+    :param duration: time in seconds replay took.
+    :param outbound: packets that game sent during replay, as (packet id, data) pairs.
+    :param errors: exceptions raised by packet handlers, as (packet id, exception) pairs.
+    """
+
+    def __init__(
+        self,
+        packets: int,
+        duration: float,
+        outbound: List[Tuple[Any, Any]],
+        errors: List[Tuple[Any, Exception]]
+    ) -> None:
+        self.packets: int = packets
+        self.duration: float = duration
+        self.outbound: List[Tuple[Any, Any]] = outbound
+        self.errors: List[Tuple[Any, Exception]] = errors
+
+    @property
+    def packets_per_second(self) -> float:
+        return self.packets / self.duration if self.duration else float("inf")
+
+    def __repr__(self) -> str:
+        return (
+            f"ReplayStats(packets={self.packets}, duration={self.duration:.3f}, outbound={len(self.outbound)}, "
+            f"errors={len(self.errors)})"
+        )
+
+
+class SessionReplay:
+    """
+    Reads sessions recorded by SessionRecorder and feeds them into games without network connection.
+
+    :param path: path to log file.
+
+    Example usage::
+
+        replay = SessionReplay("sessions.jsonl.gz")
+        session, room_name = replay.sessions[0]
+        game = Game(bot, None, room_name, False, Modes.Classic, False, False, False)
+
+        stats = await replay.feed(game, session, speed=None)
+        print(stats.packets_per_second, stats.errors)
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+
+    @property
+    def sessions(self) -> List[Tuple[str, str]]:
+        """(session id, name) pairs of recorded sessions."""
+
+        return [(session, args[0]) for _, session, direction, _, args in self.records() if direction == _START]
+
+    def records(self, session: Union[str, None] = None) -> Iterator[Tuple[float, str, str, Any, List[Any]]]:
+        """
+        Yields (time, session id, direction, packet id, args) records. Truncated last record (if recorder crashed) is
+        skipped.
+
+        :param session: session id. None means all sessions.
+        """
+
+        with gzip.open(self.path, "rt", encoding="utf-8") as file:
+            try:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        return
+
+                    if session is None or record[1] == session:
+                        yield tuple(record)
+            except EOFError:
+                return
+
+    async def feed(self, game: "Game", session: Union[str, None] = None, speed: Union[float, None] = 1.0) -> ReplayStats:
+        """
+        Feeds inbound packets of the session into the game's packet handlers. Packets that the game sends are
+        collected instead of being sent. The game is left when replay ends.
+
+        :param game: game that isn't opened.
+        :param session: session id. Default is the first recorded session.
+        :param speed: replay speed relative to recorded timing. None means as fast as possible.
+        """
+
+        if session is None:
+            sessions = self.sessions
+
+            if not sessions:
+                raise ValueError("Log has no sessions")
+
+            session = sessions[0][0]
+
+        # Records are loaded before replay starts, so reading the file doesn't affect timing
+        inbound = [
+            (record_time, event, args)
+            for record_time, _, direction, event, args in self.records(session)
+            if direction == INBOUND
+        ]
+        outbound: List[Tuple[Any, Any]] = []
+        errors: List[Tuple[Any, Exception]] = []
+        socket_client = game.socket_client
+
+        async def emit(event: Any, data=None, namespace=None, callback=None) -> None:
+            outbound.append((event, data))
+
+        async def disconnect() -> None:
+            pass
+
+        socket_client.emit = emit
+        socket_client.disconnect = disconnect
+        await game._prepare_replay()
+
+        start = time.monotonic()
+        first_time = inbound[0][0] if inbound else 0.0
+
+        for record_time, event, args in inbound:
+            if speed is not None:
+                delay = start + (record_time - first_time) / speed - time.monotonic()
+
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            try:
+                await socket_client._trigger_event(event, "/", *args)
+            except Exception as e:
+                errors.append((event, e))
+
+        duration = time.monotonic() - start
+
+        if game in game.bot.games:
+            await game.leave()
+
+        return ReplayStats(len(inbound), duration, outbound, errors)
@@ -0,0 +1,146 @@
+import queue
+import sqlite3
+import threading
+from typing import Any, Callable, List, Union
+
+# Tells writer thread to stop
+_CLOSE = object()
+# Tells writer thread to write its batch without waiting for more items
+_FLUSH = object()
+
+
+def connect_sqlite(path: str) -> sqlite3.Connection:
+    """
+    Opens SQLite connection that can be shared between threads (access must be locked by the caller).
+
+    :param path: path to SQLite database file.
+    """
+
+    connection = sqlite3.connect(path, check_same_thread=False)
+    # WAL lets reads go on while writer thread commits a batch
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+
+    return connection
+
+
+class BatchedSQLiteWriter:
+    """
+    Background thread that writes queued items to SQLite database in batches, so every item doesn't cost its own
+    transaction. Writer thread has its own connection, so ":memory:" databases are not supported.
+
+    If write_batch raises, its transaction is rolled back and writer thread goes on with next batches. The error is
+    raised by the next put(), flush() or close() call.
+
+    :param path: path to SQLite database file.
+    :param write_batch: writes list of items with writer connection. Called from writer thread.
+    :param batch_size: maximal amount of items written in one batch.
+    :param flush_interval: maximal time in seconds new item waits for more items before it's written.
+    :param name: name of writer thread.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        write_batch: Callable[[sqlite3.Connection, List[Any]], None],
+        batch_size=64,
+        flush_interval=1.0,
+        name="bonk_bot sqlite writer"
+    ) -> None:
+        if path == ":memory:":
+            raise ValueError("In-memory databases are not supported")
+
+        self.path: str = path
+        self.batch_size: int = batch_size
+        self.flush_interval: float = flush_interval
+        self.__write_batch = write_batch
+        self.__closed = False
+        self.__error: Union[Exception, None] = None
+        self.__error_lock = threading.Lock()
+        self.__queue: "queue.Queue" = queue.Queue()
+        # Opened here, so connection errors are raised to the caller instead of stopping writer thread
+        self.__connection = connect_sqlite(path)
+        self.__thread = threading.Thread(target=self.__write_loop, name=name, daemon=True)
+        self.__thread.start()
+
+    @property
+    def is_closed(self) -> bool:
+        return self.__closed
+
+    def put(self, item: Any) -> None:
+        """
+        Queues item to be written.
+
+        :param item: item passed to write_batch.
+        """
+
+        if self.__closed:
+            raise ValueError("Writer is closed")
+
+        self.__raise_error()
+        self.__queue.put(item)
+
+    def flush(self) -> None:
+        """Blocks until all queued items are written. Batch that is being collected is written right away."""
+
+        self.__queue.put(_FLUSH)
+        self.__queue.join()
+        self.__raise_error()
+
+    def close(self) -> None:
+        """Writes queued items and stops writer thread."""
+
+        if self.__closed:
+            return
+
+        self.__closed = True
+        self.__queue.put(_CLOSE)
+        self.__thread.join()
+        self.__raise_error()
+
+    def __raise_error(self) -> None:
+        """Raises error of batch that failed since the last call."""
+
+        with self.__error_lock:
+            error, self.__error = self.__error, None
+
+        if error is not None:
+            raise error
+
+    def __write_loop(self) -> None:
+        connection = self.__connection
+
+        try:
+            while True:
+                batch = [self.__queue.get()]
+
+                # Waits a bit for more items, so they're committed in one transaction
+                while batch[-1] is not _CLOSE and batch[-1] is not _FLUSH and len(batch) < self.batch_size:
+                    try:
+                        batch.append(self.__queue.get(timeout=self.flush_interval))
+                    except queue.Empty:
+                        break
+
+                items = [item for item in batch if item is not _CLOSE and item is not _FLUSH]
+
+                try:
+                    if items:
+                        self.__write_batch(connection, items)
+                except Exception as e:
+                    try:
+                        connection.rollback()
+                    except sqlite3.Error:
+                        pass
+
+                    with self.__error_lock:
+                        # First error is kept, later ones are usually caused by the same problem
+                        if self.__error is None:
+                            self.__error = e
+                finally:
+                    for _ in batch:
+                        self.__queue.task_done()
+
+                if batch[-1] is _CLOSE:
+                    return
+        finally:
+            connection.close()
@@ -1,35 +1,23 @@
-from typing import Union, Type
+from enum import IntFlag
 
 
-class GameInputs:
-    """Class for holding basic movement directions."""
+class GameInputs(IntFlag):
+    """Class for holding basic movement directions. Inputs can be combined with | to get move bits."""
 
-    class NoneInput:
-        bits = 0
+    NoneInput = 0
+    Left = 1
+    Right = 2
+    Up = 4
+    Down = 8
+    Heavy = 16
+    Special = 32
 
-    class Left:
-        bits = 1
+    @property
+    def bits(self) -> int:
+        return int(self)
 
-    class Right:
-        bits = 2
 
-    class Up:
-        bits = 4
-
-    class Down:
-        bits = 8
-
-    class Heavy:
-        bits = 16
-
-    class Special:
-        bits = 32
-
-
-AnyGameInput = Union[
-    Type[GameInputs.NoneInput], Type[GameInputs.Left], Type[GameInputs.Right], Type[GameInputs.Up],
-    Type[GameInputs.Down], Type[GameInputs.Heavy], Type[GameInputs.Special]
-]
+AnyGameInput = GameInputs
 
 all_game_inputs = [
     GameInputs.Left, GameInputs.Right, GameInputs.Up, GameInputs.Down, GameInputs.Heavy,
@@ -0,0 +1,100 @@
+import copy
+import os
+
+import pytest
+
+from bonk_bot.parsers.parsers import decode_bonk_map
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+MAP_VERSIONS = range(1, 62)
+
+
+def load_default_map() -> str:
+    """Returns encoded "RGB 1v1" map that Game uses before the first map change."""
+
+    with open(os.path.join(DATA_DIR, "rgb_1v1.txt")) as file:
+        return file.read().strip()
+
+
+def build_map_corpus() -> dict:
+    """
+    Returns decoded default map extended with every shape, joint and option type that map format has, so encoders
+    and decoders are tested on the parts default map doesn't use.
+    """
+
+    decoded_map = copy.deepcopy(decode_bonk_map(load_default_map()))
+    physics = decoded_map["physics"]
+
+    physics["shapes"] += [
+        {"type": "ci", "r": 3.5, "c": [1.0, 2.0], "sk": True},
+        {"type": "po", "v": [[0.0, 1.0], [2.5, 3.0], [4.0, -1.0]], "s": 1.0, "a": 0.5, "c": [0.0, 0.0]}
+    ]
+    physics["fixtures"][0]["fr"] = None
+    physics["fixtures"][0]["fp"] = True
+    physics["fixtures"][0]["n"] = "héllo ✓"
+    physics["bodies"][0]["fz"] = {"on": True, "x": 1.0, "y": 2.0, "d": False, "p": True, "a": False, "t": 3, "cf": 0.25}
+    decoded_map["capZones"].append({"n": "cz", "l": 0.5, "i": 1, "ty": 2})
+    physics["joints"] += [
+        {
+            "d": {
+                "la": 0.0,
+                "ua": 1.0,
+                "mmt": 2.0,
+                "ms": 3.0,
+                "el": True,
+                "em": False,
+                "cc": False,
+                "bf": 5.0,
+                "dl": True
+            },
+            "type": "rv",
+            "aa": [1.0, 2.0],
+            "ba": 0,
+            "bb": -1
+        },
+        {
+            "d": {"fh": 1.0, "dr": 2.0, "cc": True, "bf": 0.0, "dl": False},
+            "type": "d",
+            "aa": [1.0, 2.0],
+            "ab": [3.0, 4.0],
+            "ba": 1,
+            "bb": 0
+        },
+        {
+            "d": {"cc": False, "bf": 1.0, "dl": True},
+            "type": "lpj",
+            "pax": 1.0,
+            "pay": 2.0,
+            "pa": 3.0,
+            "pf": 4.0,
+            "pl": 5.0,
+            "pu": 6.0,
+            "plen": 7.0,
+            "pms": 8.0,
+            "ba": 0,
+            "bb": 1
+        },
+        {
+            "d": {"cc": False, "bf": 1.0, "dl": True},
+            "type": "lsj",
+            "sax": 1.0,
+            "say": 2.0,
+            "sf": 3.0,
+            "slen": 4.0,
+            "ba": 0,
+            "bb": 1
+        },
+        {"d": {}, "type": "g", "n": "gear", "ja": 0, "jb": 1, "r": 2.0}
+    ]
+
+    return decoded_map
+
+
+@pytest.fixture(scope="session")
+def default_map() -> str:
+    return load_default_map()
+
+
+@pytest.fixture(scope="session")
+def map_corpus() -> dict:
+    return build_map_corpus()
@@ -0,0 +1,25 @@
+from bonk_bot.avatar_builder import AvatarBuilder, build_avatars
+from bonk_bot.parsers.parsers import decode_avatar, encode_avatar
+
+
+def test_built_avatar_round_trip() -> None:
+    avatar = (
+        AvatarBuilder(0x202020)
+        .add_layer(13, color=0xFF0000)
+        .add_layer(42, x=5.5, y=-5.25, scale=0.125, angle=90.0, flip_x=True)
+        .add_layer(100, color=0xFFFFFF, flip_y=True)
+        .build()
+    )
+
+    assert decode_avatar(encode_avatar(avatar)) == avatar
+    assert decode_avatar(encode_avatar(AvatarBuilder().build())) == AvatarBuilder().build()
+
+
+def test_generated_avatars_round_trip() -> None:
+    avatars = build_avatars(50, layers_count=4, seed=1)
+
+    assert len(set(avatars)) == 50
+    assert build_avatars(50, layers_count=4, seed=1) == avatars
+
+    for avatar in avatars:
+        assert decode_avatar(encode_avatar(avatar)) == avatar
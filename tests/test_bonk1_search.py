@@ -0,0 +1,43 @@
+import random
+import string
+from urllib.parse import quote_plus
+
+from bonk_bot.parsers.parsers import iter_bonk1_map_search_results
+
+
+def build_search_results(maps: list) -> str:
+    return "&".join(
+        "&".join(f"{key}{index}={quote_plus(value)}" for key, value in fields.items())
+        for index, fields in enumerate(maps)
+    )
+
+
+def make_map(index: int, rng: random.Random) -> dict:
+    return {
+        "mapid": str(100000 + index),
+        "mapname": f"map - name = {index} 100% ✓",
+        "creationdate": "2012-01-01 10:00:00",
+        "modifieddate": "2012-02-01 10:00:00",
+        "thumbsup": "5",
+        "thumbsdown": "2",
+        "score": "3",
+        "authorname": "auth or",
+        "leveldata": "".join(rng.choice(string.ascii_letters + string.digits + "/,.:&=%+") for _ in range(300))
+    }
+
+
+def test_search_results_are_tokenized_per_map() -> None:
+    rng = random.Random(1)
+    maps = [make_map(index, rng) for index in range(50)]
+
+    assert list(iter_bonk1_map_search_results(build_search_results(maps))) == maps
+
+
+def test_empty_and_trailing_data() -> None:
+    rng = random.Random(2)
+    maps = [make_map(0, rng)]
+
+    assert list(iter_bonk1_map_search_results("")) == []
+    assert list(iter_bonk1_map_search_results(build_search_results(maps) + "&")) == maps
+    # Broken escapes are kept as is, like unquote_plus does
+    assert next(iter_bonk1_map_search_results("mapid0=1&mapname0=50%25+%zz"))["mapname"] == "50% %zz"
@@ -0,0 +1,39 @@
+import pytest
+
+from bonk_bot import input_log
+from bonk_bot.input_log import InputLog
+
+
+def make_log() -> InputLog:
+    log = InputLog(capacity=2)
+
+    for sequence, (frame, short_id, bits) in enumerate([(1, 0, 2), (3, 1, 4), (2, 0, 0), (5, 1, 6), (8, 0, 1)]):
+        log.append(frame, short_id, bits, sequence)
+
+    return log
+
+
+def test_saved_log_loads_with_the_same_inputs(tmp_path) -> None:
+    log = make_log()
+    path = str(tmp_path / "inputs.bkil")
+    log.save(path)
+    loaded = InputLog.load(path)
+
+    assert len(loaded) == len(log) == 5
+
+    for short_id in log.short_ids:
+        assert list(loaded.player(short_id).frames) == list(log.player(short_id).frames)
+        assert list(loaded.player(short_id).bits) == list(log.player(short_id).bits)
+        assert list(loaded.player(short_id).sequences) == list(log.player(short_id).sequences)
+
+    assert list(log.between(2, 6)[0].frames) == [2]
+
+
+def test_numpy_export_without_numpy(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(input_log, "numpy", None)
+
+    with pytest.raises(ImportError, match="numpy is required"):
+        make_log().save_npz(str(tmp_path / "inputs.npz"))
+
+    with pytest.raises(ImportError, match="numpy is required"):
+        make_log().to_numpy()
@@ -0,0 +1,65 @@
+import asyncio
+import time
+
+from bonk_bot.input_timeline import InputTimeline
+from bonk_bot.types import GameInputs
+
+
+class StandInMatch:
+    """Match clock that starts at frame 0 when created, collects move packets instead of sending them."""
+
+    def __init__(self) -> None:
+        self.start = time.monotonic()
+        self.packets = []
+
+    @property
+    def current_frame(self) -> int:
+        return int((time.monotonic() - self.start) * 30)
+
+    def frame_time(self, frame: int) -> float:
+        return self.start + frame / 30
+
+    async def _send_move_packet(self, bits: int, frame: int) -> None:
+        self.packets.append((bits, frame))
+
+
+def test_overlapping_changes_are_reference_counted() -> None:
+    async def main() -> None:
+        match = StandInMatch()
+        timeline = InputTimeline(match)
+
+        timeline.schedule(1, [GameInputs.Right])
+        timeline.schedule(1, [GameInputs.Right, GameInputs.Up])
+        await timeline.schedule(2, keys_up=[GameInputs.Right])
+
+        assert timeline.keys == [GameInputs.Right, GameInputs.Up]
+
+        await timeline.schedule(3, keys_up=[GameInputs.Right, GameInputs.Up])
+
+        assert timeline.keys == []
+        assert [bits for bits, _ in match.packets] == [GameInputs.Up.bits | GameInputs.Right.bits, 0]
+
+    asyncio.run(main())
+
+
+def test_closed_timeline_releases_keys_and_ignores_changes() -> None:
+    async def main() -> None:
+        match = StandInMatch()
+        timeline = InputTimeline(match)
+
+        await timeline.schedule(0, [GameInputs.Left])
+        pending = timeline.schedule(100, keys_up=[GameInputs.Left])
+        timeline.close()
+
+        assert pending.done()
+        assert timeline.is_closed
+        assert timeline.keys == []
+
+        ignored = timeline.schedule(0, [GameInputs.Down])
+        await asyncio.sleep(0.1)
+
+        assert ignored.done()
+        assert timeline.keys == []
+        assert [bits for bits, _ in match.packets] == [GameInputs.Left.bits]
+
+    asyncio.run(main())
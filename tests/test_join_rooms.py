@@ -0,0 +1,190 @@
+import asyncio
+import random
+from collections import Counter
+from urllib.parse import parse_qs
+
+import socketio
+from aiohttp import web
+
+from bonk_bot.bot.bonk_bot import bonk_guest_login
+from bonk_bot.game import Game
+from bonk_bot.room import Room
+from bonk_bot.settings import links
+
+
+class StandInServer:
+    """
+    Local stand-in for bonk api and game servers. Join of room is acknowledged with packet 3 after the delay that is
+    set for the room; rooms without delay are never acknowledged. Delay can be a list of delays of every join attempt.
+    Rooms are on "local" server unless other server name is set for them.
+    """
+
+    def __init__(self, delays: dict, servers=None) -> None:
+        self.delays = delays
+        self.servers = servers or {}
+        self.connected = set()
+        self.attempts = Counter()
+        # Joins that are connected but not acknowledged yet, by server name
+        self.joining = Counter()
+        self.max_joining = Counter()
+        self.max_joining_total = 0
+        self.__joining_server = {}
+        self.sio = socketio.AsyncServer(async_mode="aiohttp")
+        self.app = web.Application()
+        self.sio.attach(self.app)
+        self.app.router.add_post("/getroomaddress", self.get_room_address)
+        self.runner = None
+        self.port = None
+
+        @self.sio.event
+        async def connect(sid, environ) -> None:
+            server = parse_qs(environ["QUERY_STRING"])["server"][0]
+            self.connected.add(sid)
+            self.__joining_server[sid] = server
+            self.joining[server] += 1
+            self.max_joining[server] = max(self.max_joining[server], self.joining[server])
+            self.max_joining_total = max(self.max_joining_total, sum(self.joining.values()))
+
+        @self.sio.event
+        async def disconnect(sid) -> None:
+            self.connected.discard(sid)
+            self.__stop_joining(sid)
+
+        @self.sio.on(13)
+        async def on_join(sid, data) -> None:
+            room_id = int(data["joinID"])
+            delay = self.delays[room_id]
+
+            if isinstance(delay, list):
+                delay = delay[self.attempts[room_id]]
+
+            self.attempts[room_id] += 1
+
+            if delay is None:
+                return
+
+            await asyncio.sleep(delay)
+            player = {
+                "peerID": data["peerID"],
+                "userName": data["guestName"],
+                "guest": True,
+                "level": 0,
+                "ready": False,
+                "tabbed": False,
+                "team": 1,
+                "avatar": {"layers": [], "bc": 0}
+            }
+            # Sent directly, since broadcasting of python-socketio 4.6 doesn't work on newer Python versions
+            self.__stop_joining(sid)
+            await self.sio._emit_internal(sid, 3, (0, 0, [player], 0, False, room_id, "", None), "/")
+
+    def __stop_joining(self, sid) -> None:
+        if sid in self.__joining_server:
+            self.joining[self.__joining_server.pop(sid)] -= 1
+
+    async def get_room_address(self, request: web.Request) -> web.Response:
+        room_id = (await request.post())["id"]
+
+        return web.json_response({"address": room_id, "server": self.servers.get(int(room_id), "local")})
+
+    async def start(self) -> None:
+        self.runner = web.AppRunner(self.app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        await self.runner.cleanup()
+
+
+def run_with_server(delays: dict, test, servers=None) -> None:
+    async def main() -> None:
+        server = StandInServer(delays, servers)
+        await server.start()
+        old_links = dict(links)
+        links["get_room_address"] = f"http://127.0.0.1:{server.port}/getroomaddress"
+        # Every server name leads to the same stand-in, name is passed in query string
+        links["game_server"] = f"http://127.0.0.1:{server.port}/socket.io?server={{server}}"
+        bot = bonk_guest_login("stand_in")
+
+        try:
+            await test(bot, server)
+        finally:
+            links.update(old_links)
+
+            for game in list(bot.games):
+                await game.leave()
+
+            await bot.aiohttp_session.close()
+            await server.stop()
+
+    asyncio.run(main())
+
+
+def make_rooms(bot, room_ids) -> list:
+    return [Room(bot, room_id, f"room {room_id}", 1, 8, False, "b", 0, 999) for room_id in room_ids]
+
+
+def test_join_rooms_yields_joined_games() -> None:
+    async def test(bot, server) -> None:
+        results = [result async for result in bot.join_rooms(make_rooms(bot, [1, 2, 3]), timeout=5)]
+
+        assert sorted(room.room_id for room, _ in results) == [1, 2, 3]
+        assert all(isinstance(game, Game) for _, game in results)
+        assert len(bot.games) == 3
+        assert len(server.connected) == 3
+
+    run_with_server({1: 0, 2: 0.05, 3: 0.1}, test)
+
+
+def test_join_rooms_cleans_up_on_early_exit() -> None:
+    async def test(bot, server) -> None:
+        # Room 2 is joined while room 1 is consumed, room 3 is still joining when iteration stops
+        rooms = bot.join_rooms(make_rooms(bot, [1, 2, 3]), timeout=5)
+        room, game = await rooms.__anext__()
+        await asyncio.sleep(0.3)
+        await rooms.aclose()
+        await asyncio.sleep(0.1)
+
+        assert room.room_id == 1
+        assert bot.games == [game]
+        assert len(server.connected) == 1
+
+    run_with_server({1: 0, 2: 0.1, 3: None}, test)
+
+
+def test_join_rooms_queues_joins_per_server() -> None:
+    async def test(bot, server) -> None:
+        rooms = make_rooms(bot, range(1, 11))
+        # Rooms 9 and 10 are queued behind eight rooms of a busy server, but they only wait for their own server.
+        # Waits in queues are longer than the timeout and don't count against it
+        results = [
+            result async for result in bot.join_rooms(rooms, concurrency=3, per_server_limit=2, retries=0, timeout=0.5)
+        ]
+
+        assert all(isinstance(game, Game) for _, game in results)
+        assert server.max_joining["busy"] == 2
+        assert server.max_joining_total == 3
+        assert max(index for index, (room, _) in enumerate(results) if room.room_id > 8) < 6
+
+    servers = {room_id: "busy" if room_id <= 8 else "free" for room_id in range(1, 11)}
+    run_with_server({room_id: 0.2 for room_id in range(1, 11)}, test, servers)
+
+
+def test_join_rooms_retries_transient_errors_with_backoff(monkeypatch) -> None:
+    delays = []
+    monkeypatch.setattr(random, "uniform", lambda low, high: delays.append((low, high)) or 0)
+
+    async def test(bot, server) -> None:
+        rooms = bot.join_rooms(make_rooms(bot, [1, 2]), retries=2, backoff=0.5, timeout=0.2)
+        games = {room.room_id: game async for room, game in rooms}
+
+        # Room 1 is joined on the third attempt, room 2 is never acknowledged and fails after the last retry
+        assert isinstance(games[1], Game)
+        assert games[2].args[0] == "Game connection timed out"
+        assert server.attempts == {1: 3, 2: 3}
+        assert sorted(delays) == [(0, 0.5), (0, 0.5), (0, 1.0), (0, 1.0)]
+        assert bot.games == [games[1]]
+
+    run_with_server({1: [None, None, 0], 2: None}, test)
@@ -0,0 +1,87 @@
+import base64
+import copy
+import json
+import random
+
+import pytest
+from lzstring import LZString
+
+from bonk_bot.parsers.byte_buffer import ByteBuffer
+from bonk_bot.parsers.compact_map import decode_bonk_map_compact
+from bonk_bot.parsers.lazy_map import decode_bonk_map_lazy
+from bonk_bot.parsers.lz_string import decode_lz_base64
+from bonk_bot.parsers.parsers import decode_bonk_map, decode_bonk_map_metadata, encode_bonk_map
+
+from conftest import MAP_VERSIONS
+
+
+def lzstring_payload(encoded_map: str) -> bytes:
+    return base64.b64decode(LZString.decompressFromEncodedURIComponent(encoded_map))
+
+
+def test_default_map_encodes_to_the_same_bytes(default_map: str) -> None:
+    assert lzstring_payload(encode_bonk_map(decode_bonk_map(default_map))) == lzstring_payload(default_map)
+
+
+@pytest.mark.parametrize("version", MAP_VERSIONS)
+def test_encode_decode_round_trip(map_corpus: dict, version: int) -> None:
+    decoded_map = copy.deepcopy(map_corpus)
+    decoded_map["v"] = version
+
+    round_tripped = decode_bonk_map(encode_bonk_map(decoded_map))
+
+    assert decode_bonk_map(encode_bonk_map(round_tripped)) == round_tripped
+    assert round_tripped["physics"]["shapes"] == decoded_map["physics"]["shapes"]
+    assert round_tripped["physics"]["joints"] == decoded_map["physics"]["joints"]
+
+    # Older versions don't have some of the fields that corpus uses, every field exists since version 15
+    if version >= 15:
+        assert round_tripped == decoded_map
+
+
+@pytest.mark.parametrize("version", MAP_VERSIONS)
+def test_alternative_decoders_match_decode_bonk_map(map_corpus: dict, version: int) -> None:
+    decoded_map = copy.deepcopy(map_corpus)
+    decoded_map["v"] = version
+    encoded_map = encode_bonk_map(decoded_map)
+    expected = decode_bonk_map(encoded_map)
+
+    assert decode_bonk_map_compact(encoded_map).to_dict() == expected
+    assert dict(decode_bonk_map_lazy(encoded_map)) == expected
+    assert json.dumps(decode_bonk_map_lazy(encoded_map)) == json.dumps(expected)
+    assert decode_bonk_map_metadata(encoded_map)["m"] == expected["m"]
+
+
+def test_bundled_lz_decoder_matches_lzstring(default_map: str) -> None:
+    assert decode_lz_base64(default_map) == lzstring_payload(default_map)
+
+    rng = random.Random(1)
+
+    for _ in range(100):
+        payload = bytes(rng.choice((rng.randrange(256), 0, 1, 65)) for _ in range(rng.randrange(3000)))
+        compressed = LZString.compressToEncodedURIComponent(base64.b64encode(payload).decode())
+
+        assert decode_lz_base64(compressed) == payload
+
+
+def test_byte_buffer_round_trip() -> None:
+    writer = ByteBuffer()
+    writer.write_boolean(True)
+    writer.write_short(-2)
+    writer.write_int(-70000)
+    writer.write_uint(70000)
+    writer.write_double(0.1)
+    writer.write_utf("héllo ✓")
+    writer.write_shorts([1, -1, 300])
+    writer.write_doubles([1.5, -2.5])
+
+    reader = ByteBuffer(memoryview(writer.to_bytes()))
+
+    assert reader.read_boolean() is True
+    assert reader.read_short() == -2
+    assert reader.read_int() == -70000
+    assert reader.read_uint() == 70000
+    assert reader.read_double() == 0.1
+    assert reader.read_utf() == "héllo ✓"
+    assert reader.read_shorts(3) == (1, -1, 300)
+    assert reader.read_doubles(2) == (1.5, -2.5)
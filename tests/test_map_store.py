@@ -0,0 +1,72 @@
+import copy
+
+import pytest
+
+from bonk_bot.bonk_maps import Bonk2Map
+from bonk_bot.map_store import MapStore, set_map_store
+from bonk_bot.parsers.parsers import decode_bonk_map, encode_bonk_map
+
+
+@pytest.fixture
+def store(tmp_path):
+    map_store = MapStore(str(tmp_path / "maps.sqlite3"), flush_interval=0.01)
+
+    yield map_store
+
+    set_map_store(None)
+    map_store.close()
+
+
+def test_stored_map_is_returned_after_flush(store: MapStore, default_map: str) -> None:
+    assert store.get(1, 2, default_map) is None
+
+    decoded_map = store.decode(1, 2, default_map)
+    store.flush()
+    stored_map = store.get(1, 2, default_map)
+
+    assert type(stored_map) is dict
+    assert stored_map == decoded_map == decode_bonk_map(default_map)
+    assert len(store) == 1
+
+
+def test_changed_map_data_is_stored_under_new_key(store: MapStore, default_map: str) -> None:
+    edited_map = copy.deepcopy(decode_bonk_map(default_map))
+    edited_map["m"]["n"] = "edited"
+    edited_data = encode_bonk_map(edited_map)
+
+    store.put(1, 2, default_map)
+    store.flush()
+
+    assert store.get(1, 2, edited_data) is None
+
+    store.put(1, 2, edited_data)
+    store.flush()
+
+    assert store.get(1, 2, edited_data)["m"]["n"] == "edited"
+    assert store.get(1, 2, default_map)["m"]["n"] == decode_bonk_map(default_map)["m"]["n"]
+    assert len(store) == 2
+
+
+def test_bonk2_map_reads_through_store(store: MapStore, default_map: str) -> None:
+    set_map_store(store)
+
+    assert Bonk2Map(5, default_map, "RGB 1v1", "author", "", 0, 0).decoded_data == decode_bonk_map(default_map)
+
+    store.flush()
+
+    assert store.get(5, 2, default_map) == decode_bonk_map(default_map)
+
+
+def test_closed_store_keeps_maps_on_disk(tmp_path, default_map: str) -> None:
+    path = str(tmp_path / "maps.sqlite3")
+    store = MapStore(path, flush_interval=0.01)
+    store.put(1, 2, default_map)
+    # Queued maps are written on close
+    store.close()
+    store.close()
+
+    with pytest.raises(ValueError):
+        store.put(2, 2, default_map)
+
+    with MapStore(path) as reopened:
+        assert reopened.get(1, 2, default_map) == decode_bonk_map(default_map)
@@ -0,0 +1,58 @@
+from bonk_bot.avatar import Avatar
+from bonk_bot.game import Player, PlayerList
+from bonk_bot.types import Teams
+
+
+def make_player(short_id: int, username: str) -> Player:
+    return Player(
+        None,
+        None,
+        None,
+        False,
+        False,
+        f"peer{short_id}",
+        username,
+        True,
+        0,
+        False,
+        False,
+        Teams.FFA,
+        short_id,
+        Avatar({"layers": [], "bc": 0})
+    )
+
+
+def test_players_are_found_by_every_index() -> None:
+    players = PlayerList(make_player(short_id, f"player {short_id}") for short_id in range(8))
+
+    assert players.get_by_short_id(3) is players[3]
+    assert players.get_by_peer_id("peer5") is players[5]
+    assert players.get_by_username("player 7") is players[7]
+    assert players.get_by_short_id(8) is None
+
+
+def test_indexes_follow_list_changes() -> None:
+    first, second, third = make_player(0, "a"), make_player(1, "b"), make_player(2, "c")
+    players = PlayerList([first, second])
+
+    players.remove(first)
+    players.append(third)
+
+    assert players.get_by_short_id(0) is None
+    assert players.get_by_username("c") is third
+
+    del players[0]
+
+    assert players.get_by_peer_id("peer1") is None
+    assert players == [third]
+
+    # Player that rejoined with the same short id replaces the old one
+    rejoined = make_player(2, "c2")
+    players[0] = rejoined
+
+    assert players.get_by_short_id(2) is rejoined
+    assert players.get_by_username("c") is None
+
+    players.clear()
+
+    assert players.get_by_short_id(2) is None
@@ -0,0 +1,84 @@
+import asyncio
+import time
+
+from bonk_bot.bot.bonk_bot import bonk_guest_login
+from bonk_bot.game import Game
+from bonk_bot.session import INBOUND, OUTBOUND, SessionRecorder, SessionReplay
+from bonk_bot.types import Modes
+
+AVATAR = {"layers": [], "bc": 0}
+
+
+def make_player(short_id: int) -> dict:
+    return {
+        "peerID": f"peer{short_id}",
+        "userName": f"player{short_id}",
+        "guest": True,
+        "level": 0,
+        "ready": False,
+        "tabbed": False,
+        "team": 1,
+        "avatar": AVATAR
+    }
+
+
+PACKETS = [
+    (3, [1, 0, [make_player(0)], 0, False, 1, "", None]),
+    (4, [2, "peer2", "player2", True, 0, 0, AVATAR]),
+    (20, [0, "hello"]),
+    (20, [2, "hi"]),
+    (5, [0, None])
+]
+
+
+def make_game(bot) -> Game:
+    return Game(bot, None, "room", False, Modes.Classic, False, False, False)
+
+
+def test_recorded_session_replays_into_the_same_state(tmp_path) -> None:
+    path = str(tmp_path / "session.jsonl.gz")
+
+    async def main() -> None:
+        bot = bonk_guest_login("recorder")
+        recorder = SessionRecorder(path, flush_interval=0.05)
+        game = make_game(bot)
+        sent = []
+
+        async def emit(event, data=None, namespace=None, callback=None) -> None:
+            sent.append(event)
+
+        game.socket_client.emit = emit
+        session = recorder.attach(game.socket_client, "room")
+        await game._prepare_replay()
+
+        for event, args in PACKETS:
+            await game.socket_client._trigger_event(event, "/", *args)
+
+        await game.socket_client.emit(10, {"message": "bye"})
+        # Records reach the file from the flush timer while recorder is still open
+        await asyncio.sleep(0.3)
+        records = list(SessionReplay(path).records(session))
+
+        assert [(event, args) for _, _, direction, event, args in records if direction == INBOUND] == PACKETS
+        # Bot's keep alive scheduler can send timesyncs meanwhile
+        assert (OUTBOUND, 10) in [(direction, event) for _, _, direction, event, _ in records]
+
+        recorder.close()
+        await game.leave()
+
+        replay = SessionReplay(path)
+        replayed_game = make_game(bot)
+        start = time.monotonic()
+        stats = await replay.feed(replayed_game, speed=None)
+
+        assert replay.sessions == [(session, "room")]
+        assert stats.packets == len(PACKETS)
+        assert stats.errors == []
+        assert time.monotonic() - start < 0.3
+        assert [player.username for player in replayed_game.players] == ["player2"]
+        assert [message.content for message in replayed_game.messages] == ["hello", "hi"]
+        assert [player.username for player in replayed_game.players] == [player.username for player in game.players]
+
+        await bot.aiohttp_session.close()
+
+    asyncio.run(main())
@@ -0,0 +1,66 @@
+import sqlite3
+import time
+
+import pytest
+
+from bonk_bot.sqlite_writer import BatchedSQLiteWriter
+
+
+def write_numbers(connection: sqlite3.Connection, numbers: list) -> None:
+    connection.execute("CREATE TABLE IF NOT EXISTS numbers (number INTEGER)")
+    connection.executemany("INSERT INTO numbers VALUES (?)", [(number,) for number in numbers])
+
+    # Rows of broken batch are already inserted, writer must roll them back
+    if -1 in numbers:
+        raise RuntimeError("broken batch")
+
+    connection.commit()
+
+
+def read_numbers(path: str) -> list:
+    connection = sqlite3.connect(path)
+
+    try:
+        return [number for number, in connection.execute("SELECT number FROM numbers ORDER BY number")]
+    finally:
+        connection.close()
+
+
+def test_writer_keeps_writing_after_failed_batch(tmp_path) -> None:
+    path = str(tmp_path / "numbers.sqlite")
+    writer = BatchedSQLiteWriter(path, write_numbers, batch_size=4, flush_interval=0.01)
+
+    writer.put(1)
+    writer.flush()
+    writer.put(-1)
+    writer.put(5)
+
+    with pytest.raises(RuntimeError, match="broken batch"):
+        writer.flush()
+
+    # Error is raised once and writer thread still runs
+    writer.put(2)
+    writer.put(3)
+    writer.flush()
+    writer.close()
+
+    assert read_numbers(path) == [1, 2, 3]
+
+
+def test_error_is_raised_by_next_put_or_close(tmp_path) -> None:
+    path = str(tmp_path / "numbers.sqlite")
+    writer = BatchedSQLiteWriter(path, write_numbers, batch_size=1, flush_interval=0.01)
+    writer.put(-1)
+
+    with pytest.raises(RuntimeError, match="broken batch"):
+        for _ in range(100):
+            time.sleep(0.01)
+            writer.put(1)
+
+    writer.put(-1)
+
+    with pytest.raises(RuntimeError, match="broken batch"):
+        writer.close()
+
+    assert writer.is_closed
+    assert -1 not in read_numbers(path)